@@ -0,0 +1,156 @@
+"""
+Approximate Nearest Neighbour Index for Large Question Banks
+Inverted-file (IVF) index in pure NumPy: spherical k-means partitions the normalized
+question embeddings into lists, and a query only scores the rows in its nprobe closest lists
+"""
+
+import os
+import numpy as np
+from typing import Optional, Tuple
+
+from similarity import normalize_query, normalize_rows, top_k_scores
+
+# Banks at least this large get an IVF index; smaller ones are searched exactly
+ANN_MIN_BANK_SIZE = int(os.getenv("ANN_MIN_BANK_SIZE", "20000"))
+# Lists probed per query (more = better recall, slower)
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "32"))
+
+CENTROIDS_FILE = "ivf_centroids.npy"
+ASSIGNMENTS_FILE = "ivf_assignments.npy"
+
+KMEANS_ITERATIONS = 10
+# k-means is fitted on a sample this many times the number of lists (plenty for stable centroids)
+KMEANS_SAMPLE_PER_LIST = 64
+# Rows scored per step when assigning rows to centroids
+ASSIGN_CHUNK_ROWS = 16384
+
+
+def default_n_lists(n_rows: int) -> int:
+    """Rule of thumb: about 4 * sqrt(n) lists"""
+    return max(1, int(4 * np.sqrt(n_rows)))
+
+
+def _assign(embeddings: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Closest centroid (by cosine) for every row"""
+    assignments = np.empty(embeddings.shape[0], dtype=np.int32)
+    for start in range(0, embeddings.shape[0], ASSIGN_CHUNK_ROWS):
+        chunk = np.asarray(embeddings[start:start + ASSIGN_CHUNK_ROWS], dtype=np.float32)
+        assignments[start:start + ASSIGN_CHUNK_ROWS] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(embeddings: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on a sample of the (normalized) rows"""
+    rng = np.random.default_rng(seed)
+    n_rows = embeddings.shape[0]
+    n_lists = min(n_lists, n_rows)
+
+    sample_size = min(n_rows, n_lists * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(embeddings[np.sort(rng.choice(n_rows, size=sample_size, replace=False))], dtype=np.float32)
+
+    centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+
+        # Re-seed empty lists from random sample rows
+        empty = np.flatnonzero(np.bincount(labels, minlength=n_lists) == 0)
+        sums[empty] = sample[rng.choice(sample_size, size=empty.size, replace=False)]
+
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+class IVFIndex:
+    """Inverted lists over a normalized embedding matrix (rows are never copied)"""
+
+    def __init__(self, embeddings: np.ndarray, centroids: np.ndarray, assignments: np.ndarray):
+        self.embeddings = embeddings
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.assignments = np.asarray(assignments, dtype=np.int32)
+
+        # Rows grouped by list: rows of list i are order[offsets[i]:offsets[i + 1]]
+        self.order = np.argsort(self.assignments, kind="stable")
+        counts = np.bincount(self.assignments, minlength=len(self.centroids))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, n_lists: int = None, seed: int = 0) -> "IVFIndex":
+        n_lists = n_lists or default_n_lists(embeddings.shape[0])
+        centroids = train_centroids(embeddings, n_lists, seed)
+        return cls(embeddings, centroids, _assign(embeddings, centroids))
+
+    def save(self, index_dir: str):
+        np.save(os.path.join(index_dir, CENTROIDS_FILE), self.centroids)
+        np.save(os.path.join(index_dir, ASSIGNMENTS_FILE), self.assignments)
+
+    @classmethod
+    def load(cls, index_dir: str, embeddings: np.ndarray) -> Optional["IVFIndex"]:
+        """Load a saved IVF index for these embeddings, or None if there isn't a matching one"""
+        centroids_path = os.path.join(index_dir, CENTROIDS_FILE)
+        assignments_path = os.path.join(index_dir, ASSIGNMENTS_FILE)
+        if not os.path.exists(centroids_path) or not os.path.exists(assignments_path):
+            return None
+
+        assignments = np.load(assignments_path)
+        if assignments.shape[0] != embeddings.shape[0]:
+            return None
+
+        return cls(embeddings, np.load(centroids_path), assignments)
+
+    def _probe_rows(self, list_ids: np.ndarray) -> np.ndarray:
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in list_ids])
+
+    def search(
+        self,
+        query,
+        k: int,
+        nprobe: int = ANN_NPROBE,
+        exclude_mask: Optional[np.ndarray] = None,
+        allowed_mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k (row indices, scores), best first.
+        With a selective filter (topic, asked questions) the probed lists may hold fewer
+        than k eligible rows, so nprobe is doubled until k are found or every list is probed.
+        """
+        vec = normalize_query(query)
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        if vec is None or vec.shape[0] != self.embeddings.shape[1] or k <= 0:
+            return empty
+
+        list_order = np.argsort(-(self.centroids @ vec))
+        probed = 0
+        nprobe = max(1, nprobe)
+        found_rows, found_scores = [], []
+        n_found = 0
+
+        while probed < len(list_order):
+            new_lists = list_order[probed:probed + nprobe]
+            probed += len(new_lists)
+
+            rows = self._probe_rows(new_lists)
+            valid = np.ones(rows.size, dtype=bool)
+            if exclude_mask is not None:
+                valid &= ~exclude_mask[rows]
+            if allowed_mask is not None:
+                valid &= allowed_mask[rows]
+            rows = rows[valid]
+
+            if rows.size:
+                found_rows.append(rows)
+                found_scores.append(np.asarray(self.embeddings[rows], dtype=np.float32) @ vec)
+                n_found += rows.size
+
+            if n_found >= k:
+                break
+            nprobe *= 2
+
+        if not n_found:
+            return empty
+
+        rows = np.concatenate(found_rows)
+        positions, scores = top_k_scores(np.concatenate(found_scores), k)
+        return rows[positions], scores
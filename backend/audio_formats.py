@@ -0,0 +1,96 @@
+"""
+Audio Output Formats
+ElevenLabs output formats a client can ask for, per request, with ?audio_format= or the
+X-Audio-Format header (full names like mp3_22050_32, or the aliases below). Browsers that send
+Save-Data: on get low-bitrate MP3 unless they ask for something else.
+PCM is served as WAV: sentences are raw 16-bit mono samples, so they concatenate behind one header.
+"""
+
+import os
+import struct
+from typing import NamedTuple, Optional
+
+
+class AudioFormat(NamedTuple):
+    content_type: str
+    extension: str
+    kbps: int
+
+
+AUDIO_FORMATS = {
+    "mp3_44100_128": AudioFormat("audio/mpeg", "mp3", 128),
+    "mp3_44100_64": AudioFormat("audio/mpeg", "mp3", 64),
+    "mp3_22050_32": AudioFormat("audio/mpeg", "mp3", 32),
+    # One Ogg stream per sentence, chained
+    "opus_48000_32": AudioFormat("audio/ogg", "ogg", 32),
+    "opus_48000_64": AudioFormat("audio/ogg", "ogg", 64),
+    "pcm_16000": AudioFormat("audio/wav", "wav", 256),
+    "pcm_24000": AudioFormat("audio/wav", "wav", 384),
+}
+
+FORMAT_ALIASES = {
+    "mp3": "mp3_44100_128",
+    "mp3_low": "mp3_22050_32",
+    "opus": "opus_48000_32",
+    "pcm": "pcm_24000",
+}
+
+# ElevenLabs' own default, i.e. what every turn used before formats could be chosen
+DEFAULT_AUDIO_FORMAT = os.getenv("DEFAULT_AUDIO_FORMAT", "mp3_44100_128")
+SAVE_DATA_AUDIO_FORMAT = "mp3_22050_32"
+
+EXTENSION_CONTENT_TYPES = {f.extension: f.content_type for f in AUDIO_FORMATS.values()}
+
+WAV_HEADER_SIZE = 44
+
+
+def resolve_audio_format(requested: Optional[str], save_data: bool = False) -> str:
+    """ElevenLabs output_format for a client's request (unknown names fall back to the default)"""
+    if requested:
+        name = requested.strip().lower()
+        name = FORMAT_ALIASES.get(name, name)
+        if name in AUDIO_FORMATS:
+            return name
+        print(f"⚠️ Unknown audio format '{requested}', using {DEFAULT_AUDIO_FORMAT}")
+    return SAVE_DATA_AUDIO_FORMAT if save_data else DEFAULT_AUDIO_FORMAT
+
+
+def negotiate_audio_format(request) -> str:
+    """Output format for this request: query parameter, then X-Audio-Format, then Save-Data"""
+    requested = request.query_params.get("audio_format") or request.headers.get("x-audio-format")
+    save_data = request.headers.get("save-data", "").strip().lower() == "on"
+    return resolve_audio_format(requested, save_data)
+
+
+def describe(output_format: str) -> str:
+    return f"{output_format} ({AUDIO_FORMATS[output_format].kbps} kbps)"
+
+
+def is_pcm(output_format: str) -> bool:
+    return output_format.startswith("pcm_")
+
+
+def wav_header(sample_rate: int, data_size: Optional[int] = None) -> bytes:
+    """RIFF header for 16-bit mono PCM; without data_size the sizes are left at the maximum (streaming)"""
+    if data_size is None:
+        data_size = 0xFFFFFFFF - (WAV_HEADER_SIZE - 8)
+    byte_rate = sample_rate * 2
+    return (
+        b"RIFF" + struct.pack("<I", data_size + WAV_HEADER_SIZE - 8) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, byte_rate, 2, 16)
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def stream_prefix(output_format: str) -> bytes:
+    """Bytes that go before the first sentence's audio (the WAV header for PCM)"""
+    if is_pcm(output_format):
+        return wav_header(int(output_format.split("_")[1]))
+    return b""
+
+
+def finalize(output_format: str, data: bytes) -> bytes:
+    """Complete audio as stored: for PCM, the streaming header is replaced by one with the real sizes"""
+    if is_pcm(output_format) and len(data) >= WAV_HEADER_SIZE:
+        return wav_header(int(output_format.split("_")[1]), len(data) - WAV_HEADER_SIZE) + data[WAV_HEADER_SIZE:]
+    return data
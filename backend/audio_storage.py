@@ -0,0 +1,171 @@
+"""
+Persistent Audio Storage
+Finished turn audio is written to a local directory (default) or an S3-compatible bucket, so it
+outlives the in-process audio store: messages.audio_url points at it and a turn can be replayed
+without synthesizing it again. Objects are immutable (one per audio id) and served with range support.
+"""
+
+import os
+import re
+from typing import Optional, Tuple
+
+from audio_formats import EXTENSION_CONTENT_TYPES
+
+AUDIO_STORAGE = os.getenv("AUDIO_STORAGE", "local")  # local | s3
+AUDIO_STORAGE_DIR = os.getenv(
+    "AUDIO_STORAGE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_files")
+)
+AUDIO_S3_BUCKET = os.getenv("AUDIO_S3_BUCKET")
+# Set for S3-compatible services (R2, MinIO, Supabase Storage S3 endpoint, ...)
+AUDIO_S3_ENDPOINT_URL = os.getenv("AUDIO_S3_ENDPOINT_URL")
+AUDIO_S3_PREFIX = os.getenv("AUDIO_S3_PREFIX", "audio/")
+# Public base URL of the directory/bucket (e.g. a CDN); if set, audio_url points there instead of at GET /audio/{audio_id}
+AUDIO_PUBLIC_BASE_URL = os.getenv("AUDIO_PUBLIC_BASE_URL")
+
+# An audio id never changes content, so clients and CDNs can keep it for good
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# 32 hex characters plus the format's extension (ids from before formats could be chosen have none and are MP3)
+AUDIO_ID_PATTERN = re.compile(r"([0-9a-f]{32})(?:\.(%s))?" % "|".join(EXTENSION_CONTENT_TYPES))
+
+
+def parse_audio_id(audio_id: str) -> Optional[Tuple[str, str]]:
+    """(hex id, extension), or None if this isn't an audio id"""
+    match = AUDIO_ID_PATTERN.fullmatch(audio_id)
+    if not match:
+        return None
+    return match.group(1), match.group(2) or "mp3"
+
+
+def audio_content_type(audio_id: str) -> str:
+    return EXTENSION_CONTENT_TYPES[parse_audio_id(audio_id)[1]]
+
+
+def audio_key(audio_id: str) -> str:
+    """Relative object path, sharded by the id's first two hex characters"""
+    hex_id, extension = parse_audio_id(audio_id)
+    return f"{hex_id[:2]}/{hex_id}.{extension}"
+
+
+class LocalAudioStorage:
+    """Files under AUDIO_STORAGE_DIR"""
+
+    def __init__(self, root: str = AUDIO_STORAGE_DIR):
+        self.root = root
+
+    def object_key(self, audio_id: str) -> str:
+        return audio_key(audio_id)
+
+    def path(self, audio_id: str) -> str:
+        return os.path.join(self.root, audio_key(audio_id))
+
+    def put(self, audio_id: str, data: bytes):
+        path = self.path(audio_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a reader never sees a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def response(self, audio_id: str, range_header: Optional[str] = None):
+        """Response for GET /audio/{audio_id}, or None if not stored (FileResponse handles Range itself)"""
+        from starlette.responses import FileResponse
+
+        path = self.path(audio_id)
+        if not os.path.exists(path):
+            return None
+        return FileResponse(path, media_type=audio_content_type(audio_id), headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+
+class S3AudioStorage:
+    """Objects in an S3-compatible bucket (boto3 is only needed when this backend is selected)"""
+
+    def __init__(self, bucket: str = AUDIO_S3_BUCKET, endpoint_url: str = AUDIO_S3_ENDPOINT_URL, prefix: str = AUDIO_S3_PREFIX):
+        import boto3
+
+        if not bucket:
+            raise ValueError("AUDIO_S3_BUCKET must be set when AUDIO_STORAGE=s3")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def object_key(self, audio_id: str) -> str:
+        return f"{self.prefix}{audio_key(audio_id)}"
+
+    def put(self, audio_id: str, data: bytes):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.object_key(audio_id),
+            Body=data,
+            ContentType=audio_content_type(audio_id),
+            CacheControl=IMMUTABLE_CACHE_CONTROL
+        )
+
+    def response(self, audio_id: str, range_header: Optional[str] = None):
+        """
+        Response for GET /audio/{audio_id}, or None if not stored (the bucket applies the Range).
+        The body is streamed from the bucket in chunks, not read into memory.
+        """
+        from botocore.exceptions import ClientError
+        from starlette.responses import Response, StreamingResponse
+
+        request = {"Bucket": self.bucket, "Key": self.object_key(audio_id)}
+        if range_header:
+            request["Range"] = range_header
+
+        try:
+            obj = self.client.get_object(**request)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("NoSuchKey", "404"):
+                return None
+            if code == "InvalidRange":
+                return Response(status_code=416)
+            raise
+
+        headers = {"Accept-Ranges": "bytes", "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if obj.get("ContentLength") is not None:
+            headers["Content-Length"] = str(obj["ContentLength"])
+        if obj.get("ContentRange"):
+            headers["Content-Range"] = obj["ContentRange"]
+        return StreamingResponse(
+            stream_body(obj["Body"]),
+            status_code=206 if obj.get("ContentRange") else 200,
+            media_type=audio_content_type(audio_id),
+            headers=headers
+        )
+
+
+def stream_body(body, chunk_size: int = 64 * 1024):
+    """Chunks of a get_object Body; closes it (and frees its connection) when done or if the client goes away"""
+    try:
+        yield from body.iter_chunks(chunk_size)
+    finally:
+        body.close()
+
+
+STORAGE_BACKENDS = {
+    "local": LocalAudioStorage,
+    "s3": S3AudioStorage,
+}
+
+_storage = None
+
+
+def get_audio_storage():
+    """The configured backend (created on first use)"""
+    global _storage
+    if _storage is None:
+        if AUDIO_STORAGE not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown AUDIO_STORAGE '{AUDIO_STORAGE}' (expected one of {', '.join(STORAGE_BACKENDS)})")
+        _storage = STORAGE_BACKENDS[AUDIO_STORAGE]()
+    return _storage
+
+
+def audio_url(audio_id: str) -> str:
+    """What messages.audio_url stores: the public object URL if configured, else the API path"""
+    if AUDIO_PUBLIC_BASE_URL:
+        return f"{AUDIO_PUBLIC_BASE_URL.rstrip('/')}/{get_audio_storage().object_key(audio_id)}"
+    return f"/audio/{audio_id}"
@@ -0,0 +1,146 @@
+"""
+In-Process Audio Store
+Synthesized speech is kept here under a random id and fetched by the browser from
+GET /audio/{audio_id}, instead of being base64-encoded into the JSON turn response.
+An entry can be read while it is still being written: sentences are appended as they're
+synthesized and a reader receives each one as soon as it lands. Ids end in the format's
+extension (abc….mp3, ….ogg, ….wav), so storage and GET /audio know the content type.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional, Tuple
+
+from audio_formats import AUDIO_FORMATS, DEFAULT_AUDIO_FORMAT, describe, stream_prefix, finalize
+
+# Long enough to fetch (and replay) a turn's audio, short enough not to hold every turn in memory
+AUDIO_TTL_SECONDS = float(os.getenv("AUDIO_TTL_SECONDS", "600"))
+AUDIO_STORE_MAX_ENTRIES = int(os.getenv("AUDIO_STORE_MAX_ENTRIES", "500"))
+# A reader gives up if no new audio arrives for this long (synthesis stalled)
+AUDIO_WAIT_SECONDS = 60
+
+_entries: "OrderedDict[str, AudioEntry]" = OrderedDict()
+# Strong references to the tasks filling entries (the event loop only keeps weak ones)
+_fill_tasks = set()
+
+
+class AudioEntry:
+    """One turn's audio as a list of chunks (never concatenated, so nothing is copied)"""
+
+    def __init__(self, output_format: str):
+        self.output_format = output_format
+        self.content_type = AUDIO_FORMATS[output_format].content_type
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.complete = False
+        self.created_at = time.time()
+        self._changed = asyncio.Event()
+
+    def append(self, chunk: bytes):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        self._notify()
+
+    def close(self):
+        self.complete = True
+        self._notify()
+
+    def _notify(self):
+        # Wake current readers; later ones wait on a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Every chunk from the start, waiting for new ones until the entry is complete"""
+        sent = 0
+        while True:
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+
+            if self.complete:
+                return
+
+            try:
+                await asyncio.wait_for(self._changed.wait(), AUDIO_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                print(f"⚠️ Audio synthesis stalled, ending stream after {sent} chunks")
+                return
+
+
+def _evict():
+    now = time.time()
+    while _entries:
+        audio_id, entry = next(iter(_entries.items()))
+        if len(_entries) < AUDIO_STORE_MAX_ENTRIES and entry.created_at + AUDIO_TTL_SECONDS > now:
+            break
+        del _entries[audio_id]
+
+
+def create_audio_entry(output_format: str = DEFAULT_AUDIO_FORMAT) -> Tuple[str, AudioEntry]:
+    _evict()
+    audio_id = f"{uuid.uuid4().hex}.{AUDIO_FORMATS[output_format].extension}"
+    entry = AudioEntry(output_format)
+    prefix = stream_prefix(output_format)
+    if prefix:
+        entry.append(prefix)
+    _entries[audio_id] = entry
+    return audio_id, entry
+
+
+def get_audio_entry(audio_id: str) -> Optional[AudioEntry]:
+    entry = _entries.get(audio_id)
+    if entry is None or entry.created_at + AUDIO_TTL_SECONDS <= time.time():
+        return None
+    return entry
+
+
+def record_audio(segments: AsyncIterator[bytes], output_format: Optional[str] = None) -> str:
+    """Store audio that is still being synthesized (in output_format); returns its id straight away"""
+    output_format = output_format or DEFAULT_AUDIO_FORMAT
+    audio_id, entry = create_audio_entry(output_format)
+
+    async def fill():
+        try:
+            async for segment in segments:
+                entry.append(segment)
+        except Exception as e:
+            print(f"⚠️ Audio synthesis failed for {audio_id}: {e}")
+        finally:
+            entry.close()
+            print(f"🔊 Audio {audio_id}: {entry.size / 1024:.0f} KB as {describe(output_format)}")
+
+    task = asyncio.create_task(fill())
+    _fill_tasks.add(task)
+    task.add_done_callback(_fill_tasks.discard)
+    return audio_id
+
+
+async def persist_audio(audio_id: str) -> Optional[str]:
+    """
+    Wait for synthesis to finish, write the audio to persistent storage and return its audio_url
+    (None if there's no audio or storing failed). The in-memory copy is dropped once stored.
+    """
+    from audio_storage import get_audio_storage, audio_url
+
+    entry = _entries.get(audio_id)
+    if entry is None:
+        return None
+
+    async for _ in entry.iter_chunks():
+        pass
+    if not entry.complete or entry.size <= len(stream_prefix(entry.output_format)):
+        return None
+
+    try:
+        data = finalize(entry.output_format, b"".join(entry.chunks))
+        await asyncio.to_thread(get_audio_storage().put, audio_id, data)
+    except Exception as e:
+        print(f"⚠️ Failed to store audio {audio_id}: {e}")
+        return None
+
+    _entries.pop(audio_id, None)
+    return audio_url(audio_id)
@@ -0,0 +1,101 @@
+"""
+Recall / latency benchmark: IVF approximate search vs exact search
+Synthetic clustered banks (questions cluster by subject, like real embeddings) with
+10 topics; reports recall@k against exact search, unfiltered and topic-filtered with
+already-asked exclusions, at several bank sizes and nprobe settings.
+
+Usage: python benchmark_ann.py [--dim 384] [--k 10] [--queries 50] [--sizes 10000 50000 100000]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from similarity import normalize_rows, similarity_scores, top_k_scores
+from ann_index import IVFIndex
+
+NPROBES = [4, 8, 16, 32]
+N_TOPICS = 10
+
+
+def make_bank(n: int, dim: int, rng) -> np.ndarray:
+    """Mixture of Gaussian clusters on the unit sphere"""
+    n_clusters = max(10, n // 200)
+    centers = rng.standard_normal((n_clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, n_clusters, size=n)
+    points = centers[labels] + 0.6 * rng.standard_normal((n, dim), dtype=np.float32)
+    return normalize_rows(points)
+
+
+def exact_search(query, matrix, k, exclude_mask=None, allowed_mask=None):
+    return top_k_scores(similarity_scores(query, matrix), k, exclude_mask=exclude_mask, allowed_mask=allowed_mask)
+
+
+def run(matrix, topics, queries, k, search, filtered):
+    """Mean latency (ms) and list of result row sets for a search function"""
+    results = []
+    elapsed = 0.0
+    rng = np.random.default_rng(1)
+    for query in queries:
+        allowed_mask = exclude_mask = None
+        if filtered:
+            allowed_mask = topics == rng.integers(0, N_TOPICS)
+            exclude_mask = np.zeros(matrix.shape[0], dtype=bool)
+            exclude_mask[rng.choice(matrix.shape[0], size=5, replace=False)] = True
+
+        start = time.perf_counter()
+        rows, _ = search(query, k, exclude_mask=exclude_mask, allowed_mask=allowed_mask)
+        elapsed += time.perf_counter() - start
+        results.append(set(rows.tolist()))
+
+    return elapsed / len(queries) * 1000, results
+
+
+def recall(approx, exact):
+    return np.mean([len(a & e) / max(1, len(e)) for a, e in zip(approx, exact)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print("=" * 80)
+    print(f"ANN benchmark (dim={args.dim}, k={args.k}, {args.queries} queries)")
+    print("=" * 80)
+
+    for n in args.sizes:
+        matrix = make_bank(n, args.dim, rng)
+        topics = rng.integers(0, N_TOPICS, size=n)
+
+        # Queries are perturbed bank rows, like a resume close to some questions
+        picks = rng.choice(n, size=args.queries, replace=False)
+        queries = normalize_rows(matrix[picks] + 0.3 * rng.standard_normal((args.queries, args.dim), dtype=np.float32))
+
+        start = time.perf_counter()
+        ivf = IVFIndex.build(matrix)
+        build_s = time.perf_counter() - start
+
+        print(f"\nBank size {n}: {len(ivf.centroids)} lists, built in {build_s:.1f}s")
+        print(f"{'search':>14} | {'filter':>8} | {'latency':>10} | {'recall@k':>8}")
+        print("-" * 50)
+
+        for filtered in (False, True):
+            label = "topic" if filtered else "none"
+            exact_ms, exact_rows = run(matrix, topics, queries, args.k,
+                                       lambda q, k, **m: exact_search(q, matrix, k, **m), filtered)
+            print(f"{'exact':>14} | {label:>8} | {exact_ms:>8.2f}ms | {1.0:>8.3f}")
+
+            for nprobe in NPROBES:
+                ivf_ms, ivf_rows = run(matrix, topics, queries, args.k,
+                                       lambda q, k, **m: ivf.search(q, k, nprobe=nprobe, **m), filtered)
+                print(f"{f'ivf nprobe={nprobe}':>14} | {label:>8} | {ivf_ms:>8.2f}ms | {recall(ivf_rows, exact_rows):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Read fan-out benchmark: sequential Supabase reads vs concurrent / embedded ones
+Times the reads behind a session-cache miss in /continue-conversation (conversation, student,
+resume sections, history) and behind /start-conversation and GET /student (student, resume
+sections), against the in-memory fake Supabase from test_concurrency.py with a fixed latency
+injected into every request, so the difference is the number of sequential round trips.
+
+Usage: python benchmark_reads.py [--latency 0.05] [--messages 30] [--repeats 20]
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+from test_concurrency import FakeSupabase, seed_students
+from repositories import SupabaseDatabase, STUDENT_COLUMNS, select_list
+import main
+
+
+async def sequential_session_reads(conversation_id: str):
+    """The previous load_session: four requests, one after another"""
+    db = main.database.client
+    conversation = (await db.table("conversations").select("*").eq("id", conversation_id).execute()).data[0]
+    student_id = conversation["student_id"]
+    await db.table("students").select(select_list(STUDENT_COLUMNS)).eq("id", student_id).execute()
+    await db.table("resume_sections").select("*").eq("student_id", student_id).execute()
+    await db.table("messages").select("*").eq("conversation_id", conversation_id).order("seq").execute()
+
+
+async def sequential_student_reads(student_id: str):
+    """The previous get_student / start_conversation reads: student, then resume sections"""
+    db = main.database.client
+    await db.table("students").select(select_list(STUDENT_COLUMNS)).eq("id", student_id).execute()
+    await db.table("resume_sections").select("*").eq("student_id", student_id).execute()
+
+
+async def timed(fn, repeats: int):
+    """(median seconds, requests per call)"""
+    from test_concurrency import Stats
+
+    times = []
+    calls_before = Stats.db_calls
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), (Stats.db_calls - calls_before) / repeats
+
+
+async def run(latency: float, messages: int, repeats: int):
+    db = FakeSupabase(latency)
+    main.database = SupabaseDatabase(db)
+    student_id = (await seed_students(main.database, 1))[0]
+
+    conversation_id = db.insert_row("conversations", {"student_id": student_id, "phase": "project_questions"})["id"]
+    for i in range(messages):
+        db.insert_row("messages", {
+            "conversation_id": conversation_id, "role": "user" if i % 2 else "assistant", "content": f"Message {i}"
+        })
+
+    # The fake's latency is random in [0.5, 1.5] x latency; medians over repeats even that out
+    rows = [
+        ("Session load (cache miss)",
+         await timed(lambda: sequential_session_reads(conversation_id), repeats),
+         await timed(lambda: main.load_session(conversation_id), repeats)),
+        ("Student + sections",
+         await timed(lambda: sequential_student_reads(student_id), repeats),
+         await timed(lambda: main.database.students.get_with_sections(student_id), repeats)),
+    ]
+
+    print("=" * 80)
+    print(f"Read fan-out benchmark (~{latency * 1000:.0f}ms per request, {messages} messages, median of {repeats})")
+    print("=" * 80)
+    print(f"{'Path':<28}{'Before':>10}{'Requests':>10}{'After':>10}{'Requests':>10}{'Speedup':>10}")
+    print("-" * 80)
+    for name, (before, before_requests), (after, after_requests) in rows:
+        print(f"{name:<28}{before * 1000:>8.0f}ms{before_requests:>10.0f}"
+              f"{after * 1000:>8.0f}ms{after_requests:>10.0f}{before / after:>9.1f}x")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per Supabase request")
+    parser.add_argument("--messages", type=int, default=30, help="messages in the conversation's history")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.latency, args.messages, args.repeats))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,248 @@
+"""
+Persistent Key-Value Cache
+SQLite-backed caches shared by every worker process on the host: JSON values with a TTL per entry
+and least-recently-used eviction beyond max_entries, and binary values bounded by total size
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+
+class PersistentCache:
+    """JSON values stored in one SQLite table per cache name"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = CACHE_MAX_ENTRIES, path: str = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path or os.path.join(CACHE_DIR, f"{name}.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value, or None if missing or expired (cache errors are treated as a miss)"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                now = time.time()
+                row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+
+                if row[1] <= now:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+                return json.loads(row[0])
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}' read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value, then evict expired and least recently used entries"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now + self.ttl_seconds, now)
+                )
+                conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                conn.execute("""
+                    DELETE FROM entries WHERE key IN (
+                        SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                conn.commit()
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}' write failed: {e}")
+
+    def pop(self, key: str) -> Optional[Any]:
+        """
+        Delete an entry and return its value, or None if missing or expired. One statement, so of
+        two callers (threads or processes) popping the same key, only one gets the value.
+        """
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("DELETE FROM entries WHERE key = ? RETURNING value, expires_at", (key,)).fetchone()
+                conn.commit()
+                if row is None or row[1] <= time.time():
+                    return None
+                return json.loads(row[0])
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}' read failed: {e}")
+            return None
+
+    def delete(self, key: str):
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}' delete failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class BlobCache:
+    """
+    Binary values (synthesized audio) in one SQLite table, evicted least recently used once their
+    total size passes max_bytes. Hit/miss counts live in the same file, so they add up across workers.
+    """
+
+    def __init__(self, name: str, max_bytes: int, path: str = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.path = path or os.path.join(CACHE_DIR, f"{name}.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS blobs_accessed_at ON blobs (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # Running total of blob sizes, kept up to date by set() (summed once for files from before it existed)
+            conn.execute("INSERT OR IGNORE INTO counters (name, value) SELECT 'bytes', COALESCE(SUM(size), 0) FROM blobs")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, counter: str):
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (counter,)
+        )
+
+    @staticmethod
+    def _add_bytes(conn: sqlite3.Connection, delta: int) -> int:
+        """Adjust the running byte total; returns the new total"""
+        return conn.execute(
+            "INSERT INTO counters (name, value) VALUES ('bytes', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value RETURNING value",
+            (delta,)
+        ).fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes, or None on a miss (cache errors are treated as a miss)"""
+        return self.get_first([key])
+
+    def get_first(self, keys: List[str]) -> Optional[bytes]:
+        """Bytes of the first of several acceptable keys that is cached, counted as a single hit or miss"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                for key in keys:
+                    row = conn.execute("SELECT value FROM blobs WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        self._count(conn, "hits")
+                        conn.execute("UPDATE blobs SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                        conn.commit()
+                        return bytes(row[0])
+                self._count(conn, "misses")
+                conn.commit()
+                return None
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}' read failed: {e}")
+            return None
+
+    def set(self, key: str, value: bytes):
+        """Store bytes, then evict least recently used entries beyond max_bytes"""
+        try:
+            with self._lock:
+                conn = self._connection()
+                # Write lock up front: other workers can't change the byte total between the read and the update
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    replaced = conn.execute("SELECT size FROM blobs WHERE key = ?", (key,)).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO blobs (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, sqlite3.Binary(value), len(value), time.time())
+                    )
+                    total = self._add_bytes(conn, len(value) - (replaced[0] if replaced else 0))
+                    if total > self.max_bytes:
+                        conn.execute("""
+                            DELETE FROM blobs WHERE key IN (
+                                SELECT key FROM (
+                                    SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running FROM blobs
+                                ) WHERE running > ?
+                            )
+                        """, (self.max_bytes,))
+                        # Eviction already scans the table; resynchronize the total from it
+                        evicted_total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+                        self._add_bytes(conn, evicted_total - total)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}' write failed: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        """Membership without touching LRU order or the counters"""
+        with self._lock:
+            return self._connection().execute("SELECT 1 FROM blobs WHERE key = ?", (key,)).fetchone() is not None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            conn = self._connection()
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {"entries": entries, "bytes": size, "hits": counters.get("hits", 0), "misses": counters.get("misses", 0)}
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM blobs")
+            conn.execute("DELETE FROM counters")
+            conn.commit()
@@ -0,0 +1,154 @@
+"""
+Agreement report: embedding-centroid topic classifier vs LLM topic extraction
+Runs both classifiers over a fixture set of resumes and reports how often they agree,
+to decide whether TOPIC_CLASSIFIER=centroid can replace the LLM call on the hot path.
+
+Usage: python compare_topic_classifiers.py [--provider openai|hashing|tfidf]
+"""
+
+import argparse
+import asyncio
+from dotenv import load_dotenv
+load_dotenv()
+
+import embedding_providers
+from knowledge_base import (
+    extract_student_topics, classify_topics_by_centroid, rank_topics_by_centroid, build_resume_text
+)
+
+FIXTURE_RESUMES = {
+    "computer-vision": {
+        "Projects": """
+        Real-time Object Detection for Retail Shelves - fine-tuned YOLOv8 on 20k annotated shelf images,
+        used mosaic and color-jitter augmentation, 0.81 mAP@0.5
+        Medical Image Segmentation - U-Net on chest X-rays with Dice loss, deployed with ONNX
+        """,
+        "Technical Skills": "Python, PyTorch, OpenCV, torchvision, CNNs, ResNet, U-Net, YOLO"
+    },
+    "nlp-rag": {
+        "Projects": """
+        RAG Chatbot - Next.js frontend, OpenAI embeddings and a vector database for retrieval-augmented generation
+        Podcast Generator - Chrome extension that summarizes articles with GPT-4 and narrates them with TTS
+        """,
+        "Technical Skills": "Python, TypeScript, LangChain, Transformers, BERT, tokenization, prompt engineering"
+    },
+    "tabular-boosting": {
+        "Projects": """
+        Credit Default Prediction - XGBoost and LightGBM on 2M loan records, stacked with logistic regression,
+        tuned with Bayesian optimization, AUC 0.87
+        Customer Churn - random forest baseline, SHAP explanations, handled class imbalance with SMOTE
+        """,
+        "Work Experience": "Data Scientist Intern, FinServe: built gradient boosting models for risk scoring",
+        "Technical Skills": "Python, pandas, scikit-learn, XGBoost, LightGBM, SQL"
+    },
+    "generative": {
+        "Projects": """
+        Face Generation with GANs - DCGAN and StyleGAN2 on CelebA, tracked FID during training
+        Anomaly Detection - variational autoencoder on sensor data, flagged outliers by reconstruction error
+        Latent Diffusion Experiments - trained a small diffusion model on MNIST
+        """,
+        "Technical Skills": "PyTorch, JAX, GANs, VAEs, diffusion models"
+    },
+    "evaluation-mlops": {
+        "Work Experience": """
+        ML Engineer, AdTech Co: owned offline evaluation for click-through-rate models, designed A/B tests,
+        monitored precision/recall, calibration and ROC-AUC drift in production, set up cross-validation pipelines
+        """,
+        "Technical Skills": "Python, MLflow, Airflow, scikit-learn, statistics, hypothesis testing"
+    },
+    "data-engineering": {
+        "Projects": """
+        Sensor Data Cleaning Pipeline - imputed missing values, normalized and standardized features,
+        removed outliers, one-hot encoded categorical columns, PCA for dimensionality reduction
+        Image Dataset Curation - deduplication and augmentation (flips, crops, rotations) for a small dataset
+        """,
+        "Technical Skills": "Python, pandas, NumPy, Spark, feature engineering"
+    },
+    "math-heavy": {
+        "Projects": """
+        Recommender via Matrix Factorization - implemented SVD and alternating least squares from scratch in NumPy
+        Spectral Clustering - eigen-decomposition of graph Laplacians, analysed eigenvalues and matrix rank
+        """,
+        "Technical Skills": "Linear algebra, NumPy, SciPy, convex optimization, probability"
+    },
+    "deep-learning-research": {
+        "Projects": """
+        Training Dynamics of Deep Networks - studied vanishing gradients, batch normalization and dropout,
+        compared Adam and SGD with momentum, learning-rate warmup, weight initialization schemes
+        Transformer from scratch - attention, residual connections and layer norm in PyTorch
+        """,
+        "Technical Skills": "PyTorch, CUDA, backpropagation, optimization"
+    },
+    "speech-nlp": {
+        "Work Experience": """
+        Research Assistant, Speech Lab: fine-tuned wav2vec 2.0 and Whisper for low-resource ASR,
+        built a named entity recognition model with a BiLSTM-CRF, evaluated with word error rate and F1
+        """,
+        "Technical Skills": "Python, PyTorch, Hugging Face, RNNs, LSTMs, word embeddings"
+    },
+    "classic-ml": {
+        "Projects": """
+        Spam Filter - naive Bayes and logistic regression with TF-IDF features, analysed bias-variance tradeoff
+        House Price Regression - linear and ridge regression, L1/L2 regularization, k-nearest neighbours, SVM
+        """,
+        "Technical Skills": "Python, scikit-learn, statistics"
+    },
+}
+
+
+def jaccard(a, b) -> float:
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=list(embedding_providers.PROVIDERS), default=None,
+                        help="embedding provider for the centroid classifier (default: EMBEDDING_PROVIDER)")
+    args = parser.parse_args()
+
+    if args.provider:
+        embedding_providers.EMBEDDING_PROVIDER = args.provider
+
+    print("=" * 80)
+    print(f"Topic classifier agreement ({len(FIXTURE_RESUMES)} resumes, "
+          f"embeddings: {embedding_providers.get_embedding_provider().name})")
+    print("=" * 80)
+
+    jaccards = []
+    exact_matches = 0
+    primary_hits = 0
+    llm_picked = 0
+    centroid_picked = 0
+    overlap = 0
+
+    for name, sections in FIXTURE_RESUMES.items():
+        llm_topics = await extract_student_topics(sections)
+        centroid_topics = classify_topics_by_centroid(sections)
+        ranked = rank_topics_by_centroid(build_resume_text(sections))
+
+        score = jaccard(llm_topics, centroid_topics)
+        jaccards.append(score)
+        exact_matches += set(llm_topics) == set(centroid_topics)
+        # The LLM lists the student's specific area first
+        primary_hits += bool(llm_topics) and llm_topics[0] in centroid_topics
+        llm_picked += len(llm_topics)
+        centroid_picked += len(centroid_topics)
+        overlap += len(set(llm_topics) & set(centroid_topics))
+
+        print(f"\n{name}  (jaccard {score:.2f})")
+        print(f"  llm:      {llm_topics}")
+        print(f"  centroid: {centroid_topics}")
+        print(f"  ranking:  " + ", ".join(f"{t} {s:.3f}" for t, s in ranked[:5]))
+
+    n = len(FIXTURE_RESUMES)
+    print("\n" + "-" * 80)
+    print(f"Mean Jaccard:                 {sum(jaccards) / n:.2f}")
+    print(f"Identical topic sets:         {exact_matches}/{n}")
+    print(f"LLM primary topic included:   {primary_hits}/{n}")
+    print(f"Centroid precision vs LLM:    {overlap / max(1, centroid_picked):.2f}")
+    print(f"Centroid recall vs LLM:       {overlap / max(1, llm_picked):.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
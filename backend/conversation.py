@@ -1,16 +1,61 @@
 import os
-from openai import OpenAI
-from elevenlabs import ElevenLabs, VoiceSettings
-from typing import List, Dict
+import asyncio
+import time
+from openai import AsyncOpenAI
+from elevenlabs import AsyncElevenLabs, VoiceSettings
+from typing import AsyncIterator, List, Dict, Optional, Union
 import base64
 
-# Initialize clients
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-elevenlabs_client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+from tts_router import TTS_MODELS, get_tts_router
+
+# Initialize clients (async, so a slow LLM or TTS call never blocks other candidates' requests)
+openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+elevenlabs_client = AsyncElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
 VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
+# Best-quality model; the router may pick a faster one per sentence to stay within the latency budget
+TTS_MODEL_ID = TTS_MODELS[0]
+TTS_VOICE_SETTINGS = VoiceSettings(
+    stability=0.5,
+    similarity_boost=0.75,
+    style=0.0,
+    use_speaker_boost=True
+)
+CHAT_MODEL = "gpt-5.2"
+
+
+async def complete_chat(
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_completion_tokens: int,
+    stream: bool = False
+) -> Union[str, AsyncIterator[str]]:
+    """Interviewer reply for a prompt: the full text, or an async iterator of text deltas when stream=True"""
+    if not stream:
+        response = await openai_client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            temperature=temperature,
+            max_completion_tokens=max_completion_tokens
+        )
+        return response.choices[0].message.content
+
+    response_stream = await openai_client.chat.completions.create(
+        model=CHAT_MODEL,
+        messages=messages,
+        temperature=temperature,
+        max_completion_tokens=max_completion_tokens,
+        stream=True
+    )
+    return _text_deltas(response_stream)
 
 
-def generate_greeting(student_name: str, resume_summary: str) -> str:
+async def _text_deltas(response_stream) -> AsyncIterator[str]:
+    async for chunk in response_stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def generate_greeting(student_name: str, resume_summary: str, stream: bool = False) -> str:
     """Generate personalized greeting for the student"""
 
     system_prompt = """You are Raj, a friendly ML Engineer interviewer representing Vizuara AI Labs. Your conversation style is natural, warm, and human - think of how Raj Abhijit Dandekar would speak.
@@ -38,20 +83,18 @@ Here's a summary of their background:
 
 Welcome them to the Vizuara AI Labs interview, explain what Vizuara does, mention what impressed you about their resume, and ask if they're ready to get started."""
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
+    return await complete_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=0.7,
-        max_completion_tokens=400
+        max_completion_tokens=400,
+        stream=stream
     )
 
-    return response.choices[0].message.content
 
-
-def continue_conversation(messages: List[Dict[str, str]], student_name: str, resume_summary: str) -> str:
+async def continue_conversation(messages: List[Dict[str, str]], student_name: str, resume_summary: str, stream: bool = False) -> str:
     """Continue the greeting conversation based on history"""
 
     system_prompt = f"""You are Raj, a friendly ML Engineer interviewer representing Vizuara AI Labs. Your conversation style is natural, warm, and human - think of how Raj Abhijit Dandekar would speak.
@@ -76,15 +119,13 @@ CRITICAL INSTRUCTIONS:
 
     conversation_messages = [{"role": "system", "content": system_prompt}] + messages
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=conversation_messages,
+    return await complete_chat(
+        conversation_messages,
         temperature=0.7,
-        max_completion_tokens=200
+        max_completion_tokens=200,
+        stream=stream
     )
 
-    return response.choices[0].message.content
-
 
 def strip_markdown(text: str) -> str:
     """Remove markdown formatting and AI artifacts from text"""
@@ -108,33 +149,73 @@ def strip_markdown(text: str) -> str:
     return text
 
 
-def text_to_speech(text: str) -> bytes:
-    """Convert text to speech using ElevenLabs"""
+async def text_to_speech(
+    text: str,
+    previous_text: Optional[str] = None,
+    model_id: Optional[str] = None,
+    output_format: Optional[str] = None
+) -> bytes:
+    """
+    Convert text to speech using ElevenLabs (previous_text: the sentence before, when synthesizing a reply piecewise).
+    Without model_id, the router picks the best model that fits the latency budget.
+    output_format is an ElevenLabs format from audio_formats.AUDIO_FORMATS (default DEFAULT_AUDIO_FORMAT).
+    """
+
+    from tts_cache import get_tts_cache, tts_cache_key, normalize_tts_text
+    from audio_formats import DEFAULT_AUDIO_FORMAT
+
+    output_format = output_format or DEFAULT_AUDIO_FORMAT
 
     # Strip markdown formatting before TTS
-    text = strip_markdown(text)
+    text = normalize_tts_text(strip_markdown(text))
+    router = get_tts_router()
+
+    # A clip from any model will do, best quality first (previous_text only nudges intonation,
+    # so it's left out of the key: a repeated sentence is reused in any context)
+    cache = get_tts_cache()
+    candidate_models = [model_id] if model_id else router.models
+    # The cache is SQLite on disk: looked up and written in a worker thread, not on the event loop
+    cached = await asyncio.to_thread(cache.get_first, [
+        tts_cache_key(text, VOICE_ID, m, TTS_VOICE_SETTINGS, output_format) for m in candidate_models
+    ])
+    if cached:
+        print(f"🔁 TTS cache hit ({len(cached)} bytes): {text[:50]}")
+        return cached
+
+    model_id = model_id or router.choose(text)
+    start = time.perf_counter()
+    first_byte = None
 
     try:
+        context = {"previous_text": strip_markdown(previous_text)} if previous_text else {}
         audio = elevenlabs_client.text_to_speech.convert(
             voice_id=VOICE_ID,
             text=text,
-            model_id="eleven_multilingual_v2",
-            voice_settings=VoiceSettings(
-                stability=0.5,
-                similarity_boost=0.75,
-                style=0.0,
-                use_speaker_boost=True
-            )
+            model_id=model_id,
+            voice_settings=TTS_VOICE_SETTINGS,
+            output_format=output_format,
+            **context
         )
 
-        # Convert generator to bytes
-        audio_bytes = b""
-        for chunk in audio:
-            audio_bytes += chunk
+        # Collect chunks and join once (appending to bytes copies the whole buffer every time)
+        chunks = []
+        async for chunk in audio:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            chunks.append(chunk)
+        audio_bytes = b"".join(chunks)
+
+        total = time.perf_counter() - start
+        router.observe(model_id, first_byte if first_byte is not None else total, total, len(text))
 
+        if audio_bytes:
+            await asyncio.to_thread(
+                cache.set, tts_cache_key(text, VOICE_ID, model_id, TTS_VOICE_SETTINGS, output_format), audio_bytes
+            )
         return audio_bytes
     except Exception as e:
-        print(f"Error generating speech: {e}")
+        router.observe_failure(model_id, len(text))
+        print(f"Error generating speech with {model_id}: {e}")
         return None
 
 
@@ -186,7 +267,7 @@ def is_ready_for_technical(user_message: str) -> bool:
     return False
 
 
-def start_project_questions(student_name: str, project_title: str, project_content: str, project_number: int = 1) -> str:
+async def start_project_questions(student_name: str, project_title: str, project_content: str, project_number: int = 1, stream: bool = False) -> str:
     """Generate opening question for project-based technical interview"""
 
     system_prompt = f"""You are Raj, an ML Engineer interviewer with a natural, conversational style - think Raj Abhijit Dandekar.
@@ -214,20 +295,18 @@ Project details:
 
 Ask them to explain what this project does and what their role was."""
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
+    return await complete_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=0.7,
-        max_completion_tokens=200
+        max_completion_tokens=200,
+        stream=stream
     )
 
-    return response.choices[0].message.content
-
 
-def continue_project_questions(messages: List[Dict[str, str]], student_name: str, project_title: str, project_content: str, project_number: int = 1) -> str:
+async def continue_project_questions(messages: List[Dict[str, str]], student_name: str, project_title: str, project_content: str, project_number: int = 1, stream: bool = False) -> str:
     """Continue project questions using FDR (Fundamentals, Practicals, Research) framework"""
 
     system_prompt = f"""You are Raj, an ML Engineer interviewer with a natural, conversational style - think Raj Abhijit Dandekar.
@@ -321,17 +400,15 @@ Or redirect if needed:
 
     conversation_messages = [{"role": "system", "content": system_prompt}] + messages
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=conversation_messages,
+    return await complete_chat(
+        conversation_messages,
         temperature=0.7,
-        max_completion_tokens=250
+        max_completion_tokens=250,
+        stream=stream
     )
 
-    return response.choices[0].message.content
 
-
-def start_factual_questions(student_name: str, first_question: Dict[str, str]) -> str:
+async def start_factual_questions(student_name: str, first_question: Dict[str, str], stream: bool = False) -> str:
     """Generate opening for factual questions phase"""
 
     system_prompt = """You are Raj, an ML Engineer interviewer with a natural, conversational style - think Raj Abhijit Dandekar.
@@ -355,26 +432,19 @@ Question to ask: {first_question['question']}
 
 Transition naturally and ask this question."""
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
+    return await complete_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=0.7,
-        max_completion_tokens=200
+        max_completion_tokens=200,
+        stream=stream
     )
 
-    return response.choices[0].message.content
 
-
-def continue_factual_questions(
-    messages: List[Dict[str, str]],
-    student_name: str,
-    next_question: Dict[str, str],
-    is_final: bool = False
-) -> str:
-    """Continue factual questions, provide feedback and ask next question"""
+def factual_system_prompt(student_name: str, next_question: Dict[str, str], is_final: bool = False) -> str:
+    """System prompt for a factual-phase turn (feedback on the answer, then the next question or wrap-up)"""
 
     if is_final:
         task_instruction = "Wrap up the interview naturally - thank them and let them know you'll be in touch soon"
@@ -408,19 +478,32 @@ CRITICAL RULES:
 
 2-3 sentences total. Keep it natural and honest."""
 
+    return system_prompt
+
+
+async def continue_factual_questions(
+    messages: List[Dict[str, str]],
+    student_name: str,
+    next_question: Dict[str, str],
+    is_final: bool = False,
+    system_prompt: Optional[str] = None,
+    stream: bool = False
+) -> str:
+    """Continue factual questions, provide feedback and ask next question (system_prompt may be prepared ahead)"""
+
+    system_prompt = system_prompt or factual_system_prompt(student_name, next_question, is_final)
+
     conversation_messages = [{"role": "system", "content": system_prompt}] + messages
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=conversation_messages,
+    return await complete_chat(
+        conversation_messages,
         temperature=0.7,
-        max_completion_tokens=300
+        max_completion_tokens=300,
+        stream=stream
     )
 
-    return response.choices[0].message.content
 
-
-def transition_to_second_project(student_name: str, project_title: str, project_content: str) -> str:
+async def transition_to_second_project(student_name: str, project_title: str, project_content: str, stream: bool = False) -> str:
     """Transition from first project to second project"""
 
     system_prompt = """You are Raj, an ML Engineer interviewer with a natural, conversational style - think Raj Abhijit Dandekar.
@@ -449,20 +532,18 @@ Project details:
 
 Transition to this project and ask them to explain it."""
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
+    return await complete_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=0.7,
-        max_completion_tokens=200
+        max_completion_tokens=200,
+        stream=stream
     )
 
-    return response.choices[0].message.content
-
 
-def start_gpa_questions(student_name: str, gpa: float, education_section: str) -> str:
+async def start_gpa_questions(student_name: str, gpa: float, education_section: str, stream: bool = False) -> str:
     """Start GPA discussion phase"""
 
     gpa_context = ""
@@ -494,14 +575,12 @@ Your task:
 
     user_prompt = f"""Transition to academic discussion and ask about {student_name}'s GPA or academic challenges."""
 
-    response = openai_client.chat.completions.create(
-        model="gpt-5.2",
-        messages=[
+    return await complete_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=0.7,
-        max_completion_tokens=200
+        max_completion_tokens=200,
+        stream=stream
     )
-
-    return response.choices[0].message.content
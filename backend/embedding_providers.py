@@ -0,0 +1,160 @@
+"""
+Embedding Providers for Question Selection
+OpenAI embeddings plus two local, zero-network alternatives (hashing vectorizer and
+TF-IDF/SVD fitted on ML_QUESTIONS), chosen with the EMBEDDING_PROVIDER setting
+"""
+
+import os
+import re
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import numpy as np
+from typing import Dict, List, Optional
+
+from knowledge_base import ML_QUESTIONS, EMBEDDING_MODEL, get_embeddings
+
+# openai | hashing | tfidf
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+# Local provider used when the configured one fails or times out (empty string disables it)
+EMBEDDING_FALLBACK_PROVIDER = os.getenv("EMBEDDING_FALLBACK_PROVIDER", "hashing")
+
+HASHING_DIM = int(os.getenv("HASHING_EMBEDDING_DIM", "1024"))
+TFIDF_SVD_DIM = int(os.getenv("TFIDF_SVD_DIM", "96"))
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word unigrams and bigrams"""
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class EmbeddingProvider(ABC):
+    """Interface: embed texts into vectors. `name` identifies the vector space (index and stored embeddings key on it)."""
+
+    name = ""
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed texts in input order, None for any item that failed"""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Remote OpenAI embeddings (text-embedding-3-small)"""
+
+    name = EMBEDDING_MODEL
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        return get_embeddings(texts)
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Deterministic signed hashing vectorizer over unigrams and bigrams, no fitting required"""
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _vector(self, text: str) -> Optional[List[float]]:
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token in tokens:
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+
+        return (vec / norm).tolist()
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        return [self._vector(text) for text in texts]
+
+
+class TfidfSvdEmbeddingProvider(EmbeddingProvider):
+    """TF-IDF over the question bank reduced with a truncated SVD (latent semantic analysis)"""
+
+    def __init__(self, dim: int = TFIDF_SVD_DIM):
+        from question_index import question_text
+
+        corpus = [question_text(topic, q) for topic, questions in ML_QUESTIONS.items() for q in questions]
+        docs = [tokenize(doc) for doc in corpus]
+
+        self.vocabulary: Dict[str, int] = {}
+        for tokens in docs:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        tf = np.zeros((len(docs), len(self.vocabulary)), dtype=np.float32)
+        for i, tokens in enumerate(docs):
+            for token in tokens:
+                tf[i, self.vocabulary[token]] += 1.0
+
+        # Smoothed idf, sublinear tf
+        doc_freq = (tf > 0).sum(axis=0)
+        self.idf = (np.log((1 + len(docs)) / (1 + doc_freq)) + 1).astype(np.float32)
+        tfidf = np.log1p(tf) * self.idf
+        tfidf /= np.maximum(np.linalg.norm(tfidf, axis=1, keepdims=True), 1e-12)
+
+        _, _, vt = np.linalg.svd(tfidf, full_matrices=False)
+        self.dim = min(dim, vt.shape[0])
+        self.components = vt[:self.dim]
+
+        # Name changes whenever the fitted model would, so indexes and stored embeddings get rebuilt
+        fit_hash = hashlib.sha256(json.dumps(ML_QUESTIONS).encode("utf-8")).hexdigest()[:8]
+        self.name = f"tfidf-svd-{self.dim}-{fit_hash}"
+
+    def _vector(self, text: str) -> Optional[List[float]]:
+        tf = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for token in tokenize(text):
+            col = self.vocabulary.get(token)
+            if col is not None:
+                tf[col] += 1.0
+
+        if not tf.any():
+            return None
+
+        vec = self.components @ (np.log1p(tf) * self.idf)
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+
+        return (vec / norm).tolist()
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        return [self._vector(text) for text in texts]
+
+
+PROVIDERS = {
+    "openai": OpenAIEmbeddingProvider,
+    "hashing": HashingEmbeddingProvider,
+    "tfidf": TfidfSvdEmbeddingProvider,
+}
+
+_providers: Dict[str, EmbeddingProvider] = {}
+
+
+def get_embedding_provider(kind: str = None) -> EmbeddingProvider:
+    """Provider instance for a kind (defaults to EMBEDDING_PROVIDER), created once per process"""
+    kind = kind or EMBEDDING_PROVIDER
+    if kind not in PROVIDERS:
+        raise ValueError(f"Unknown embedding provider '{kind}', expected one of {list(PROVIDERS)}")
+
+    if kind not in _providers:
+        _providers[kind] = PROVIDERS[kind]()
+
+    return _providers[kind]
+
+
+def get_fallback_embedding_provider() -> Optional[EmbeddingProvider]:
+    """Local provider for degraded mode, or None if disabled or the same as the primary"""
+    if not EMBEDDING_FALLBACK_PROVIDER or EMBEDDING_FALLBACK_PROVIDER == EMBEDDING_PROVIDER:
+        return None
+
+    return get_embedding_provider(EMBEDDING_FALLBACK_PROVIDER)
@@ -2,59 +2,65 @@
 Script to evaluate Aditya's interview
 """
 
-import os
+import asyncio
 from dotenv import load_dotenv
-from supabase import create_client
 import requests
 import json
 
 load_dotenv()
 
-# Initialize Supabase
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase = create_client(supabase_url, supabase_key)
+# Supabase, or the local SQLite file with DATABASE_BACKEND=sqlite (read after load_dotenv)
+from repositories import connect_database
 
-# Find Aditya's conversation
-print("🔍 Searching for Aditya's conversation...")
-conversations = supabase.table("conversations").select("*").order("created_at", desc=True).limit(10).execute()
 
-if not conversations.data:
-    print("❌ No conversations found for Aditya")
-    exit(1)
+async def find_latest_conversation():
+    """(conversation_id, student_name) of Aditya's most recent conversation"""
+    database = await connect_database()
 
-print(f"\n📋 Found {len(conversations.data)} recent conversation(s):")
+    # Find Aditya's conversation
+    print("🔍 Searching for Aditya's conversation...")
+    conversations = await database.conversations.recent(10)
 
-# Filter for Aditya
-aditya_convs = []
-for i, conv in enumerate(conversations.data):
-    # Get student info
-    student_result = supabase.table("students").select("name").eq("id", conv['student_id']).single().execute()
-    student_name = student_result.data['name'] if student_result.data else "Unknown"
+    if not conversations:
+        print("❌ No conversations found for Aditya")
+        exit(1)
 
-    print(f"\n{i+1}. ID: {conv['id']}")
-    print(f"   Student: {student_name}")
-    print(f"   Phase: {conv['phase']}")
-    print(f"   Project Q Count: {conv.get('project_questions_count', 0)}")
-    print(f"   Factual Q Count: {conv.get('factual_questions_count', 0)}")
+    print(f"\n📋 Found {len(conversations)} recent conversation(s):")
+
+    # Filter for Aditya
+    aditya_convs = []
+    for i, conv in enumerate(conversations):
+        # Get student info
+        student_name = await database.students.get_name(conv['student_id']) or "Unknown"
+
+        print(f"\n{i+1}. ID: {conv['id']}")
+        print(f"   Student: {student_name}")
+        print(f"   Phase: {conv['phase']}")
+        print(f"   Project Q Count: {conv.get('project_questions_count', 0)}")
+        print(f"   Factual Q Count: {conv.get('factual_questions_count', 0)}")
+
+        if "aditya" in student_name.lower():
+            aditya_convs.append((conv, student_name))
 
-    if "aditya" in student_name.lower():
-        aditya_convs.append((conv, student_name))
+    if not aditya_convs:
+        print("\n❌ No conversations found for Aditya")
+        exit(1)
+
+    # Use the most recent Aditya conversation
+    latest_conv, student_name = aditya_convs[0]
+    conversation_id = latest_conv['id']
+
+    print(f"\n✅ Using most recent Aditya conversation: {conversation_id}")
+    print(f"   Student: {student_name}")
 
-if not aditya_convs:
-    print("\n❌ No conversations found for Aditya")
-    exit(1)
+    # Fetch messages to verify we have enough data
+    messages = await database.messages.for_conversation(conversation_id)
+    print(f"\n📨 Total messages in conversation: {len(messages)}")
 
-# Use the most recent Aditya conversation
-latest_conv, student_name = aditya_convs[0]
-conversation_id = latest_conv['id']
+    return conversation_id, student_name
 
-print(f"\n✅ Using most recent Aditya conversation: {conversation_id}")
-print(f"   Student: {student_name}")
 
-# Fetch messages to verify we have enough data
-messages = supabase.table("messages").select("*").eq("conversation_id", conversation_id).order("created_at").execute()
-print(f"\n📨 Total messages in conversation: {len(messages.data)}")
+conversation_id, student_name = asyncio.run(find_latest_conversation())
 
 # Call evaluation endpoint
 print(f"\n🎯 Generating evaluation report...")
@@ -4,11 +4,12 @@ Evaluates candidates on Project Questions and Factual Questions
 """
 
 import os
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from typing import List, Dict, Tuple
 from supabase import Client
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 
 def build_metadata_summary(messages: List[Dict]) -> str:
@@ -60,7 +61,7 @@ def build_metadata_summary(messages: List[Dict]) -> str:
     )
 
 
-def evaluate_project_phase(messages: List[Dict[str, str]], student_name: str) -> Dict[str, any]:
+async def evaluate_project_phase(messages: List[Dict[str, str]], student_name: str) -> Dict[str, any]:
     """
     Evaluate Project Phase (Phase III) based on 3 metrics:
     1. Detail Level: How thoroughly do they explain their project?
@@ -141,7 +142,7 @@ Return ONLY a JSON object with this exact format:
 Provide scores and justifications for Detail Level, Clarity, and Socrates Metric."""
 
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model="gpt-5.2",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -172,7 +173,7 @@ Provide scores and justifications for Detail Level, Clarity, and Socrates Metric
         }
 
 
-def evaluate_factual_phase(messages: List[Dict[str, str]], questions_asked: List[str]) -> Dict[str, any]:
+async def evaluate_factual_phase(messages: List[Dict[str, str]], questions_asked: List[str]) -> Dict[str, any]:
     """
     Evaluate Factual Phase (Phase IV) based on correctness of answers.
     """
@@ -199,8 +200,7 @@ def evaluate_factual_phase(messages: List[Dict[str, str]], questions_asked: List
         }
 
     # Evaluate each answer
-    evaluations = []
-    for qa in qa_pairs:
+    async def evaluate_answer(qa: Dict) -> Dict:
         system_prompt = """You are an expert ML interviewer evaluating factual answers.
 
 The question is from a curated ML interview question bank (andrewekhalel/MLQuestions or huyenchip.com/ml-interviews-book).
@@ -260,7 +260,7 @@ Student Answer: {qa['student_answer']}{metadata_note}
 Evaluate the correctness of this answer."""
 
         try:
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model="gpt-5.2",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -275,15 +275,18 @@ Evaluate the correctness of this answer."""
             eval_result = json.loads(response.choices[0].message.content)
             eval_result["question"] = qa["question"]
             eval_result["student_answer"] = qa["student_answer"]
-            evaluations.append(eval_result)
+            return eval_result
 
         except Exception as e:
             print(f"Error evaluating Q&A: {e}")
-            evaluations.append({
+            return {
                 "score": 0,
                 "question": qa["question"],
                 "error": str(e)
-            })
+            }
+
+    # Answers are graded independently, so grade them concurrently (gather keeps question order)
+    evaluations = list(await asyncio.gather(*(evaluate_answer(qa) for qa in qa_pairs)))
 
     # Calculate overall factual score
     total_score = sum([e.get("score", 0) for e in evaluations])
@@ -369,7 +372,7 @@ def generate_final_report(
     return report
 
 
-def generate_dynamic_recommendations(
+async def generate_dynamic_recommendations(
     eval_type: str,
     evaluation_data: Dict,
     conversation_messages: List[Dict[str, str]]
@@ -414,7 +417,7 @@ Conversation transcript:
 Generate specific, personalized recommendations."""
 
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model="gpt-5.2",
             messages=[
                 {"role": "system", "content": system_prompt},
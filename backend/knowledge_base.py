@@ -4,12 +4,31 @@ Handles storage and retrieval of factual ML questions using RAG
 """
 
 import os
+import asyncio
+import hashlib
 import numpy as np
-from typing import List, Dict, Tuple
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Dict, Tuple, Optional, Union
+from openai import OpenAI, AsyncOpenAI, BadRequestError
 from supabase import Client
 
+# Embeddings stay on the sync client: they run inside selection code that request handlers offload
+# to worker threads (and in the index build). Chat calls made from handlers use the async client.
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async_openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Embeddings endpoint limits: 2048 inputs and 300k tokens per request, 8191 tokens per input.
+# We stay well under them and estimate tokens from characters (~4 chars per token).
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_BATCH_TOKENS = 200_000
+EMBEDDING_MAX_INPUT_TOKENS = 8000
+EMBEDDING_CONCURRENCY = 4
+# Keep embedding calls off the slow path: after this we give up and use the local fallback embedder
+EMBEDDING_TIMEOUT_SECONDS = float(os.getenv("EMBEDDING_TIMEOUT_SECONDS", "5"))
+
+embedding_client = openai_client.with_options(timeout=EMBEDDING_TIMEOUT_SECONDS, max_retries=1)
 
 # ML Questions Bank from andrewekhalel/MLQuestions and huyenchip.com/ml-interviews-book
 # Sources:
@@ -183,17 +202,142 @@ ML_QUESTIONS = {
 }
 
 
-def get_embedding(text: str) -> List[float]:
-    """Generate embedding for text using OpenAI"""
+def estimate_tokens(text: str) -> int:
+    """Rough token count for batching (OpenAI tokenizers average ~4 chars per token)"""
+    return len(text) // 4 + 1
+
+
+def batch_embedding_inputs(texts: List[str]) -> List[List[int]]:
+    """Group input positions into batches bounded by item count and estimated tokens"""
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = min(estimate_tokens(text), EMBEDDING_MAX_INPUT_TOKENS)
+        if current and (len(current) >= EMBEDDING_BATCH_SIZE or current_tokens + tokens > EMBEDDING_BATCH_TOKENS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def _embed_batch(texts: List[str]) -> List[Optional[List[float]]]:
+    """Embed one batch. On a rejected batch, retry item by item so one bad input doesn't sink the rest."""
     try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text
+        response = embedding_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts
         )
-        return response.data[0].embedding
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+    except BadRequestError as e:
+        if len(texts) == 1:
+            print(f"Error generating embedding: {e}")
+            return [None]
+        return [_embed_batch([text])[0] for text in texts]
     except Exception as e:
-        print(f"Error generating embedding: {e}")
-        return []
+        print(f"Error generating embeddings for batch of {len(texts)}: {e}")
+        return [None] * len(texts)
+
+
+def get_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
+    """
+    Generate embeddings for many texts using batched OpenAI requests.
+    Batches run concurrently; results come back in input order, with None for any item that failed.
+    """
+    results: List[Optional[List[float]]] = [None] * len(texts)
+
+    # Empty inputs are rejected by the API, and over-long ones are truncated to the per-input limit
+    max_chars = EMBEDDING_MAX_INPUT_TOKENS * 4
+    prepared = []
+    positions = []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            print(f"Skipping embedding for empty input at position {i}")
+            continue
+        if len(text) > max_chars:
+            print(f"Truncating embedding input at position {i} ({len(text)} chars)")
+            text = text[:max_chars]
+        prepared.append(text)
+        positions.append(i)
+
+    batches = batch_embedding_inputs(prepared)
+    if not batches:
+        return results
+
+    batch_texts = [[prepared[j] for j in batch] for batch in batches]
+
+    if len(batches) == 1:
+        batch_results = [_embed_batch(batch_texts[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(EMBEDDING_CONCURRENCY, len(batches))) as executor:
+            batch_results = list(executor.map(_embed_batch, batch_texts))
+
+    for batch, embeddings in zip(batches, batch_results):
+        for j, embedding in zip(batch, embeddings):
+            results[positions[j]] = embedding
+
+    return results
+
+
+def get_embedding(text: str) -> List[float]:
+    """Generate embedding for text using OpenAI"""
+    return get_embeddings([text])[0] or []
+
+
+def build_resume_text(resume_sections: Dict[str, str]) -> str:
+    """Combine the resume sections used for topic extraction and question matching"""
+    resume_text = ""
+    for section_name in ["Projects", "Work Experience", "Technical Skills"]:
+        if section_name in resume_sections:
+            resume_text += f"\n{section_name}:\n{resume_sections[section_name]}\n"
+    return resume_text
+
+
+def resume_content_hash(resume_text: str) -> str:
+    """Content hash identifying the resume text a stored embedding was computed from"""
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+
+def compute_resume_embedding(resume_sections: Dict[str, str]) -> Dict[str, any]:
+    """
+    Embed the resume once so it can be stored with the student.
+    Returns the student columns to persist (embedding is None if it couldn't be generated).
+    """
+    from embedding_providers import get_embedding_provider
+
+    provider = get_embedding_provider()
+    resume_text = build_resume_text(resume_sections)
+    embedding = provider.embed([resume_text])[0] if resume_text else None
+
+    return {
+        "resume_embedding": embedding,
+        "resume_embedding_model": provider.name if embedding else None,
+        "resume_embedding_hash": resume_content_hash(resume_text) if embedding else None
+    }
+
+
+def stored_resume_embedding(student: Dict, resume_sections: Dict[str, str]) -> Optional[List[float]]:
+    """Return the student's stored resume embedding if it matches the current sections and embedding provider"""
+    from embedding_providers import get_embedding_provider
+
+    embedding = student.get("resume_embedding")
+    if not embedding:
+        return None
+
+    if student.get("resume_embedding_model") != get_embedding_provider().name:
+        return None
+
+    if student.get("resume_embedding_hash") != resume_content_hash(build_resume_text(resume_sections)):
+        return None
+
+    return embedding
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -214,16 +358,24 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     return float(dot_product / (norm1 * norm2))
 
 
-def extract_student_topics(resume_sections: Dict[str, str]) -> List[str]:
-    """Use LLM to analyze student resume and extract ML topics of interest"""
+# Topic classifier for the factual phase: llm (chat completion) or centroid (embeddings only, no LLM call)
+TOPIC_CLASSIFIER = os.getenv("TOPIC_CLASSIFIER", "llm")
+# Centroid classifier keeps up to this many best-matching topics scoring at least
+# TOPIC_CENTROID_MIN_RATIO of the best one; the defaults then add foundational topics
+TOPIC_CENTROID_COUNT = 3
+TOPIC_CENTROID_MIN_RATIO = 0.5
 
-    # Combine relevant resume sections
-    resume_text = ""
-    for section_name in ["Projects", "Work Experience", "Technical Skills"]:
-        if section_name in resume_sections:
-            resume_text += f"\n{section_name}:\n{resume_sections[section_name]}\n"
+# Foundational topics used to top up a short topic list, in order
+DEFAULT_TOPICS = [
+    "Fundamentals & Theory",
+    "Neural Networks & Deep Learning",
+    "Model Evaluation & Metrics",
+    "Computer Vision"
+]
+
+TOPIC_MODEL = "gpt-5.2"
 
-    system_prompt = """You are an ML interview expert. Analyze the student's resume and identify their areas of expertise and interest in machine learning.
+TOPIC_SYSTEM_PROMPT = """You are an ML interview expert. Analyze the student's resume and identify their areas of expertise and interest in machine learning.
 
 Output ONLY a comma-separated list of broad ML topics from the following options:
 - Fundamentals & Theory
@@ -239,19 +391,56 @@ Output ONLY a comma-separated list of broad ML topics from the following options
 
 IMPORTANT: Select AT LEAST 3-4 topics to ensure interview diversity. Include both specific areas of expertise and foundational topics."""
 
-    user_prompt = f"""Analyze this resume and list 3-4 ML topics this student should be interviewed on:
+TOPIC_USER_PROMPT = """Analyze this resume and list 3-4 ML topics this student should be interviewed on:
 
 {resume_text}
 
 Output format: Topic1, Topic2, Topic3, Topic4 (comma-separated, no explanations)
 Include their specific areas AND foundational topics for variety."""
 
+# Changes whenever the prompts, model or topic list do, so cached topics from an older prompt are never reused
+TOPIC_PROMPT_VERSION = hashlib.sha256(
+    "\n".join([TOPIC_MODEL, TOPIC_SYSTEM_PROMPT, TOPIC_USER_PROMPT, *ML_QUESTIONS]).encode("utf-8")
+).hexdigest()[:12]
+
+# Same resume, same prompt -> same topics: repeat interviews skip the LLM call
+TOPIC_CACHE_TTL_SECONDS = float(os.getenv("TOPIC_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+_topic_cache = None
+
+
+def get_topic_cache():
+    """Persistent cache of extracted topics keyed by resume hash + prompt version (created on first use)"""
+    global _topic_cache
+    if _topic_cache is None:
+        from cache import PersistentCache
+        _topic_cache = PersistentCache("student_topics", ttl_seconds=TOPIC_CACHE_TTL_SECONDS)
+    return _topic_cache
+
+
+def topic_cache_key(resume_text: str) -> str:
+    return f"{TOPIC_PROMPT_VERSION}:{resume_content_hash(resume_text)}"
+
+
+async def extract_student_topics(resume_sections: Dict[str, str]) -> List[str]:
+    """Use LLM to analyze student resume and extract ML topics of interest (cached per resume and prompt version)"""
+
+    # Combine relevant resume sections
+    resume_text = build_resume_text(resume_sections)
+
+    cache_key = topic_cache_key(resume_text)
+    # The topic cache is SQLite: read and write it in a worker thread, not on the event loop
+    cached_topics = await asyncio.to_thread(get_topic_cache().get, cache_key)
+    if cached_topics:
+        print(f"📊 Using cached topics for interview: {cached_topics}")
+        return cached_topics
+
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-5.2",
+        response = await async_openai_client.chat.completions.create(
+            model=TOPIC_MODEL,
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "system", "content": TOPIC_SYSTEM_PROMPT},
+                {"role": "user", "content": TOPIC_USER_PROMPT.format(resume_text=resume_text)}
             ],
             temperature=0.3,
             max_completion_tokens=200
@@ -260,26 +449,13 @@ Include their specific areas AND foundational topics for variety."""
         topics_str = response.choices[0].message.content.strip()
         topics = [t.strip() for t in topics_str.split(',')]
 
-        # Validate topics against our question bank
-        valid_topics = [t for t in topics if t in ML_QUESTIONS]
-
-        # Ensure we have at least 3-4 topics for diversity
-        default_topics = [
-            "Fundamentals & Theory",
-            "Neural Networks & Deep Learning",
-            "Model Evaluation & Metrics",
-            "Computer Vision"
-        ]
-
-        # Add default topics if we don't have enough
-        for default_topic in default_topics:
-            if len(valid_topics) >= 4:
-                break
-            if default_topic not in valid_topics and default_topic in ML_QUESTIONS:
-                valid_topics.append(default_topic)
+        valid_topics = ensure_topic_diversity(topics)
 
         print(f"📊 Extracted {len(valid_topics)} topics for interview: {valid_topics}")
 
+        # Only successful extractions are cached; the error fallback below is retried next time
+        await asyncio.to_thread(get_topic_cache().set, cache_key, valid_topics)
+
         return valid_topics
 
     except Exception as e:
@@ -287,6 +463,56 @@ Include their specific areas AND foundational topics for variety."""
         return ["Fundamentals & Theory"]
 
 
+def ensure_topic_diversity(topics: List[str]) -> List[str]:
+    """Keep topics that exist in the question bank, then top up with defaults until there are at least 4"""
+    # Validate topics against our question bank
+    valid_topics = []
+    for topic in topics:
+        if topic in ML_QUESTIONS and topic not in valid_topics:
+            valid_topics.append(topic)
+
+    # Add default topics if we don't have enough
+    for default_topic in DEFAULT_TOPICS:
+        if len(valid_topics) >= 4:
+            break
+        if default_topic not in valid_topics and default_topic in ML_QUESTIONS:
+            valid_topics.append(default_topic)
+
+    return valid_topics
+
+
+def rank_topics_by_centroid(resume_text: str, resume_embedding: Optional[List[float]] = None) -> List[Tuple[str, float]]:
+    """All topics with the resume's cosine similarity to each topic centroid, best first (empty if no embedding)"""
+    index, query = score_resume_against_questions(resume_text, resume_embedding)
+    if query is None:
+        return []
+
+    names, centroids = index.topic_centroids()
+    scores = centroids @ query.vec
+    return [(names[i], float(scores[i])) for i in np.argsort(-scores)]
+
+
+def classify_topics_by_centroid(resume_sections: Dict[str, str], resume_embedding: Optional[List[float]] = None) -> List[str]:
+    """Zero-LLM alternative to extract_student_topics: closest topic centroids to the resume embedding"""
+    ranked = rank_topics_by_centroid(build_resume_text(resume_sections), resume_embedding)
+
+    best_score = ranked[0][1] if ranked else 0.0
+    topics = ensure_topic_diversity([
+        topic for topic, score in ranked[:TOPIC_CENTROID_COUNT]
+        if score >= TOPIC_CENTROID_MIN_RATIO * best_score
+    ])
+
+    print(f"📊 Classified {len(topics)} topics for interview: {topics}")
+    return topics
+
+
+async def choose_student_topics(resume_sections: Dict[str, str], resume_embedding: Optional[List[float]] = None) -> List[str]:
+    """Topics for the factual phase from the configured TOPIC_CLASSIFIER"""
+    if TOPIC_CLASSIFIER == "centroid":
+        return await asyncio.to_thread(classify_topics_by_centroid, resume_sections, resume_embedding)
+    return await extract_student_topics(resume_sections)
+
+
 def get_questions_for_topics(topics: List[str], num_questions: int = 10) -> List[Dict[str, str]]:
     """Get relevant questions based on student's topics"""
 
@@ -305,65 +531,67 @@ def get_questions_for_topics(topics: List[str], num_questions: int = 10) -> List
     return questions[:num_questions]
 
 
-def select_next_question(
-    asked_questions: List[str],
-    student_topics: List[str],
-    resume_text: str = "",
-    difficulty: str = "medium",
-    topics_covered: Dict[str, int] = None
-) -> Dict[str, any]:
+def score_resume_against_questions(resume_text: str = "", resume_embedding: Optional[List[float]] = None):
     """
-    Select next question with topic diversity to ensure variety across 3-4 topics.
-    Limits questions from same topic to 1-2 before switching.
+    Prepare the resume embedding for searches against the precomputed question index.
+    Returns (index, query), or (None, None) if no embedding or index is available.
     """
+    from question_index import get_question_index
+    from embedding_providers import get_embedding_provider, get_fallback_embedding_provider
 
-    if topics_covered is None:
-        topics_covered = {}
+    # Embed the resume (unless already stored) and score it against the precomputed question index
+    provider = get_embedding_provider()
+    if not resume_embedding:
+        resume_embedding = provider.embed([resume_text])[0]
+    index = get_question_index(provider)
+    query = index.query(resume_embedding) if index is not None else None
+
+    # Degraded mode: if the configured embedder failed or timed out, rank with the local fallback
+    fallback = get_fallback_embedding_provider()
+    if query is None and fallback is not None and resume_text:
+        print(f"⚠️ Embedding provider {provider.name} unavailable, ranking with {fallback.name}")
+        index = get_question_index(fallback)
+        query = index.query(fallback.embed([resume_text])[0]) if index is not None else None
+
+    if query is None:
+        return None, None
+
+    return index, query
+
+
+def _available_question_ids(asked_ids, student_topics: List[str]) -> List[int]:
+    """Unasked questions from the student's topics, or from any topic once those are exhausted"""
+    from question_catalog import ALL_QUESTION_IDS, TOPIC_QUESTION_IDS
 
     # Get all available questions for student's topics
-    available_questions = []
-    for topic in student_topics:
-        if topic in ML_QUESTIONS:
-            for q in ML_QUESTIONS[topic]:
-                if q not in asked_questions:
-                    available_questions.append({
-                        "topic": topic,
-                        "question": q
-                    })
+    available_ids = [
+        qid for topic in student_topics
+        for qid in TOPIC_QUESTION_IDS.get(topic, [])
+        if qid not in asked_ids
+    ]
 
     # If all questions exhausted, wrap around or pick from any topic
-    if not available_questions:
-        for topic, questions in ML_QUESTIONS.items():
-            for q in questions:
-                if q not in asked_questions:
-                    available_questions.append({
-                        "topic": topic,
-                        "question": q
-                    })
-
-    # If we have resume text, calculate similarity scores
-    if available_questions and resume_text:
-        # Generate embedding for resume
-        resume_embedding = get_embedding(resume_text)
-
-        # Calculate similarity scores for each question
-        scored_questions = []
-        for q_data in available_questions:
-            # Combine topic and question for better context matching
-            question_text = f"{q_data['topic']}: {q_data['question']}"
-            question_embedding = get_embedding(question_text)
-
-            similarity = cosine_similarity(resume_embedding, question_embedding)
-
-            scored_questions.append({
-                "topic": q_data["topic"],
-                "question": q_data["question"],
-                "similarity_score": round(similarity, 3),
-                "match_reason": f"Matched based on {q_data['topic']} expertise in resume"
-            })
-
-        # Sort by similarity score (highest first)
-        scored_questions.sort(key=lambda x: x["similarity_score"], reverse=True)
+    if not available_ids:
+        available_ids = [qid for qid in ALL_QUESTION_IDS if qid not in asked_ids]
+
+    return available_ids
+
+
+def _pick_question(
+    asked_ids,
+    student_topics: List[str],
+    topics_covered: Dict[str, int],
+    index=None,
+    query=None,
+    verbose: bool = True
+) -> Dict[str, any]:
+    """One selection step: best-scoring available question under the topic diversity rules"""
+    from question_catalog import QUESTIONS, QUESTION_TOPIC
+
+    available_ids = _available_question_ids(asked_ids, student_topics)
+
+    if available_ids and query is not None:
+        available_mask = index.id_mask(available_ids)
 
         # TOPIC DIVERSITY LOGIC - Ensure we ask from 3-4 different topics
         # Priority: Topics with 0 questions > Topics with 1 question > Topics with 2+ questions
@@ -372,57 +600,63 @@ def select_next_question(
         topics_not_asked = [topic for topic in student_topics if topics_covered.get(topic, 0) == 0]
         topics_asked_once = [topic for topic in student_topics if topics_covered.get(topic, 0) == 1]
 
-        print(f"📊 Topics not asked yet: {topics_not_asked}")
-        print(f"📊 Topics asked once: {topics_asked_once}")
-        print(f"📊 Topics covered: {topics_covered}")
+        if verbose:
+            print(f"📊 Topics not asked yet: {topics_not_asked}")
+            print(f"📊 Topics asked once: {topics_asked_once}")
+            print(f"📊 Topics covered: {topics_covered}")
+
+        best_rows = np.empty(0, dtype=np.int64)
 
         # PRIORITY 1: Pick from topics not asked yet (to ensure diversity across 3-4 topics)
         if topics_not_asked:
-            candidate_questions = [q for q in scored_questions if q["topic"] in topics_not_asked]
-            if candidate_questions:
-                best_match = candidate_questions[0]
-                print(f"✅ Selected from new topic: {best_match['topic']}")
-            else:
-                best_match = scored_questions[0]
+            best_rows, best_scores = query.top_k(1, allowed_mask=available_mask & index.topic_mask(topics_not_asked))
+            if best_rows.size and verbose:
+                print(f"✅ Selected from new topic: {index.topics[best_rows[0]]}")
 
         # PRIORITY 2: Pick from topics asked only once (to balance coverage)
         elif topics_asked_once:
-            candidate_questions = [q for q in scored_questions if q["topic"] in topics_asked_once]
-            if candidate_questions:
-                best_match = candidate_questions[0]
-                print(f"✅ Selected from topic asked once: {best_match['topic']}")
-            else:
-                best_match = scored_questions[0]
+            best_rows, best_scores = query.top_k(1, allowed_mask=available_mask & index.topic_mask(topics_asked_once))
+            if best_rows.size and verbose:
+                print(f"✅ Selected from topic asked once: {index.topics[best_rows[0]]}")
+
+        # Highest similarity across everything still available
+        top_rows, top_scores = query.top_k(1, allowed_mask=available_mask)
 
         # PRIORITY 3: All topics covered at least twice, pick highest similarity
-        else:
-            best_match = scored_questions[0]
-            print(f"✅ All topics covered, picking highest similarity: {best_match['topic']}")
+        if not best_rows.size:
+            best_rows, best_scores = top_rows, top_scores
+            if not topics_not_asked and not topics_asked_once and verbose:
+                print(f"✅ All topics covered, picking highest similarity: {index.topics[best_rows[0]]}")
 
-        all_scores = [q["similarity_score"] for q in scored_questions]
+        best_row = int(best_rows[0])
+        best_topic = index.topics[best_row]
 
         return {
-            "topic": best_match["topic"],
-            "question": best_match["question"],
-            "similarity_score": best_match["similarity_score"],
-            "max_similarity": max(all_scores),
-            "match_reason": best_match["match_reason"],
+            "question_id": int(index.ids[best_row]),
+            "topic": best_topic,
+            "question": index.questions[best_row],
+            "similarity_score": round(float(best_scores[0]), 3),
+            "max_similarity": round(float(top_scores[0]), 3),
+            "match_reason": f"Matched based on {best_topic} expertise in resume",
             "matched_topics": student_topics
         }
 
     # Return first available question (no similarity scoring)
-    if available_questions:
+    if available_ids:
+        first_id = available_ids[0]
         return {
-            "topic": available_questions[0]["topic"],
-            "question": available_questions[0]["question"],
+            "question_id": first_id,
+            "topic": QUESTION_TOPIC[first_id],
+            "question": QUESTIONS[first_id],
             "similarity_score": None,
             "max_similarity": None,
-            "match_reason": f"Selected from {available_questions[0]['topic']} topic",
+            "match_reason": f"Selected from {QUESTION_TOPIC[first_id]} topic",
             "matched_topics": student_topics
         }
 
     # Fallback
     return {
+        "question_id": None,
         "topic": "Fundamentals & Theory",
         "question": "Explain the bias-variance tradeoff in machine learning?",
         "similarity_score": None,
@@ -430,3 +664,145 @@ def select_next_question(
         "match_reason": "Default fallback question",
         "matched_topics": []
     }
+
+
+def select_next_question(
+    asked_questions: List[Union[str, int]],
+    student_topics: List[str],
+    resume_text: str = "",
+    difficulty: str = "medium",
+    topics_covered: Dict[str, int] = None,
+    resume_embedding: Optional[List[float]] = None
+) -> Dict[str, any]:
+    """
+    Select next question with topic diversity to ensure variety across 3-4 topics.
+    Limits questions from same topic to 1-2 before switching.
+    asked_questions may hold question texts or catalog IDs.
+    Pass a precomputed resume_embedding to skip re-embedding resume_text.
+    """
+    from question_catalog import to_question_ids
+
+    if topics_covered is None:
+        topics_covered = {}
+
+    asked_ids = to_question_ids(asked_questions)
+
+    index, query = None, None
+    if _available_question_ids(asked_ids, student_topics) and (resume_text or resume_embedding):
+        index, query = score_resume_against_questions(resume_text, resume_embedding)
+
+    return _pick_question(asked_ids, student_topics, topics_covered, index, query)
+
+
+# Factual phase length and how many ranked alternates to keep behind it
+FACTUAL_PLAN_QUESTIONS = 5
+FACTUAL_PLAN_ALTERNATES = 5
+
+
+def plan_factual_questions(
+    student_topics: List[str],
+    resume_text: str = "",
+    resume_embedding: Optional[List[float]] = None,
+    asked_questions: List[Union[str, int]] = None,
+    num_questions: int = FACTUAL_PLAN_QUESTIONS,
+    num_alternates: int = FACTUAL_PLAN_ALTERNATES
+) -> List[Dict[str, any]]:
+    """
+    Plan the whole factual phase in one pass: the resume is scored once, then the selection
+    step is replayed with the same topic diversity rules to give the ordered questions
+    followed by ranked alternates. Entries are compact (catalog ID + scores) for persisting.
+    """
+    from question_catalog import to_question_ids, topics_covered_for
+
+    asked_ids = to_question_ids(asked_questions)
+    topics_covered = topics_covered_for(asked_ids)
+
+    index, query = None, None
+    if resume_text or resume_embedding:
+        index, query = score_resume_against_questions(resume_text, resume_embedding)
+
+    plan = []
+    for _ in range(num_questions + num_alternates):
+        picked = _pick_question(asked_ids, student_topics, topics_covered, index, query, verbose=False)
+        if picked["question_id"] is None or picked["question_id"] in asked_ids:
+            break
+
+        asked_ids.add(picked["question_id"])
+        topics_covered[picked["topic"]] = topics_covered.get(picked["topic"], 0) + 1
+        plan.append({
+            "question_id": picked["question_id"],
+            "similarity_score": picked["similarity_score"],
+            "max_similarity": picked["max_similarity"]
+        })
+
+    print(f"📋 Planned {min(len(plan), num_questions)} factual questions + "
+          f"{max(0, len(plan) - num_questions)} alternates: {[e['question_id'] for e in plan]}")
+
+    return plan
+
+
+def next_planned_question(
+    plan: List[Dict[str, any]],
+    asked_questions: List[Union[str, int]],
+    student_topics: List[str]
+) -> Optional[Dict[str, any]]:
+    """
+    Next entry of a persisted factual plan that hasn't been asked yet, expanded into the same
+    shape select_next_question returns. None if the plan is missing or used up.
+    """
+    from question_catalog import QUESTIONS, QUESTION_TOPIC, to_question_ids
+
+    asked_ids = to_question_ids(asked_questions)
+
+    for entry in plan or []:
+        qid = entry.get("question_id")
+        if qid in asked_ids or qid not in QUESTIONS:
+            continue
+
+        topic = QUESTION_TOPIC[qid]
+        return {
+            "question_id": qid,
+            "topic": topic,
+            "question": QUESTIONS[qid],
+            "similarity_score": entry.get("similarity_score"),
+            "max_similarity": entry.get("max_similarity"),
+            "match_reason": (f"Matched based on {topic} expertise in resume"
+                             if entry.get("similarity_score") is not None else f"Selected from {topic} topic"),
+            "matched_topics": student_topics
+        }
+
+    return None
+
+
+async def next_factual_question(
+    factual_plan: List[Dict[str, any]],
+    asked_ids: List[int],
+    student_topics: List[str],
+    resume_text: str,
+    get_resume_embedding: Callable[[], Awaitable[Optional[List[float]]]]
+) -> Dict[str, any]:
+    """
+    Next factual question for a conversation: the next plan entry, or a live selection when there's
+    no plan (conversation started before plans) or it's used up. The resume embedding is only loaded
+    for live selection.
+    """
+    from question_catalog import topics_covered_for
+
+    next_q = next_planned_question(factual_plan, asked_ids, student_topics)
+    if next_q is not None:
+        return next_q
+
+    topics_covered = topics_covered_for(asked_ids)
+    print(f"📊 Topics covered so far: {topics_covered}")
+
+    resume_embedding = await get_resume_embedding()
+
+    # Embedding the resume (if not stored) and scoring are blocking, keep them off the event loop
+    return await asyncio.to_thread(
+        select_next_question,
+        asked_ids,
+        student_topics,
+        resume_text,
+        topics_covered=topics_covered,
+        resume_embedding=resume_embedding
+    )
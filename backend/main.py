@@ -1,15 +1,18 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import google.generativeai as genai
 import os
+import asyncio
 import tempfile
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import re
-from supabase import create_client, Client
 from dotenv import load_dotenv
 import uuid
 import PyPDF2
 
+from repositories import Database, connect_database
+
 load_dotenv()
 
 # Configure Gemini API
@@ -28,38 +31,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Supabase client
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
+# Data access (repositories.py): the Supabase project, or a local SQLite file with
+# DATABASE_BACKEND=sqlite; connected at startup
+database: Database = None
+
+
+@app.on_event("startup")
+async def connect_database_on_startup():
+    global database
+    database = await connect_database()
+    # Refuse to start without the commit_turn function, rather than failing every turn
+    await database.check_schema()
+
+
+@app.on_event("startup")
+def load_question_index_on_startup():
+    """Memory-map the precomputed question embedding index before serving traffic"""
+    from question_index import get_question_index
+    get_question_index()
 
 
-def run_project_evaluation(conversation_id: str, student_name: str):
+async def run_project_evaluation(conversation_id: str, student_name: str):
     """Background task to evaluate project phase and store results."""
     from evaluation import evaluate_project_phase, generate_dynamic_recommendations
     import json
 
     try:
         # Fetch project-phase messages using phase tag
-        messages_result = supabase.table("messages").select("*").eq(
-            "conversation_id", conversation_id
-        ).eq("phase", "project_questions").order("created_at").execute()
-
-        project_messages = [{"role": m["role"], "content": m["content"], "metadata": m.get("metadata")} for m in messages_result.data]
+        project_messages = await database.messages.for_phase(conversation_id, "project_questions")
 
         if len(project_messages) > 2:
-            evaluation = evaluate_project_phase(project_messages, student_name)
-            recommendations = generate_dynamic_recommendations(
+            evaluation = await evaluate_project_phase(project_messages, student_name)
+            recommendations = await generate_dynamic_recommendations(
                 "project", evaluation, project_messages
             )
 
             # Store in database
-            supabase.table("evaluations").insert({
-                "conversation_id": conversation_id,
-                "eval_type": "project",
-                "eval_data": json.dumps(evaluation),
-                "recommendations": json.dumps(recommendations)
-            }).execute()
+            await database.evaluations.add(
+                conversation_id, "project", json.dumps(evaluation), json.dumps(recommendations)
+            )
 
             print(f"Project evaluation stored for conversation {conversation_id}")
         else:
@@ -68,32 +78,25 @@ def run_project_evaluation(conversation_id: str, student_name: str):
         print(f"Error in background project evaluation: {e}")
 
 
-def run_factual_evaluation(conversation_id: str, questions_asked: List[str]):
+async def run_factual_evaluation(conversation_id: str, questions_asked: List[str]):
     """Background task to evaluate factual phase and store results."""
     from evaluation import evaluate_factual_phase, generate_dynamic_recommendations
     import json
 
     try:
         # Fetch factual-phase messages using phase tag
-        messages_result = supabase.table("messages").select("*").eq(
-            "conversation_id", conversation_id
-        ).eq("phase", "factual_questions").order("created_at").execute()
-
-        factual_messages = [{"role": m["role"], "content": m["content"], "metadata": m.get("metadata")} for m in messages_result.data]
+        factual_messages = await database.messages.for_phase(conversation_id, "factual_questions")
 
         if len(factual_messages) > 2:
-            evaluation = evaluate_factual_phase(factual_messages, questions_asked)
-            recommendations = generate_dynamic_recommendations(
+            evaluation = await evaluate_factual_phase(factual_messages, questions_asked)
+            recommendations = await generate_dynamic_recommendations(
                 "factual", evaluation, factual_messages
             )
 
             # Store in database
-            supabase.table("evaluations").insert({
-                "conversation_id": conversation_id,
-                "eval_type": "factual",
-                "eval_data": json.dumps(evaluation),
-                "recommendations": json.dumps(recommendations)
-            }).execute()
+            await database.evaluations.add(
+                conversation_id, "factual", json.dumps(evaluation), json.dumps(recommendations)
+            )
 
             print(f"Factual evaluation stored for conversation {conversation_id}")
         else:
@@ -102,6 +105,28 @@ def run_factual_evaluation(conversation_id: str, questions_asked: List[str]):
         print(f"Error in background factual evaluation: {e}")
 
 
+async def load_resume_embedding(student_id: str, sections: Dict[str, str]) -> List[float]:
+    """Get the student's stored resume embedding, recomputing and saving it only if the sections changed"""
+    from knowledge_base import stored_resume_embedding, compute_resume_embedding
+
+    try:
+        stored = await database.students.get_resume_embedding(student_id)
+
+        embedding = stored_resume_embedding(stored, sections) if stored else None
+        if embedding:
+            return embedding
+
+        print(f"🔄 Resume embedding missing or stale for student {student_id}, recomputing")
+        embedding_columns = await asyncio.to_thread(compute_resume_embedding, sections)
+        if embedding_columns["resume_embedding"]:
+            await database.students.update(student_id, embedding_columns)
+
+        return embedding_columns["resume_embedding"]
+    except Exception as e:
+        print(f"Error loading resume embedding: {e}")
+        return None
+
+
 def extract_name_from_pdf(pdf_path: str) -> str:
     """Extract name directly from PDF first page (bypasses Docling's header skipping issue)"""
     try:
@@ -367,8 +392,8 @@ async def upload_resume(file: UploadFile = File(...)):
         # Extract structured data using Gemini API
         import json as json_module
         model = genai.GenerativeModel("gemini-2.0-flash")
-        pdf_file = genai.upload_file(tmp_file_path, mime_type="application/pdf")
-        response = model.generate_content([
+        pdf_file = await asyncio.to_thread(genai.upload_file, tmp_file_path, mime_type="application/pdf")
+        response = await model.generate_content_async([
             """Analyze this resume PDF and extract ALL information into the following JSON structure.
 Be thorough - extract EVERY detail from the resume. Do not skip or summarize anything.
 
@@ -435,7 +460,7 @@ IMPORTANT RULES:
         if not contact_info.get("name"):
             contact_info["name"] = extract_name_from_pdf(tmp_file_path)
 
-        # Store in Supabase
+        # Store in the database
         # Insert student record
         student_data = {
             "name": contact_info["name"],
@@ -448,30 +473,26 @@ IMPORTANT RULES:
             "gpa": gpa
         }
 
-        student_response = supabase.table("students").insert(student_data).execute()
-        student_id = student_response.data[0]["id"]
-
-        # Insert resume sections (skip any with null/empty content)
-        section_records = []
-        for heading, content in sections.items():
-            if content:  # Skip null or empty sections
-                section_records.append({
-                    "student_id": student_id,
-                    "heading": heading,
-                    "content": content
-                })
-
-        if section_records:
-            supabase.table("resume_sections").insert(section_records).execute()
+        # Embed the resume once at upload; later turns and interviews reuse it
+        from knowledge_base import compute_resume_embedding
+        embedding_columns = await asyncio.to_thread(compute_resume_embedding, sections)
 
-        # Store top projects as a special section for easy retrieval
+        # Try to include the embedding (requires resume_embedding columns in students table)
+        try:
+            student = await database.students.create({**student_data, **embedding_columns})
+        except Exception as embed_err:
+            # If the embedding columns don't exist yet, retry without them
+            print(f"Warning: resume embedding insert failed ({embed_err}), retrying without embedding")
+            student = await database.students.create(student_data)
+        student_id = student["id"]
+
+        # Insert resume sections (null/empty ones are skipped), with the top projects stored as a
+        # special section for easy retrieval
         import json as json_mod
+        section_records = dict(sections)
         if top_projects:
-            supabase.table("resume_sections").insert({
-                "student_id": student_id,
-                "heading": "_top_projects",
-                "content": json_mod.dumps(top_projects)
-            }).execute()
+            section_records["_top_projects"] = json_mod.dumps(top_projects)
+        await database.resume_sections.add(student_id, section_records)
 
         # Clean up temp file
         os.unlink(tmp_file_path)
@@ -511,20 +532,13 @@ async def health_check():
 async def get_student(student_id: str):
     """Get student data by ID"""
     try:
-        # Get student info
-        student_response = supabase.table("students").select("*").eq("id", student_id).execute()
+        # Get student info and resume sections (one request)
+        student_and_sections = await database.students.get_with_sections(student_id)
 
-        if not student_response.data:
+        if student_and_sections is None:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        student = student_response.data[0]
-
-        # Get resume sections
-        sections_response = supabase.table("resume_sections").select("*").eq("student_id", student_id).execute()
-
-        sections = {}
-        for section in sections_response.data:
-            sections[section["heading"]] = section["content"]
+        student, sections = student_and_sections
 
         return {
             "student": student,
@@ -536,24 +550,21 @@ async def get_student(student_id: str):
 
 
 @app.post("/start-conversation/{student_id}")
-async def start_conversation(student_id: str):
-    """Start a conversation/interview with the student"""
-    from conversation import generate_greeting, create_resume_summary, text_to_speech, strip_markdown
-    import base64
+async def start_conversation(student_id: str, background_tasks: BackgroundTasks, request: Request):
+    """Start a conversation/interview with the student (audio format: ?audio_format= or X-Audio-Format)"""
+    from conversation import generate_greeting, create_resume_summary, strip_markdown
+    from tts_pipeline import SpeechPipeline
+    from audio_store import record_audio
+    from audio_formats import negotiate_audio_format
+    from session_cache import put_session
 
     try:
-        # Get student info and sections
-        student_response = supabase.table("students").select("*").eq("id", student_id).execute()
-        if not student_response.data:
+        # Get student info and sections (one request)
+        student_and_sections = await database.students.get_with_sections(student_id)
+        if student_and_sections is None:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        student = student_response.data[0]
-
-        # Get resume sections
-        sections_response = supabase.table("resume_sections").select("*").eq("student_id", student_id).execute()
-        sections = {}
-        for section in sections_response.data:
-            sections[section["heading"]] = section["content"]
+        student, sections = student_and_sections
 
         # Get top 2 projects (extracted by Gemini during upload)
         import json
@@ -572,12 +583,15 @@ async def start_conversation(student_id: str):
         first_name = get_first_name(student["name"])
 
         # Generate greeting and strip markdown
-        greeting_text = generate_greeting(first_name, resume_summary)
+        greeting_text = await generate_greeting(first_name, resume_summary)
         greeting_text = strip_markdown(greeting_text)
 
-        # Generate voice audio
-        audio_bytes = text_to_speech(greeting_text)
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
+        # Generate voice audio (synthesized while the records below are written, fetched from /audio/{audio_id})
+        audio_format = negotiate_audio_format(request)
+        speech = SpeechPipeline(output_format=audio_format)
+        speech.add_text(greeting_text)
+        speech.close()
+        audio_id = record_audio(speech.segments(), audio_format)
 
         # Create conversation record with projects data
         import json
@@ -589,22 +603,23 @@ async def start_conversation(student_id: str):
             "project_1_questions_count": 0,
             "project_2_questions_count": 0
         }
-        conversation_response = supabase.table("conversations").insert(conversation_data).execute()
-        conversation_id = conversation_response.data[0]["id"]
+        conversation_row = await database.conversations.create(conversation_data)
+        conversation_id = conversation_row["id"]
 
         # Store assistant message
-        message_data = {
-            "conversation_id": conversation_id,
-            "role": "assistant",
-            "content": greeting_text,
-            "phase": "greeting"
-        }
-        supabase.table("messages").insert(message_data).execute()
+        greeting_row = await database.messages.add(conversation_id, "assistant", greeting_text, "greeting")
+        background_tasks.add_task(persist_message_audio, audio_id, greeting_row["id"])
+
+        # The first turn finds everything it needs in the session cache
+        await put_session(conversation_id, build_session(
+            conversation_row, student, sections,
+            [{"role": greeting_row["role"], "content": greeting_row["content"]}], greeting_row["seq"]
+        ))
 
         return {
             "conversation_id": conversation_id,
             "message": greeting_text,
-            "audio": audio_base64,
+            "audio_id": audio_id,
             "phase": "greeting"
         }
 
@@ -615,7 +630,7 @@ async def start_conversation(student_id: str):
 @app.post("/speech-to-text")
 async def speech_to_text(file: UploadFile = File(...)):
     """Convert speech audio to text using OpenAI Whisper"""
-    from openai import OpenAI
+    from openai import AsyncOpenAI
     import os
 
     try:
@@ -626,9 +641,9 @@ async def speech_to_text(file: UploadFile = File(...)):
             tmp_file_path = tmp_file.name
 
         # Use OpenAI Whisper to transcribe
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         with open(tmp_file_path, 'rb') as audio_file:
-            transcription = client.audio.transcriptions.create(
+            transcription = await client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio_file
             )
@@ -652,216 +667,382 @@ async def speech_to_text(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Error transcribing audio: {str(e)}")
 
 
-@app.post("/continue-conversation/{conversation_id}")
-async def continue_conversation_endpoint(conversation_id: str, user_message: Dict[str, Any], background_tasks: BackgroundTasks):
-    """Continue the conversation with user's response"""
-    from conversation import (
-        continue_conversation, continue_project_questions, start_project_questions,
-        start_factual_questions, continue_factual_questions,
-        create_resume_summary, text_to_speech, is_ready_for_technical,
-        transition_to_second_project, start_gpa_questions, strip_markdown
+def build_session(
+    conversation: Dict[str, Any],
+    student: Dict[str, Any],
+    sections: Dict[str, str],
+    message_history: List[Dict[str, str]],
+    last_seq: int
+) -> Dict[str, Any]:
+    """
+    Session state for the session cache: the rows a turn needs plus what's derived from them
+    (last_seq: seq of the newest message in message_history)
+    """
+    from conversation import create_resume_summary
+    from knowledge_base import build_resume_text
+
+    return {
+        "conversation": conversation,
+        "student": student,
+        "sections": sections,
+        "resume_summary": create_resume_summary(sections),
+        # Full resume text for RAG similarity
+        "resume_text": build_resume_text(sections),
+        # First name for more natural conversation
+        "first_name": get_first_name(student["name"]),
+        "message_history": message_history,
+        "last_seq": last_seq
+    }
+
+
+async def append_message(session: Dict[str, Any], conversation_id: str, inserted: Dict[str, Any]):
+    """
+    Add a message this worker just stored to the session history. If its seq shows that other
+    messages were inserted since the last one we know of, fetch those (and it) instead.
+    """
+    if inserted["seq"] <= session["last_seq"]:
+        return  # Already fetched with an earlier gap
+    if inserted["seq"] == session["last_seq"] + 1:
+        new_messages = [inserted]
+    else:
+        print(f"🔁 History gap in {conversation_id} (seq {session['last_seq']} -> {inserted['seq']}), fetching since {session['last_seq']}")
+        new_messages = await database.messages.history(conversation_id, session["last_seq"])
+
+    for msg in new_messages:
+        session["message_history"].append({"role": msg["role"], "content": msg["content"]})
+    session["last_seq"] = max(session["last_seq"], new_messages[-1]["seq"] if new_messages else inserted["seq"])
+
+
+async def load_session(conversation_id: str) -> Dict[str, Any]:
+    """Session state read from the database (session cache miss): two requests, issued together"""
+    # Conversation with its student and resume sections, and the conversation history for context
+    conversation_with_student, messages = await asyncio.gather(
+        database.conversations.get_with_student(conversation_id),
+        database.messages.history(conversation_id)
     )
-    from knowledge_base import extract_student_topics, select_next_question
-    import base64
+    if conversation_with_student is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
 
-    try:
-        # Get conversation
-        conversation_response = supabase.table("conversations").select("*").eq("id", conversation_id).execute()
-        if not conversation_response.data:
-            raise HTTPException(status_code=404, detail="Conversation not found")
+    conversation, student, sections = conversation_with_student
 
-        conversation = conversation_response.data[0]
-        student_id = conversation["student_id"]
-        current_phase = conversation["phase"]
-
-        user_text = user_message.get("message", "")
-
-        # Extract anti-cheat metadata from frontend
-        response_time_seconds = user_message.get("response_time_seconds", None)
-        paste_count = user_message.get("paste_count", 0)
-        paste_char_count = user_message.get("paste_char_count", 0)
-        suspicious_typing = user_message.get("suspicious_typing", False)
-        timer_expired = user_message.get("timer_expired", False)
-
-        import json as json_meta
-        anti_cheat_metadata = json_meta.dumps({
-            "response_time_seconds": response_time_seconds,
-            "paste_count": paste_count,
-            "paste_char_count": paste_char_count,
-            "suspicious_typing": suspicious_typing,
-            "timer_expired": timer_expired
+    message_history = []
+    for msg in messages:
+        message_history.append({
+            "role": msg["role"],
+            "content": msg["content"]
         })
 
-        # Store user message (tagged with current phase before any transition)
-        user_msg_data = {
-            "conversation_id": conversation_id,
-            "role": "user",
-            "content": user_text,
-            "phase": current_phase
-        }
-        # Try to include metadata (requires metadata JSONB column in messages table)
-        try:
-            user_msg_data["metadata"] = anti_cheat_metadata
-            supabase.table("messages").insert(user_msg_data).execute()
-        except Exception as meta_err:
-            # If metadata column doesn't exist yet, retry without it
-            print(f"Warning: metadata insert failed ({meta_err}), retrying without metadata")
-            user_msg_data.pop("metadata", None)
-            supabase.table("messages").insert(user_msg_data).execute()
-
-        # Get student info
-        student_response = supabase.table("students").select("*").eq("id", student_id).execute()
-        student = student_response.data[0]
-
-        # Get resume sections
-        sections_response = supabase.table("resume_sections").select("*").eq("student_id", student_id).execute()
-        sections = {}
-        for section in sections_response.data:
-            sections[section["heading"]] = section["content"]
+    return build_session(conversation, student, sections, message_history, messages[-1]["seq"] if messages else 0)
 
-        resume_summary = create_resume_summary(sections)
-        projects = sections.get("Projects", "")
 
-        # Create full resume text for RAG similarity
-        resume_text = ""
-        for section_name in ["Projects", "Work Experience", "Technical Skills"]:
-            if section_name in sections:
-                resume_text += f"\n{section_name}:\n{sections[section_name]}\n"
+async def load_turn_state(conversation_id: str, user_message: Dict[str, Any]) -> Dict[str, Any]:
+    """Load everything a turn needs (the candidate's message is only stored by finish_turn, with the reply)"""
+    from question_catalog import asked_ids_from_row
+    from session_cache import take_session
 
-        # Get first name for more natural conversation
-        first_name = get_first_name(student["name"])
+    # Conversation, student, resume and history: from the session cache, else from the database
+    session = await take_session(conversation_id)
+    if session is None:
+        session = await load_session(conversation_id)
+
+    conversation = session["conversation"]
+    student = session["student"]
+    sections = session["sections"]
+    student_id = conversation["student_id"]
+    current_phase = conversation["phase"]
+
+    user_text = user_message.get("message", "")
+
+    # Extract anti-cheat metadata from frontend
+    response_time_seconds = user_message.get("response_time_seconds", None)
+    paste_count = user_message.get("paste_count", 0)
+    paste_char_count = user_message.get("paste_char_count", 0)
+    suspicious_typing = user_message.get("suspicious_typing", False)
+    timer_expired = user_message.get("timer_expired", False)
+
+    anti_cheat_metadata = {
+        "response_time_seconds": response_time_seconds,
+        "paste_count": paste_count,
+        "paste_char_count": paste_char_count,
+        "suspicious_typing": suspicious_typing,
+        "timer_expired": timer_expired
+    }
+
+    # User message (tagged with current phase before any transition), committed with the reply
+    user_msg_data = {
+        "content": user_text,
+        "phase": current_phase,
+        "metadata": anti_cheat_metadata
+    }
+    message_history = session["message_history"] + [{"role": "user", "content": user_text}]
+
+    # Get conversation metadata
+    import json
+    project_1_q_count = conversation.get("project_1_questions_count", 0)
+    project_2_q_count = conversation.get("project_2_questions_count", 0)
+    current_project_index = conversation.get("current_project_index", 0)
+    projects_data = json.loads(conversation.get("projects_data", "[]")) if conversation.get("projects_data") else []
+    factual_q_count = conversation.get("factual_questions_count", 0)
+    student_topics = conversation.get("student_topics", [])
+    asked_ids = asked_ids_from_row(conversation)
+    gpa = student.get("gpa", 0.0)
+    education_section = sections.get("Education", "")
+
+    return {
+        "conversation_id": conversation_id,
+        "session": session,
+        "user_message": user_msg_data,
+        "conversation": conversation,
+        "student": student,
+        "student_id": student_id,
+        "sections": sections,
+        "phase": current_phase,
+        "user_text": user_text,
+        "resume_summary": session["resume_summary"],
+        "resume_text": session["resume_text"],
+        "first_name": session["first_name"],
+        "message_history": message_history,
+        "project_1_q_count": project_1_q_count,
+        "project_2_q_count": project_2_q_count,
+        "current_project_index": current_project_index,
+        "projects_data": projects_data,
+        "factual_q_count": factual_q_count,
+        "student_topics": student_topics,
+        "asked_ids": asked_ids,
+        "gpa": gpa,
+        "education_section": education_section
+    }
+
+
+async def generate_turn(state: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+    """
+    Decide and generate the interviewer's reply for a turn. Nothing is written here: the conversation
+    updates, new phase, question metadata and follow-up tasks are returned for finish_turn to persist.
+    "reply" is the interviewer text, or an async iterator of text deltas when stream=True.
+    """
+    from conversation import (
+        continue_conversation, continue_project_questions, start_project_questions,
+        start_factual_questions, continue_factual_questions, is_ready_for_technical,
+        transition_to_second_project, start_gpa_questions
+    )
+    from knowledge_base import (
+        choose_student_topics, select_next_question,
+        plan_factual_questions, next_planned_question, next_factual_question
+    )
+    from prefetch import prefetch_next_factual_question, take_prefetched_question
+    from question_catalog import CATALOG_VERSION, asked_texts_from_row
+    import json
 
-        # Get conversation history for context
-        messages_response = supabase.table("messages").select("*").eq("conversation_id", conversation_id).order("created_at").execute()
-        message_history = []
-        for msg in messages_response.data:
-            message_history.append({
-                "role": msg["role"],
-                "content": msg["content"]
+    conversation_id = state["conversation_id"]
+    conversation = state["conversation"]
+    student = state["student"]
+    student_id = state["student_id"]
+    sections = state["sections"]
+    current_phase = state["phase"]
+    user_text = state["user_text"]
+    resume_summary = state["resume_summary"]
+    resume_text = state["resume_text"]
+    first_name = state["first_name"]
+    message_history = state["message_history"]
+    project_1_q_count = state["project_1_q_count"]
+    project_2_q_count = state["project_2_q_count"]
+    current_project_index = state["current_project_index"]
+    projects_data = state["projects_data"]
+    factual_q_count = state["factual_q_count"]
+    student_topics = state["student_topics"]
+    asked_ids = state["asked_ids"]
+    gpa = state["gpa"]
+    education_section = state["education_section"]
+
+    updates = {}  # Conversation columns to write when the turn is persisted
+    increments = {}  # Counter columns to increment (applied by the database, so concurrent turns can't lose one)
+    asked_question_id = None  # Catalog ID to append to questions_asked_ids
+    tasks = BackgroundTasks()  # Follow-up work, scheduled only once the turn is persisted
+    question_metadata = None  # Will be set if we're asking a factual question
+
+    # Check for phase transition
+    if current_phase == "greeting" and is_ready_for_technical(user_text):
+        # Transition to project questions - start with first project
+        if projects_data and len(projects_data) > 0:
+            first_project = projects_data[0]
+            updates.update({
+                "phase": "project_questions",
+                "current_project_index": 0,
+                "project_1_questions_count": 1
             })
 
-        # Get conversation metadata
-        import json
-        project_q_count = conversation.get("project_questions_count", 0)
-        project_1_q_count = conversation.get("project_1_questions_count", 0)
-        project_2_q_count = conversation.get("project_2_questions_count", 0)
-        current_project_index = conversation.get("current_project_index", 0)
-        projects_data = json.loads(conversation.get("projects_data", "[]")) if conversation.get("projects_data") else []
-        factual_q_count = conversation.get("factual_questions_count", 0)
-        student_topics = conversation.get("student_topics", [])
-        questions_asked = conversation.get("questions_asked", [])
-        question_metadata = None  # Will be set if we're asking a factual question
-        gpa = student.get("gpa", 0.0)
-        education_section = sections.get("Education", "")
-
-        # Check for phase transition
-        if current_phase == "greeting" and is_ready_for_technical(user_text):
-            # Transition to project questions - start with first project
-            if projects_data and len(projects_data) > 0:
-                first_project = projects_data[0]
-                supabase.table("conversations").update({
-                    "phase": "project_questions",
-                    "current_project_index": 0,
-                    "project_1_questions_count": 1
-                }).eq("id", conversation_id).execute()
-
-                assistant_response = start_project_questions(
+            assistant_response = await start_project_questions(
+                first_name,
+                first_project.get("title", ""),
+                first_project.get("content", ""),
+                project_number=1,
+                stream=stream
+            )
+            current_phase = "project_questions"
+        else:
+            # No projects found, skip to factual questions
+            current_phase = "greeting"
+            assistant_response = await continue_conversation(message_history, first_name, resume_summary, stream=stream)
+
+    elif current_phase == "project_questions":
+        # Handle project questions phase with TWO projects
+        if current_project_index == 0:
+            # Working on first project
+            if project_1_q_count >= 4 and len(projects_data) > 1:
+                # Transition to second project (after 2-3 questions on first project)
+                second_project = projects_data[1]
+                updates.update({
+                    "current_project_index": 1,
+                    "project_2_questions_count": 1
+                })
+
+                assistant_response = await transition_to_second_project(
+                    first_name,
+                    second_project.get("title", ""),
+                    second_project.get("content", ""),
+                    stream=stream
+                )
+                current_project_index = 1
+            else:
+                # Continue with first project
+                first_project = projects_data[0] if projects_data else {"title": "", "content": ""}
+                increments["project_1_questions_count"] = 1
+
+                assistant_response = await continue_project_questions(
+                    message_history,
                     first_name,
                     first_project.get("title", ""),
                     first_project.get("content", ""),
-                    project_number=1
+                    project_number=1,
+                    stream=stream
+                )
+
+        elif current_project_index == 1:
+            # Working on second project
+            if project_2_q_count >= 4:
+                # Done with both projects, transition to GPA questions
+                updates.update({
+                    "phase": "gpa_questions",
+                    "project_eval_triggered": True
+                })
+
+                assistant_response = await start_gpa_questions(first_name, gpa, education_section, stream=stream)
+                current_phase = "gpa_questions"
+
+                # Trigger project evaluation in background
+                tasks.add_task(
+                    run_project_evaluation,
+                    conversation_id,
+                    student["name"]
                 )
-                current_phase = "project_questions"
             else:
-                # No projects found, skip to factual questions
-                current_phase = "greeting"
-                assistant_response = continue_conversation(message_history, first_name, resume_summary)
-
-        elif current_phase == "project_questions":
-            # Handle project questions phase with TWO projects
-            if current_project_index == 0:
-                # Working on first project
-                if project_1_q_count >= 4 and len(projects_data) > 1:
-                    # Transition to second project (after 2-3 questions on first project)
-                    second_project = projects_data[1]
-                    supabase.table("conversations").update({
-                        "current_project_index": 1,
-                        "project_2_questions_count": 1
-                    }).eq("id", conversation_id).execute()
-
-                    assistant_response = transition_to_second_project(
-                        first_name,
-                        second_project.get("title", ""),
-                        second_project.get("content", "")
-                    )
-                    current_project_index = 1
-                else:
-                    # Continue with first project
-                    first_project = projects_data[0] if projects_data else {"title": "", "content": ""}
-                    supabase.table("conversations").update({
-                        "project_1_questions_count": project_1_q_count + 1
-                    }).eq("id", conversation_id).execute()
-
-                    assistant_response = continue_project_questions(
-                        message_history,
-                        first_name,
-                        first_project.get("title", ""),
-                        first_project.get("content", ""),
-                        project_number=1
-                    )
-
-            elif current_project_index == 1:
-                # Working on second project
-                if project_2_q_count >= 4:
-                    # Done with both projects, transition to GPA questions
-                    supabase.table("conversations").update({
-                        "phase": "gpa_questions",
-                        "project_eval_triggered": True
-                    }).eq("id", conversation_id).execute()
-
-                    assistant_response = start_gpa_questions(first_name, gpa, education_section)
-                    current_phase = "gpa_questions"
-
-                    # Trigger project evaluation in background
-                    background_tasks.add_task(
-                        run_project_evaluation,
-                        conversation_id,
-                        student["name"]
-                    )
-                else:
-                    # Continue with second project
-                    second_project = projects_data[1] if len(projects_data) > 1 else {"title": "", "content": ""}
-                    supabase.table("conversations").update({
-                        "project_2_questions_count": project_2_q_count + 1
-                    }).eq("id", conversation_id).execute()
-
-                    assistant_response = continue_project_questions(
-                        message_history,
-                        first_name,
-                        second_project.get("title", ""),
-                        second_project.get("content", ""),
-                        project_number=2
-                    )
-
-        elif current_phase == "gpa_questions":
-            # After GPA discussion (1-2 exchanges), transition to factual questions
-            # Extract student topics if not done yet
-            if not student_topics:
-                student_topics = extract_student_topics(sections)
-
-            # Get first factual question with similarity scoring and topic diversity
-            next_q = select_next_question([], student_topics, resume_text, topics_covered={})
-
-            # Transition to factual questions (Phase IV)
-            supabase.table("conversations").update({
-                "phase": "factual_questions",
-                "student_topics": student_topics,
-                "questions_asked": [next_q["question"]],
-                "factual_questions_count": 1
-            }).eq("id", conversation_id).execute()
-
-            assistant_response = start_factual_questions(first_name, next_q)
-            current_phase = "factual_questions"
+                # Continue with second project
+                second_project = projects_data[1] if len(projects_data) > 1 else {"title": "", "content": ""}
+                increments["project_2_questions_count"] = 1
+
+                assistant_response = await continue_project_questions(
+                    message_history,
+                    first_name,
+                    second_project.get("title", ""),
+                    second_project.get("content", ""),
+                    project_number=2,
+                    stream=stream
+                )
+
+    elif current_phase == "gpa_questions":
+        # After GPA discussion (1-2 exchanges), transition to factual questions
+        # Extract student topics if not done yet
+        resume_embedding = await load_resume_embedding(student_id, sections)
+        if not student_topics:
+            student_topics = await choose_student_topics(sections, resume_embedding)
+
+        # Plan the whole factual phase once (similarity scoring + topic diversity);
+        # later turns just take the next unasked entry
+        factual_plan = await asyncio.to_thread(plan_factual_questions, student_topics, resume_text, resume_embedding)
+        next_q = next_planned_question(factual_plan, [], student_topics) or await asyncio.to_thread(
+            select_next_question, [], student_topics, resume_text, topics_covered={}, resume_embedding=resume_embedding
+        )
+
+        # Transition to factual questions (Phase IV)
+        updates.update({
+            "phase": "factual_questions",
+            "student_topics": student_topics,
+            "factual_plan": factual_plan,
+            "questions_asked_ids": [next_q["question_id"]] if next_q["question_id"] is not None else [],
+            "question_catalog_version": CATALOG_VERSION,
+            "factual_questions_count": 1
+        })
+
+        assistant_response = await start_factual_questions(first_name, next_q, stream=stream)
+        current_phase = "factual_questions"
+
+        # Prepare question 2 while the candidate answers question 1
+        tasks.add_task(
+            prefetch_next_factual_question,
+            conversation_id, 1,
+            [next_q["question_id"]] if next_q["question_id"] is not None else [],
+            student_topics, factual_plan, first_name, resume_text,
+            lambda: load_resume_embedding(student_id, sections)
+        )
+
+        # Store the question metadata for response
+        question_metadata = {
+            "similarity_score": next_q.get("similarity_score"),
+            "max_similarity": next_q.get("max_similarity"),
+            "match_reason": next_q.get("match_reason"),
+            "matched_topics": next_q.get("matched_topics", []),
+            "current_topic": next_q.get("topic"),
+            "question_text": next_q.get("question"),
+            "question_source": next_q.get("topic")  # The topic is the section name in ML_QUESTIONS
+        }
+
+    elif current_phase == "factual_questions":
+        # Continue factual questions
+        # Check if this is the last question (after ~5 factual questions)
+        is_final = factual_q_count >= 5
+
+        if not is_final:
+            # Next question comes from the plan made at the phase transition
+            factual_plan = conversation.get("factual_plan")
+            if isinstance(factual_plan, str):
+                factual_plan = json.loads(factual_plan)
+
+            # Usually prepared in the background after the previous turn; selected live if
+            # the prefetch hasn't finished or the conversation state changed since
+            prefetched = await take_prefetched_question(
+                conversation_id, factual_q_count, asked_ids, student_topics, factual_plan, first_name
+            )
+            if prefetched:
+                next_q = prefetched["next_question"]
+                factual_prompt = prefetched["system_prompt"]
+            else:
+                next_q = await next_factual_question(
+                    factual_plan, asked_ids, student_topics or [], resume_text,
+                    lambda: load_resume_embedding(student_id, sections)
+                )
+                factual_prompt = None
+            updated_ids = asked_ids + ([next_q["question_id"]] if next_q["question_id"] is not None else [])
+
+            updates["question_catalog_version"] = CATALOG_VERSION
+            increments["factual_questions_count"] = 1
+            if conversation.get("questions_asked_ids") is None:
+                # Legacy row (asked questions stored as texts): write the converted list
+                updates["questions_asked_ids"] = updated_ids
+            else:
+                asked_question_id = next_q["question_id"]
+
+            assistant_response = await continue_factual_questions(
+                message_history, first_name, next_q, is_final=False, system_prompt=factual_prompt, stream=stream
+            )
+
+            # Prepare the following question unless the next turn is the wrap-up
+            if factual_q_count + 1 < 5:
+                tasks.add_task(
+                    prefetch_next_factual_question,
+                    conversation_id, factual_q_count + 1, updated_ids,
+                    student_topics, factual_plan, first_name, resume_text,
+                    lambda: load_resume_embedding(student_id, sections)
+                )
 
             # Store the question metadata for response
             question_metadata = {
@@ -873,113 +1054,249 @@ async def continue_conversation_endpoint(conversation_id: str, user_message: Dic
                 "question_text": next_q.get("question"),
                 "question_source": next_q.get("topic")  # The topic is the section name in ML_QUESTIONS
             }
+        else:
+            # Final question - wrap up
+            assistant_response = await continue_factual_questions(
+                message_history,
+                first_name,
+                {"topic": "", "question": ""},
+                is_final=True,
+                stream=stream
+            )
 
-        elif current_phase == "factual_questions":
-            # Continue factual questions
-            # Check if this is the last question (after ~5 factual questions)
-            is_final = factual_q_count >= 5
-
-            if not is_final:
-                # Calculate topics covered so far to ensure diversity
-                topics_covered = {}
-                from knowledge_base import ML_QUESTIONS
-                for asked_q in (questions_asked or []):
-                    # Find which topic this question belongs to
-                    for topic, questions in ML_QUESTIONS.items():
-                        if asked_q in questions:
-                            topics_covered[topic] = topics_covered.get(topic, 0) + 1
-                            break
-
-                print(f"📊 Topics covered so far: {topics_covered}")
-
-                # Get next question with similarity scoring and topic diversity
-                next_q = select_next_question(
-                    questions_asked or [],
-                    student_topics or [],
-                    resume_text,
-                    topics_covered=topics_covered
-                )
-                updated_questions = (questions_asked or []) + [next_q["question"]]
-
-                supabase.table("conversations").update({
-                    "questions_asked": updated_questions,
-                    "factual_questions_count": factual_q_count + 1
-                }).eq("id", conversation_id).execute()
-
-                assistant_response = continue_factual_questions(message_history, first_name, next_q, is_final=False)
-
-                # Store the question metadata for response
-                question_metadata = {
-                    "similarity_score": next_q.get("similarity_score"),
-                    "max_similarity": next_q.get("max_similarity"),
-                    "match_reason": next_q.get("match_reason"),
-                    "matched_topics": next_q.get("matched_topics", []),
-                    "current_topic": next_q.get("topic"),
-                    "question_text": next_q.get("question"),
-                    "question_source": next_q.get("topic")  # The topic is the section name in ML_QUESTIONS
-                }
-            else:
-                # Final question - wrap up
-                assistant_response = continue_factual_questions(
-                    message_history,
-                    first_name,
-                    {"topic": "", "question": ""},
-                    is_final=True
-                )
+            # Trigger factual evaluation in background
+            tasks.add_task(
+                run_factual_evaluation,
+                conversation_id,
+                asked_texts_from_row(conversation)
+            )
 
-                # Trigger factual evaluation in background
-                background_tasks.add_task(
-                    run_factual_evaluation,
-                    conversation_id,
-                    questions_asked or []
-                )
+    else:
+        # Still in greeting phase (Phase II)
+        assistant_response = await continue_conversation(message_history, first_name, resume_summary, stream=stream)
+
+    return {
+        "reply": assistant_response,
+        "phase": current_phase,
+        "updates": updates,
+        "increments": increments,
+        "asked_question_id": asked_question_id,
+        "tasks": tasks,
+        "student_topics": student_topics,
+        "question_metadata": question_metadata,
+        # Interview is truly complete after the final wrap-up
+        "interview_complete": current_phase == "factual_questions" and factual_q_count >= 5
+    }
 
-        else:
-            # Still in greeting phase (Phase II)
-            assistant_response = continue_conversation(message_history, first_name, resume_summary)
 
-        # Strip markdown from response (for display and TTS)
-        assistant_response = strip_markdown(assistant_response)
+async def finish_turn(
+    state: Dict[str, Any],
+    turn: Dict[str, Any],
+    assistant_response: str,
+    background_tasks: BackgroundTasks,
+    audio_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Persist a generated turn in one commit_turn call (both messages and the conversation updates,
+    atomically) and write the result through to the session cache. Nothing is written before the
+    reply exists, so a failed turn leaves the conversation unchanged.
+    Returns the response payload (audio referenced by audio_id).
+    """
+    from session_cache import put_session
+
+    conversation_id = state["conversation_id"]
+    current_phase = turn["phase"]
+
+    # Assistant message is tagged with current phase after any transition
+    committed = await database.conversations.commit_turn(
+        conversation_id,
+        state["user_message"],
+        {"content": assistant_response, "phase": current_phase},
+        turn["updates"],
+        turn["increments"],
+        turn["asked_question_id"]
+    )
+
+    session = state["session"]
+    session["conversation"] = committed["conversation"]
+    await append_message(session, conversation_id, committed["user_message"])
+    await append_message(session, conversation_id, committed["assistant_message"])
+    await put_session(conversation_id, session)
+
+    for task in turn["tasks"].tasks:
+        background_tasks.add_task(task.func, *task.args, **task.kwargs)
+    if audio_id:
+        background_tasks.add_task(persist_message_audio, audio_id, committed["assistant_message"]["id"])
+
+    response_data = {
+        "message": assistant_response,
+        "phase": current_phase,
+        "interview_complete": turn["interview_complete"],
+        "audio_id": audio_id
+    }
 
-        # Generate voice audio
-        audio_bytes = text_to_speech(assistant_response)
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
+    # Include student topics when in factual questions phase
+    if current_phase == "factual_questions" and turn["student_topics"]:
+        response_data["student_topics"] = turn["student_topics"]
 
-        # Store assistant message (tagged with current phase after any transition)
-        assistant_msg_data = {
-            "conversation_id": conversation_id,
-            "role": "assistant",
-            "content": assistant_response,
-            "phase": current_phase
-        }
-        supabase.table("messages").insert(assistant_msg_data).execute()
+    # Include question metadata (similarity scores, matching details)
+    if turn["question_metadata"]:
+        response_data["question_metadata"] = turn["question_metadata"]
+        print(f"📊 Sending question metadata: {turn['question_metadata']}")
+    else:
+        print("⚠️ No question metadata to send")
 
-        # Determine if interview is truly complete (after final wrap-up)
-        is_interview_complete = current_phase == "factual_questions" and factual_q_count >= 5
+    return response_data
 
-        response_data = {
-            "message": assistant_response,
-            "audio": audio_base64,
-            "phase": current_phase,
-            "interview_complete": is_interview_complete
-        }
 
-        # Include student topics when in factual questions phase
-        if current_phase == "factual_questions" and student_topics:
-            response_data["student_topics"] = student_topics
+async def persist_message_audio(audio_id: str, message_id: str):
+    """Background task: once synthesis finishes, store the audio and point messages.audio_url at it"""
+    from audio_store import persist_audio
 
-        # Include question metadata (similarity scores, matching details)
-        if question_metadata:
-            response_data["question_metadata"] = question_metadata
-            print(f"📊 Sending question metadata: {question_metadata}")
-        else:
-            print("⚠️ No question metadata to send")
+    audio_url = await persist_audio(audio_id)
+    if audio_url:
+        try:
+            await database.messages.set_audio_url(message_id, audio_url)
+        except Exception as e:
+            print(f"⚠️ Failed to save audio_url for message {message_id}: {e}")
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Events frame"""
+    import json
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/continue-conversation/{conversation_id}")
+async def continue_conversation_endpoint(
+    conversation_id: str, user_message: Dict[str, Any], background_tasks: BackgroundTasks, request: Request
+):
+    """Continue the conversation with user's response (audio format: ?audio_format= or X-Audio-Format)"""
+    from conversation import strip_markdown
+    from tts_pipeline import SpeechPipeline
+    from audio_store import record_audio
+    from audio_formats import negotiate_audio_format
+
+    audio_format = negotiate_audio_format(request)
+    speech = SpeechPipeline(output_format=audio_format)
+    try:
+        state = await load_turn_state(conversation_id, user_message)
+        turn = await generate_turn(state, stream=True)
+
+        # Voice each sentence as soon as it's generated; the audio keeps streaming
+        # from /audio/{audio_id} after this response has been sent
+        audio_id = record_audio(speech.segments(), audio_format)
+        parts = []
+        async for delta in turn["reply"]:
+            parts.append(delta)
+            speech.add_text(delta)
+        speech.close()
+
+        # Strip markdown from response (for display and TTS)
+        assistant_response = strip_markdown("".join(parts))
+
+        return await finish_turn(state, turn, assistant_response, background_tasks, audio_id)
+
+    except Exception as e:
+        speech.cancel()
+        raise HTTPException(status_code=500, detail=f"Error continuing conversation: {str(e)}")
 
-        return response_data
 
+@app.post("/continue-conversation/{conversation_id}/stream")
+async def continue_conversation_stream(
+    conversation_id: str, user_message: Dict[str, Any], background_tasks: BackgroundTasks, request: Request
+):
+    """
+    Streaming variant of /continue-conversation (Server-Sent Events). Events, in order:
+    - audio: {"audio_id"} sent first; GET /audio/{audio_id} streams the reply's audio (in the format
+      negotiated by ?audio_format= / X-Audio-Format) as each sentence is synthesized
+    - token: {"text"} interviewer text deltas as the model emits them
+    - message: {"message"} the final text (markdown stripped), once the turn is persisted
+    - metadata: {"phase", "interview_complete", "student_topics"?, "question_metadata"?}
+    - done: {}
+    On failure an error event {"detail"} ends the stream. The turn (both messages and the phase
+    updates) is only committed once generation has finished, so a failed turn stores nothing.
+    """
+    from conversation import strip_markdown
+    from tts_pipeline import SpeechPipeline
+    from audio_store import record_audio
+    from audio_formats import negotiate_audio_format
+
+    audio_format = negotiate_audio_format(request)
+    try:
+        state = await load_turn_state(conversation_id, user_message)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error continuing conversation: {str(e)}")
 
+    async def events():
+        speech = SpeechPipeline(output_format=audio_format)
+        try:
+            turn = await generate_turn(state, stream=True)
+
+            # Voice each sentence as soon as it's generated; the client can start fetching right away
+            audio_id = record_audio(speech.segments(), audio_format)
+            yield sse_event("audio", {"audio_id": audio_id})
+
+            parts = []
+            async for delta in turn["reply"]:
+                parts.append(delta)
+                speech.add_text(delta)
+                yield sse_event("token", {"text": delta})
+            speech.close()
+
+            # Strip markdown from response (for display and TTS)
+            assistant_response = strip_markdown("".join(parts))
+
+            response_data = await finish_turn(state, turn, assistant_response, background_tasks, audio_id)
+            yield sse_event("message", {"message": assistant_response})
+            yield sse_event("metadata", {k: v for k, v in response_data.items() if k not in ("message", "audio_id")})
+            yield sse_event("done", {})
+
+        except Exception as e:
+            speech.cancel()
+            print(f"Error streaming conversation {conversation_id}: {e}")
+            yield sse_event("error", {"detail": f"Error continuing conversation: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Don't let proxies buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/audio/{audio_id}")
+async def get_audio(audio_id: str, request: Request):
+    """
+    Interviewer speech for a turn. While it's being synthesized it streams from memory (chunked,
+    in the turn's format); once stored it's served from audio storage with Range support and long cache headers.
+    """
+    from audio_store import get_audio_entry, AUDIO_TTL_SECONDS
+    from audio_storage import get_audio_storage, parse_audio_id
+
+    # Ids are generated hex plus extension; anything else never existed (and must not reach the storage path)
+    if parse_audio_id(audio_id) is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    range_header = request.headers.get("range")
+    entry = get_audio_entry(audio_id)
+
+    # Range requests (seeking, replay) go to storage once the audio is complete
+    if entry is None or (entry.complete and range_header):
+        stored = await asyncio.to_thread(get_audio_storage().response, audio_id, range_header)
+        if stored is not None:
+            return stored
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Audio not found")
+
+    headers = {"Cache-Control": f"private, max-age={int(AUDIO_TTL_SECONDS)}"}
+    if entry.complete:
+        headers["Content-Length"] = str(entry.size)
+
+    return StreamingResponse(entry.iter_chunks(), media_type=entry.content_type, headers=headers)
+
 
 @app.post("/evaluate")
 async def evaluate_interview(conversation_id: str):
@@ -991,20 +1308,16 @@ async def evaluate_interview(conversation_id: str):
         from evaluation import evaluate_project_phase, evaluate_factual_phase, generate_final_report
 
         # Fetch conversation data
-        conversation = supabase.table("conversations").select("*").eq("id", conversation_id).single().execute()
-        if not conversation.data:
+        conv_data = await database.conversations.get(conversation_id)
+        if not conv_data:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        conv_data = conversation.data
-
         # Fetch student name
         student_id = conv_data.get("student_id")
-        student_result = supabase.table("students").select("name").eq("id", student_id).single().execute()
-        student_name = student_result.data['name'] if student_result.data else "Student"
+        student_name = await database.students.get_name(student_id) or "Student"
 
         # Fetch all messages
-        messages_result = supabase.table("messages").select("*").eq("conversation_id", conversation_id).order("created_at").execute()
-        messages = messages_result.data
+        messages = await database.messages.for_conversation(conversation_id)
 
         if not messages:
             raise HTTPException(status_code=400, detail="No messages found for evaluation")
@@ -1081,7 +1394,7 @@ async def evaluate_interview(conversation_id: str):
         # Evaluate Project Phase
         project_evaluation = {}
         if len(project_messages) > 2:
-            project_evaluation = evaluate_project_phase(project_messages, student_name)
+            project_evaluation = await evaluate_project_phase(project_messages, student_name)
         else:
             project_evaluation = {
                 "overall_project_score": 0,
@@ -1092,10 +1405,11 @@ async def evaluate_interview(conversation_id: str):
             }
 
         # Evaluate Factual Phase
+        from question_catalog import asked_texts_from_row
         factual_evaluation = {}
-        questions_asked = conv_data.get("questions_asked", [])
+        questions_asked = asked_texts_from_row(conv_data)
         if len(factual_messages) > 2:
-            factual_evaluation = evaluate_factual_phase(factual_messages, questions_asked)
+            factual_evaluation = await evaluate_factual_phase(factual_messages, questions_asked)
         else:
             factual_evaluation = {
                 "factual_score": 0,
@@ -1117,7 +1431,7 @@ async def evaluate_interview(conversation_id: str):
         #     "factual_score": factual_evaluation.get("factual_score", 0),
         #     "evaluation_details": final_report
         # }
-        # supabase.table("evaluations").insert(evaluation_data).execute()
+        # await database.evaluations.add(conversation_id, "final", json.dumps(evaluation_data), None)
 
         return {
             "success": True,
@@ -1133,11 +1447,11 @@ async def evaluate_interview(conversation_id: str):
 async def get_evaluation(conversation_id: str):
     """Retrieve stored evaluation for a conversation."""
     try:
-        result = supabase.table("evaluations").select("*").eq("conversation_id", conversation_id).single().execute()
-        if not result.data:
+        evaluation = await database.evaluations.get(conversation_id)
+        if not evaluation:
             raise HTTPException(status_code=404, detail="Evaluation not found")
 
-        return result.data
+        return evaluation
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching evaluation: {str(e)}")
@@ -1148,14 +1462,11 @@ async def get_project_evaluation(conversation_id: str):
     """Retrieve the project phase evaluation."""
     import json
     try:
-        result = supabase.table("evaluations").select("*").eq(
-            "conversation_id", conversation_id
-        ).eq("eval_type", "project").execute()
+        eval_row = await database.evaluations.get(conversation_id, "project")
 
-        if not result.data:
+        if not eval_row:
             raise HTTPException(status_code=404, detail="Project evaluation not ready yet")
 
-        eval_row = result.data[0]
         eval_data = json.loads(eval_row["eval_data"]) if isinstance(eval_row["eval_data"], str) else eval_row["eval_data"]
         recommendations = json.loads(eval_row["recommendations"]) if isinstance(eval_row.get("recommendations"), str) else eval_row.get("recommendations", [])
 
@@ -1176,14 +1487,11 @@ async def get_factual_evaluation(conversation_id: str):
     """Retrieve the factual phase evaluation."""
     import json
     try:
-        result = supabase.table("evaluations").select("*").eq(
-            "conversation_id", conversation_id
-        ).eq("eval_type", "factual").execute()
+        eval_row = await database.evaluations.get(conversation_id, "factual")
 
-        if not result.data:
+        if not eval_row:
             raise HTTPException(status_code=404, detail="Factual evaluation not ready yet")
 
-        eval_row = result.data[0]
         eval_data = json.loads(eval_row["eval_data"]) if isinstance(eval_row["eval_data"], str) else eval_row["eval_data"]
         recommendations = json.loads(eval_row["recommendations"]) if isinstance(eval_row.get("recommendations"), str) else eval_row.get("recommendations", [])
 
@@ -0,0 +1,57 @@
+"""
+Migrate conversations.questions_asked (question texts) to questions_asked_ids (catalog IDs)
+Run once after database/add_question_ids_schema.sql. Safe to re-run: only unmigrated rows are touched.
+
+The legacy questions_asked column is left in place. Rows with a text that has no catalog ID are not
+migrated at all and are listed instead: their texts would otherwise be lost to evaluation. Drop the
+column in a later, separate migration, once this script reports no such rows.
+"""
+
+import os
+from supabase import create_client
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from question_catalog import CATALOG_VERSION, asked_ids_from_row
+
+supabase_url = os.getenv("SUPABASE_URL")
+supabase_key = os.getenv("SUPABASE_KEY")
+supabase = create_client(supabase_url, supabase_key)
+
+PAGE_SIZE = 500
+
+migrated = 0
+skipped = []
+last_id = None
+
+while True:
+    # Skipped rows stay in this filter, so page through it by id
+    query = supabase.table("conversations").select(
+        "id, questions_asked, questions_asked_ids"
+    ).is_("questions_asked_ids", "null").not_.is_("questions_asked", "null")
+    if last_id is not None:
+        query = query.gt("id", last_id)
+    rows = query.order("id").limit(PAGE_SIZE).execute().data
+
+    if not rows:
+        break
+    last_id = rows[-1]["id"]
+
+    for row in rows:
+        asked_ids = asked_ids_from_row(row)
+        missing = len(row["questions_asked"]) - len(asked_ids)
+        if missing:
+            skipped.append(row["id"])
+            print(f"⚠️ {row['id']}: {missing} question(s) not found in the catalog, left unmigrated")
+            continue
+
+        supabase.table("conversations").update({
+            "questions_asked_ids": asked_ids,
+            "question_catalog_version": CATALOG_VERSION
+        }).eq("id", row["id"]).execute()
+        migrated += 1
+
+print(f"\n✓ Migrated {migrated} conversation(s) to catalog version {CATALOG_VERSION}")
+if skipped:
+    print(f"⚠️ {len(skipped)} conversation(s) left unmigrated: keep the questions_asked column until they're resolved")
@@ -0,0 +1,101 @@
+"""
+Speculative Prefetch of the Next Factual Question
+Right after the interviewer asks a factual question, the next question (and its prompt) is
+prepared in a background task while the candidate is answering. The result is stored by
+conversation and turn together with a fingerprint of the state it was computed from, and the
+next /continue-conversation call only uses it if that state is unchanged.
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Long enough to cover the answer timer plus a slow candidate, short enough not to pile up
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", "900"))
+
+_prefetch_cache = None
+
+
+def get_prefetch_cache():
+    """Shared across worker processes, so the next turn can land on any worker (created on first use)"""
+    global _prefetch_cache
+    if _prefetch_cache is None:
+        from cache import PersistentCache
+        _prefetch_cache = PersistentCache("factual_prefetch", ttl_seconds=PREFETCH_TTL_SECONDS)
+    return _prefetch_cache
+
+
+def prefetch_key(conversation_id: str, turn: int) -> str:
+    return f"{conversation_id}:{turn}"
+
+
+def factual_state_fingerprint(
+    asked_ids: List[int],
+    student_topics: List[str],
+    factual_plan: Optional[List[Dict]],
+    first_name: str
+) -> str:
+    """Hash of everything the next question and its prompt depend on"""
+    from question_catalog import CATALOG_VERSION
+
+    return hashlib.sha256(json.dumps(
+        # Plan entries by ID only: scores are display metadata and may not survive a JSONB round trip bit for bit
+        [CATALOG_VERSION, list(asked_ids), student_topics or [],
+         [entry.get("question_id") for entry in factual_plan or []], first_name],
+        sort_keys=True
+    ).encode("utf-8")).hexdigest()
+
+
+async def prefetch_next_factual_question(
+    conversation_id: str,
+    turn: int,
+    asked_ids: List[int],
+    student_topics: List[str],
+    factual_plan: Optional[List[Dict]],
+    first_name: str,
+    resume_text: str,
+    get_resume_embedding: Callable[[], Awaitable[Optional[List[float]]]]
+):
+    """Background task: select the question for `turn` and prepare its system prompt"""
+    from knowledge_base import next_factual_question
+    from conversation import factual_system_prompt
+
+    try:
+        next_q = await next_factual_question(factual_plan, asked_ids, student_topics or [], resume_text, get_resume_embedding)
+
+        # The prefetch cache is SQLite: written in a worker thread, not on the event loop
+        await asyncio.to_thread(get_prefetch_cache().set, prefetch_key(conversation_id, turn), {
+            "fingerprint": factual_state_fingerprint(asked_ids, student_topics, factual_plan, first_name),
+            "next_question": next_q,
+            "system_prompt": factual_system_prompt(first_name, next_q, is_final=False)
+        })
+        print(f"⏩ Prefetched factual question for conversation {conversation_id} turn {turn}: {next_q.get('question_id')}")
+    except Exception as e:
+        print(f"⚠️ Prefetch failed for conversation {conversation_id} turn {turn}: {e}")
+
+
+async def take_prefetched_question(
+    conversation_id: str,
+    turn: int,
+    asked_ids: List[int],
+    student_topics: List[str],
+    factual_plan: Optional[List[Dict]],
+    first_name: str
+) -> Optional[Dict]:
+    """
+    Consume the prefetched entry for this turn. Returns {"next_question", "system_prompt"}, or None
+    if nothing was prefetched (not finished yet, expired) or the state changed since it was computed.
+    """
+    # One use only, even across processes: a retried request recomputes rather than reusing a consumed entry
+    entry = await asyncio.to_thread(get_prefetch_cache().pop, prefetch_key(conversation_id, turn))
+    if entry is None:
+        return None
+
+    if entry.get("fingerprint") != factual_state_fingerprint(asked_ids, student_topics, factual_plan, first_name):
+        print(f"♻️ Prefetched question for conversation {conversation_id} turn {turn} is stale, selecting live")
+        return None
+
+    print(f"⚡ Using prefetched factual question for conversation {conversation_id} turn {turn}")
+    return entry
@@ -0,0 +1,159 @@
+"""
+Compiled Question Catalog
+Compiles ML_QUESTIONS at import into stable integer question IDs with
+question -> topic and topic -> ids lookups, so selection and coverage run on IDs
+
+IDs come from question_ids.json, an append-only registry: a question keeps its ID
+for good (even if it moves topic or is removed), so persisted IDs never change meaning.
+After adding questions to ML_QUESTIONS, run `python question_catalog.py` to register them.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from knowledge_base import ML_QUESTIONS
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_ids.json")
+
+
+def load_registry(path: str = REGISTRY_PATH) -> Dict[str, int]:
+    """Question text -> ID from the registry file (empty if it doesn't exist yet)"""
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return {q: int(qid) for q, qid in json.load(f)["questions"].items()}
+
+
+def assign_ids(registry: Dict[str, int]) -> Dict[str, int]:
+    """Registry extended with IDs for any bank questions not registered yet (next free IDs, bank order)"""
+    assigned = dict(registry)
+    next_id = max(assigned.values(), default=-1) + 1
+
+    for questions in ML_QUESTIONS.values():
+        for q in questions:
+            if q not in assigned:
+                assigned[q] = next_id
+                next_id += 1
+
+    return assigned
+
+
+def _compile():
+    registry = load_registry()
+    assigned = assign_ids(registry)
+
+    unregistered = len(assigned) - len(registry)
+    if unregistered:
+        print(f"⚠️ {unregistered} question(s) missing from question_ids.json, run `python question_catalog.py`")
+
+    question_ids = {}
+    questions = {}
+    question_topic = {}
+    topic_question_ids = {}
+
+    for topic, topic_questions in ML_QUESTIONS.items():
+        topic_question_ids[topic] = []
+        for q in topic_questions:
+            qid = assigned[q]
+            question_ids[q] = qid
+            questions[qid] = q
+            question_topic[qid] = topic
+            topic_question_ids[topic].append(qid)
+
+    # Includes retired questions, so IDs persisted by older catalog versions still resolve to text
+    registered_texts = {qid: q for q, qid in assigned.items()}
+
+    return question_ids, questions, question_topic, topic_question_ids, registered_texts
+
+
+# Question text -> ID, ID -> question text, ID -> topic, topic -> IDs (bank order), ID -> text (incl. retired)
+QUESTION_IDS, QUESTIONS, QUESTION_TOPIC, TOPIC_QUESTION_IDS, REGISTERED_TEXTS = _compile()
+
+# Every active question ID in bank order
+ALL_QUESTION_IDS: List[int] = [qid for ids in TOPIC_QUESTION_IDS.values() for qid in ids]
+
+# Identifies this exact mapping of IDs to topics and questions
+CATALOG_VERSION = hashlib.sha256(json.dumps(
+    [[qid, QUESTION_TOPIC[qid], QUESTIONS[qid]] for qid in ALL_QUESTION_IDS], ensure_ascii=False
+).encode("utf-8")).hexdigest()[:12]
+
+
+def question_id(question: Union[str, int]) -> Optional[int]:
+    """ID for a question given as text or ID; None if it isn't in the catalog"""
+    if isinstance(question, int):
+        return question if question in QUESTIONS else None
+    return QUESTION_IDS.get(question)
+
+
+def to_question_ids(questions: Iterable[Union[str, int]]) -> Set[int]:
+    """Set of catalog IDs for questions given as texts and/or IDs (unknown entries are dropped)"""
+    ids = set()
+    for q in questions or []:
+        qid = question_id(q)
+        if qid is not None:
+            ids.add(qid)
+    return ids
+
+
+def topics_covered_for(asked_ids: Iterable[int]) -> Dict[str, int]:
+    """Number of asked questions per topic"""
+    covered = {}
+    for qid in asked_ids:
+        topic = QUESTION_TOPIC.get(qid)
+        if topic is not None:
+            covered[topic] = covered.get(topic, 0) + 1
+    return covered
+
+
+def asked_ids_from_row(conversation: Dict) -> List[int]:
+    """
+    Asked question IDs for a conversation row, in asking order.
+    Reads questions_asked_ids, falling back to legacy rows that stored question texts in questions_asked.
+    """
+    asked_ids = conversation.get("questions_asked_ids")
+    if asked_ids is not None:
+        return [int(qid) for qid in asked_ids]
+
+    ids = []
+    for q in conversation.get("questions_asked") or []:
+        qid = question_id(q)
+        if qid is not None:
+            ids.append(qid)
+    return ids
+
+
+def asked_texts_from_row(conversation: Dict) -> List[str]:
+    """
+    Asked question texts for a conversation row, for evaluation: legacy questions_asked texts that
+    have no catalog ID (they're kept there, never migrated), then the texts of the asked IDs in order
+    """
+    uncatalogued = [q for q in conversation.get("questions_asked") or [] if question_id(q) is None]
+    return uncatalogued + question_texts(asked_ids_from_row(conversation))
+
+
+def question_texts(question_ids: Iterable[int]) -> List[str]:
+    """Question texts for IDs (IDs unknown to the registry are skipped)"""
+    return [REGISTERED_TEXTS[qid] for qid in question_ids if qid in REGISTERED_TEXTS]
+
+
+def write_registry(path: str = REGISTRY_PATH) -> int:
+    """Register any new bank questions, keeping every existing ID. Returns how many were added."""
+    registry = load_registry(path)
+    assigned = assign_ids(registry)
+
+    with open(path, "w") as f:
+        json.dump({
+            "note": "Append-only: never change or reuse an ID. Regenerate with `python question_catalog.py`.",
+            "questions": assigned
+        }, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    return len(assigned) - len(registry)
+
+
+if __name__ == "__main__":
+    added = write_registry()
+    print(f"✓ Registered {added} new question(s) in {REGISTRY_PATH}")
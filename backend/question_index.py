@@ -0,0 +1,240 @@
+"""
+Precomputed Embedding Index for the ML Questions Bank
+Embeds every question in ML_QUESTIONS once per embedding provider, saves the normalized
+matrix to disk and memory-maps it at startup so selection costs one matrix-vector product
+"""
+
+import os
+import json
+import hashlib
+import sys
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from question_catalog import ALL_QUESTION_IDS, QUESTIONS, QUESTION_TOPIC, CATALOG_VERSION
+from similarity import normalize_query, normalize_rows, similarity_scores, top_k_scores
+from ann_index import IVFIndex, ANN_MIN_BANK_SIZE
+
+INDEX_DIR = os.getenv(
+    "QUESTION_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_index")
+)
+EMBEDDINGS_FILE = "embeddings.npy"
+IDS_FILE = "ids.npy"
+META_FILE = "meta.json"
+
+# After a failed build (e.g. embedding provider outage), wait this long before trying again
+INDEX_RETRY_SECONDS = 60
+
+
+def question_text(topic: str, question: str) -> str:
+    """Text that gets embedded for a question (topic prefix gives better context matching)"""
+    return f"{topic}: {question}"
+
+
+def compute_bank_hash(model: str) -> str:
+    """Content hash of the question catalog (IDs, topics, texts) and embedding model"""
+    payload = json.dumps({"model": model, "catalog": CATALOG_VERSION}, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IndexQuery:
+    """A query embedding prepared for repeated filtered top-k searches against one index"""
+
+    def __init__(self, index: "QuestionIndex", vec: np.ndarray):
+        self.index = index
+        self.vec = vec
+        self._scores = None
+
+    def top_k(self, k: int, exclude_mask: Optional[np.ndarray] = None,
+              allowed_mask: Optional[np.ndarray] = None):
+        """(row indices, scores) of the best k rows, approximate when the index has an IVF index"""
+        if self.index.ivf is not None:
+            return self.index.ivf.search(self.vec, k, exclude_mask=exclude_mask, allowed_mask=allowed_mask)
+
+        # Exact search: score every row once, then reuse the scores for each filter
+        if self._scores is None:
+            self._scores = similarity_scores(self.vec, self.index.embeddings)
+        return top_k_scores(self._scores, k, exclude_mask=exclude_mask, allowed_mask=allowed_mask)
+
+
+class QuestionIndex:
+    """Normalized float32 question embeddings with parallel catalog id/topic/question arrays"""
+
+    def __init__(self, embeddings: np.ndarray, ids: np.ndarray, topics: List[str],
+                 questions: List[str], bank_hash: str, model: str, ivf: Optional[IVFIndex] = None):
+        self.embeddings = embeddings
+        self.ivf = ivf
+        self.ids = ids
+        self.topics = topics
+        self.questions = questions
+        self.bank_hash = bank_hash
+        self.model = model
+        self.row_of_id = {int(qid): i for i, qid in enumerate(ids)}
+        self.topic_array = np.asarray(topics)
+        self._topic_centroids = None
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def scores(self, query_embedding: List[float]) -> Optional[np.ndarray]:
+        """Cosine similarity of the query against every question (one matrix-vector product)"""
+        return similarity_scores(query_embedding, self.embeddings)
+
+    def query(self, query_embedding: List[float]) -> Optional[IndexQuery]:
+        """Prepare a query for top-k searches (exact, or IVF for large banks). None if unusable."""
+        vec = normalize_query(query_embedding)
+        if vec is None or vec.shape[0] != self.embeddings.shape[1]:
+            return None
+        return IndexQuery(self, vec)
+
+    def topic_centroids(self) -> Tuple[List[str], np.ndarray]:
+        """Topic names (bank order) and their normalized mean question embeddings, computed once"""
+        if self._topic_centroids is None:
+            names = list(dict.fromkeys(self.topics))
+            centroids = np.stack([
+                np.asarray(self.embeddings[self.topic_array == topic], dtype=np.float32).mean(axis=0)
+                for topic in names
+            ])
+            self._topic_centroids = (names, normalize_rows(centroids))
+        return self._topic_centroids
+
+    def topic_mask(self, topics: Iterable[str]) -> np.ndarray:
+        """Boolean row mask of questions belonging to any of the given topics"""
+        return np.isin(self.topic_array, list(topics))
+
+    def id_mask(self, question_ids: Iterable[int]) -> np.ndarray:
+        """Boolean row mask of the given catalog question IDs"""
+        mask = np.zeros(len(self.questions), dtype=bool)
+        rows = [self.row_of_id[qid] for qid in question_ids if qid in self.row_of_id]
+        mask[rows] = True
+        return mask
+
+
+def provider_index_dir(provider) -> str:
+    """Each embedding provider gets its own index directory"""
+    return os.path.join(INDEX_DIR, provider.name)
+
+
+def build_question_index(provider, index_dir: str = None) -> QuestionIndex:
+    """Embed every question in the bank with the provider and write the index files"""
+    index_dir = index_dir or provider_index_dir(provider)
+
+    topics = [QUESTION_TOPIC[qid] for qid in ALL_QUESTION_IDS]
+    questions = [QUESTIONS[qid] for qid in ALL_QUESTION_IDS]
+
+    texts = [question_text(t, q) for t, q in zip(topics, questions)]
+
+    vectors = provider.embed(texts)
+    missing = [questions[i] for i, v in enumerate(vectors) if v is None]
+    if missing:
+        raise RuntimeError(f"Failed to embed {len(missing)} question(s), first: {missing[0]!r}")
+
+    embeddings = normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+    ids = np.asarray(ALL_QUESTION_IDS, dtype=np.int32)
+    bank_hash = compute_bank_hash(provider.name)
+
+    os.makedirs(index_dir, exist_ok=True)
+
+    # Write to temp files and rename so a concurrent loader never sees a partial index
+    tmp_embeddings = os.path.join(index_dir, f"{EMBEDDINGS_FILE}.tmp.npy")
+    tmp_ids = os.path.join(index_dir, f"{IDS_FILE}.tmp.npy")
+    tmp_meta = os.path.join(index_dir, f"{META_FILE}.tmp")
+
+    np.save(tmp_embeddings, embeddings)
+    np.save(tmp_ids, ids)
+    with open(tmp_meta, "w") as f:
+        json.dump({
+            "bank_hash": bank_hash,
+            "model": provider.name,
+            "dim": int(embeddings.shape[1]),
+            "count": len(questions),
+            "topics": topics,
+            "questions": questions
+        }, f, ensure_ascii=False)
+
+    os.replace(tmp_embeddings, os.path.join(index_dir, EMBEDDINGS_FILE))
+    os.replace(tmp_ids, os.path.join(index_dir, IDS_FILE))
+    # Meta goes last: it carries the hash that marks the index as valid
+    os.replace(tmp_meta, os.path.join(index_dir, META_FILE))
+
+    print(f"📦 Built {provider.name} question index: {len(questions)} questions, dim {embeddings.shape[1]}")
+
+    return QuestionIndex(embeddings, ids, topics, questions, bank_hash, provider.name,
+                         ivf=load_or_build_ivf(index_dir, embeddings, rebuild=True))
+
+
+def load_or_build_ivf(index_dir: str, embeddings: np.ndarray, rebuild: bool = False) -> Optional[IVFIndex]:
+    """IVF index for large banks (saved next to the embeddings); None below ANN_MIN_BANK_SIZE"""
+    if embeddings.shape[0] < ANN_MIN_BANK_SIZE:
+        return None
+
+    ivf = None if rebuild else IVFIndex.load(index_dir, embeddings)
+    if ivf is None:
+        ivf = IVFIndex.build(embeddings)
+        ivf.save(index_dir)
+        print(f"📦 Built IVF index: {len(ivf.centroids)} lists over {embeddings.shape[0]} questions")
+
+    return ivf
+
+
+def load_question_index(provider, index_dir: str = None) -> QuestionIndex:
+    """Memory-map the provider's index from disk, rebuilding it if missing or stale"""
+    index_dir = index_dir or provider_index_dir(provider)
+
+    meta_path = os.path.join(index_dir, META_FILE)
+    bank_hash = compute_bank_hash(provider.name)
+
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        if meta.get("bank_hash") == bank_hash:
+            embeddings = np.load(os.path.join(index_dir, EMBEDDINGS_FILE), mmap_mode="r")
+            ids = np.load(os.path.join(index_dir, IDS_FILE), mmap_mode="r")
+            return QuestionIndex(embeddings, ids, meta["topics"], meta["questions"], bank_hash, meta["model"],
+                                 ivf=load_or_build_ivf(index_dir, embeddings))
+
+        print("🔄 Question bank changed, rebuilding question index")
+
+    return build_question_index(provider, index_dir)
+
+
+_question_indexes: Dict[str, QuestionIndex] = {}
+_failed_at: Dict[str, float] = {}
+
+
+def get_question_index(provider=None) -> Optional[QuestionIndex]:
+    """
+    Process-wide question index for a provider (defaults to the configured one), loaded on first use.
+    Returns None if it can't be built.
+    """
+    from embedding_providers import get_embedding_provider
+
+    provider = provider or get_embedding_provider()
+
+    if provider.name not in _question_indexes:
+        if time.monotonic() - _failed_at.get(provider.name, float("-inf")) < INDEX_RETRY_SECONDS:
+            return None
+        try:
+            _question_indexes[provider.name] = load_question_index(provider)
+        except Exception as e:
+            print(f"Error loading {provider.name} question index: {e}")
+            _failed_at[provider.name] = time.monotonic()
+            return None
+
+    return _question_indexes[provider.name]
+
+
+if __name__ == "__main__":
+    from embedding_providers import get_embedding_provider
+
+    # Usage: python question_index.py [openai|hashing|tfidf]
+    provider = get_embedding_provider(sys.argv[1] if len(sys.argv) > 1 else None)
+    index = build_question_index(provider)
+    print(f"✓ Question index written to {provider_index_dir(provider)} ({len(index)} questions, hash {index.bank_hash[:12]})")
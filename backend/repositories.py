@@ -0,0 +1,889 @@
+"""
+Data Access Layer
+One repository per table (students, resume_sections, conversations, messages, evaluations). Each
+query selects just the columns of the row type it returns, and request handlers call these
+instead of building queries on the Supabase client with table names inline.
+
+DATABASE_BACKEND=supabase (default) uses the hosted project (SUPABASE_URL / SUPABASE_KEY) through
+the async client; turns are committed by the commit_turn database function.
+DATABASE_BACKEND=sqlite keeps everything in a local file (SQLITE_DATABASE_PATH), created with the
+same tables and columns on first use, so load tests, profiling and CI run the real request paths
+without the hosted project. Arrays and JSONB columns are stored as JSON text there, and the
+seq trigger and commit_turn are done here, each in one SQLite transaction.
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import sqlite3
+import threading
+import contextlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+
+DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "supabase")  # supabase | sqlite
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# Local database file for DATABASE_BACKEND=sqlite (created with the full schema if missing)
+SQLITE_DATABASE_PATH = os.getenv(
+    "SQLITE_DATABASE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "local.sqlite3")
+)
+
+
+# ---------------------------------------------------------------------------
+# Row types: the columns each query selects
+# ---------------------------------------------------------------------------
+
+class Student(TypedDict):
+    """Student columns served to the API (excludes the stored resume embedding)"""
+    id: str
+    created_at: str
+    updated_at: str
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    linkedin: Optional[str]
+    github: Optional[str]
+    portfolio: Optional[str]
+    resume_file_path: Optional[str]
+    gpa: Optional[float]
+
+
+class ResumeEmbedding(TypedDict):
+    resume_embedding: Optional[List[float]]
+    resume_embedding_model: Optional[str]
+    resume_embedding_hash: Optional[str]
+
+
+class Conversation(TypedDict):
+    id: str
+    student_id: str
+    phase: str
+    started_at: str
+    completed_at: Optional[str]
+    created_at: str
+    student_topics: Optional[List[str]]
+    questions_asked: Optional[List[str]]
+    project_questions_count: Optional[int]
+    factual_questions_count: Optional[int]
+    current_project_index: Optional[int]
+    project_1_questions_count: Optional[int]
+    project_2_questions_count: Optional[int]
+    projects_data: Any
+    project_eval_triggered: Optional[bool]
+    factual_eval_triggered: Optional[bool]
+    questions_asked_ids: Optional[List[int]]
+    question_catalog_version: Optional[str]
+    factual_plan: Any
+
+
+class Message(TypedDict):
+    id: str
+    conversation_id: str
+    seq: int
+    role: str
+    content: str
+    phase: Optional[str]
+    metadata: Optional[Dict[str, Any]]
+    audio_url: Optional[str]
+    created_at: str
+
+
+class HistoryMessage(TypedDict):
+    """What the conversation history needs of a message"""
+    seq: int
+    role: str
+    content: str
+
+
+class PhaseMessage(TypedDict):
+    """What a phase evaluation needs of a message"""
+    role: str
+    content: str
+    metadata: Optional[Dict[str, Any]]
+
+
+class Evaluation(TypedDict):
+    id: str
+    conversation_id: str
+    eval_type: str
+    eval_data: Any
+    recommendations: Any
+    created_at: str
+
+
+class TurnResult(TypedDict):
+    conversation: Conversation
+    user_message: Message
+    assistant_message: Message
+
+
+def columns(row_type) -> Tuple[str, ...]:
+    """The columns a row type selects"""
+    return tuple(row_type.__annotations__)
+
+
+STUDENT_COLUMNS = columns(Student)
+RESUME_EMBEDDING_COLUMNS = columns(ResumeEmbedding)
+CONVERSATION_COLUMNS = columns(Conversation)
+MESSAGE_COLUMNS = columns(Message)
+HISTORY_COLUMNS = columns(HistoryMessage)
+PHASE_MESSAGE_COLUMNS = columns(PhaseMessage)
+EVALUATION_COLUMNS = columns(Evaluation)
+
+
+# ---------------------------------------------------------------------------
+# Interface
+# ---------------------------------------------------------------------------
+
+class StudentRepository(ABC):
+    @abstractmethod
+    async def create(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a student and return the new row"""
+
+    @abstractmethod
+    async def get_with_sections(self, student_id: str) -> Optional[Tuple[Student, Dict[str, str]]]:
+        """(student, {heading: content}), or None if there's no such student"""
+
+    @abstractmethod
+    async def get_name(self, student_id: str) -> Optional[str]:
+        """The student's name, or None if there's no such student"""
+
+    @abstractmethod
+    async def get_resume_embedding(self, student_id: str) -> Optional[ResumeEmbedding]:
+        """The stored resume embedding columns, or None if there's no such student"""
+
+    @abstractmethod
+    async def update(self, student_id: str, values: Dict[str, Any]):
+        """Set student columns (e.g. a recomputed resume embedding)"""
+
+
+class ResumeSectionRepository(ABC):
+    @abstractmethod
+    async def add(self, student_id: str, sections: Dict[str, str]):
+        """Store {heading: content} for the student (one insert)"""
+
+
+class ConversationRepository(ABC):
+    @abstractmethod
+    async def create(self, values: Dict[str, Any]) -> Conversation:
+        """Insert a conversation and return the new row"""
+
+    @abstractmethod
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        """The conversation row, or None"""
+
+    @abstractmethod
+    async def get_with_student(
+        self, conversation_id: str
+    ) -> Optional[Tuple[Conversation, Student, Dict[str, str]]]:
+        """(conversation, student, {heading: content}) in one round trip, or None"""
+
+    @abstractmethod
+    async def recent(self, limit: int = 10) -> List[Conversation]:
+        """The newest conversations first"""
+
+    @abstractmethod
+    async def commit_turn(
+        self,
+        conversation_id: str,
+        user_message: Dict[str, Any],
+        assistant_message: Dict[str, Any],
+        updates: Dict[str, Any],
+        increments: Dict[str, int],
+        asked_question_id: Optional[int]
+    ) -> TurnResult:
+        """
+        Atomically store both messages of a turn and apply the conversation updates (set columns,
+        incremented counters, appended asked question); returns the new rows. Turns of one
+        conversation commit one at a time, and a turn that fails (e.g. an unknown column) writes nothing.
+        """
+
+
+class MessageRepository(ABC):
+    @abstractmethod
+    async def add(self, conversation_id: str, role: str, content: str, phase: Optional[str] = None) -> Message:
+        """Insert a message (numbered with the conversation's next seq) and return the new row"""
+
+    @abstractmethod
+    async def history(self, conversation_id: str, after_seq: int = 0) -> List[HistoryMessage]:
+        """The conversation's messages with seq > after_seq, in order"""
+
+    @abstractmethod
+    async def for_phase(self, conversation_id: str, phase: str) -> List[PhaseMessage]:
+        """The messages tagged with a phase, in order"""
+
+    @abstractmethod
+    async def for_conversation(self, conversation_id: str) -> List[Message]:
+        """Every message of the conversation, in order"""
+
+    @abstractmethod
+    async def set_audio_url(self, message_id: str, audio_url: str):
+        """Point the message at its stored audio"""
+
+
+class EvaluationRepository(ABC):
+    @abstractmethod
+    async def add(self, conversation_id: str, eval_type: str, eval_data: Any, recommendations: Any):
+        """Store a phase evaluation (eval_type: project or factual)"""
+
+    @abstractmethod
+    async def get(self, conversation_id: str, eval_type: Optional[str] = None) -> Optional[Evaluation]:
+        """The newest evaluation of the conversation (of eval_type, if given), or None"""
+
+
+class Database(ABC):
+    """A backend: one repository per table"""
+
+    students: StudentRepository
+    resume_sections: ResumeSectionRepository
+    conversations: ConversationRepository
+    messages: MessageRepository
+    evaluations: EvaluationRepository
+
+    @classmethod
+    @abstractmethod
+    async def connect(cls) -> "Database":
+        """The backend, configured from the environment"""
+
+    @abstractmethod
+    async def add_columns(self, table: str, column_types: Dict[str, str]):
+        """Add the columns ({name: Postgres type}) the table doesn't have yet"""
+
+    @abstractmethod
+    async def check_schema(self):
+        """Raise RuntimeError, saying which migration to apply, if the app can't run on this database"""
+
+
+def split_student_sections(row: Dict[str, Any]) -> Tuple[Student, Dict[str, str]]:
+    """(student, {heading: content}) from a student row with its resume_sections embedded"""
+    student = dict(row)
+    sections = {}
+    for section in student.pop("resume_sections", None) or []:
+        sections[section["heading"]] = section["content"]
+    return student, sections
+
+
+def section_rows(student_id: str, sections: Dict[str, str]) -> List[Dict[str, Any]]:
+    """resume_sections rows for {heading: content}, skipping empty sections"""
+    return [
+        {"student_id": student_id, "heading": heading, "content": content}
+        for heading, content in sections.items() if content
+    ]
+
+
+def add_columns_sql(table: str, column_types: Dict[str, str]) -> str:
+    """ALTER TABLE adding the columns if they don't exist (Postgres)"""
+    additions = ",\n".join(f"ADD COLUMN IF NOT EXISTS {name} {column_type}" for name, column_type in column_types.items())
+    return f"ALTER TABLE {table}\n{additions};"
+
+
+# ---------------------------------------------------------------------------
+# Supabase
+# ---------------------------------------------------------------------------
+
+def select_list(column_names: Tuple[str, ...]) -> str:
+    """PostgREST select string"""
+    return ", ".join(column_names)
+
+
+# The nil UUID: no conversation has it
+NO_CONVERSATION_ID = "00000000-0000-0000-0000-000000000000"
+
+# Student columns with the resume sections embedded: one PostgREST request instead of two
+STUDENT_WITH_SECTIONS = f"{select_list(STUDENT_COLUMNS)}, resume_sections(heading, content)"
+
+
+class SupabaseStudents(StudentRepository):
+    def __init__(self, client):
+        self.client = client
+
+    async def create(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self.client.table("students").insert(values).execute()
+        return response.data[0]
+
+    async def get_with_sections(self, student_id: str) -> Optional[Tuple[Student, Dict[str, str]]]:
+        response = await self.client.table("students").select(STUDENT_WITH_SECTIONS).eq("id", student_id).execute()
+        if not response.data:
+            return None
+        return split_student_sections(response.data[0])
+
+    async def get_name(self, student_id: str) -> Optional[str]:
+        response = await self.client.table("students").select("name").eq("id", student_id).execute()
+        return response.data[0]["name"] if response.data else None
+
+    async def get_resume_embedding(self, student_id: str) -> Optional[ResumeEmbedding]:
+        response = await self.client.table("students").select(
+            select_list(RESUME_EMBEDDING_COLUMNS)
+        ).eq("id", student_id).execute()
+        return response.data[0] if response.data else None
+
+    async def update(self, student_id: str, values: Dict[str, Any]):
+        await self.client.table("students").update(values).eq("id", student_id).execute()
+
+
+class SupabaseResumeSections(ResumeSectionRepository):
+    def __init__(self, client):
+        self.client = client
+
+    async def add(self, student_id: str, sections: Dict[str, str]):
+        rows = section_rows(student_id, sections)
+        if rows:
+            await self.client.table("resume_sections").insert(rows).execute()
+
+
+class SupabaseConversations(ConversationRepository):
+    def __init__(self, client):
+        self.client = client
+
+    async def create(self, values: Dict[str, Any]) -> Conversation:
+        response = await self.client.table("conversations").insert(values).execute()
+        return response.data[0]
+
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        response = await self.client.table("conversations").select(
+            select_list(CONVERSATION_COLUMNS)
+        ).eq("id", conversation_id).execute()
+        return response.data[0] if response.data else None
+
+    async def get_with_student(
+        self, conversation_id: str
+    ) -> Optional[Tuple[Conversation, Student, Dict[str, str]]]:
+        # The student and its resume sections embedded in the conversation select
+        response = await self.client.table("conversations").select(
+            f"{select_list(CONVERSATION_COLUMNS)}, students({STUDENT_WITH_SECTIONS})"
+        ).eq("id", conversation_id).execute()
+        if not response.data:
+            return None
+        conversation = dict(response.data[0])
+        student, sections = split_student_sections(conversation.pop("students"))
+        return conversation, student, sections
+
+    async def recent(self, limit: int = 10) -> List[Conversation]:
+        response = await self.client.table("conversations").select(
+            select_list(CONVERSATION_COLUMNS)
+        ).order("created_at", desc=True).limit(limit).execute()
+        return response.data
+
+    async def commit_turn(
+        self,
+        conversation_id: str,
+        user_message: Dict[str, Any],
+        assistant_message: Dict[str, Any],
+        updates: Dict[str, Any],
+        increments: Dict[str, int],
+        asked_question_id: Optional[int]
+    ) -> TurnResult:
+        # The commit_turn database function (database/add_commit_turn_function.sql): one round trip
+        response = await self.client.rpc("commit_turn", {
+            "p_conversation_id": conversation_id,
+            "p_user_message": user_message,
+            "p_assistant_message": assistant_message,
+            "p_updates": updates,
+            "p_increments": increments,
+            "p_asked_question_id": asked_question_id
+        }).execute()
+        return response.data
+
+
+class SupabaseMessages(MessageRepository):
+    def __init__(self, client):
+        self.client = client
+
+    async def add(self, conversation_id: str, role: str, content: str, phase: Optional[str] = None) -> Message:
+        # seq is assigned by the messages_assign_seq trigger
+        response = await self.client.table("messages").insert({
+            "conversation_id": conversation_id,
+            "role": role,
+            "content": content,
+            "phase": phase
+        }).execute()
+        return response.data[0]
+
+    async def history(self, conversation_id: str, after_seq: int = 0) -> List[HistoryMessage]:
+        response = await self.client.table("messages").select(select_list(HISTORY_COLUMNS)).eq(
+            "conversation_id", conversation_id
+        ).gt("seq", after_seq).order("seq").execute()
+        return response.data
+
+    async def for_phase(self, conversation_id: str, phase: str) -> List[PhaseMessage]:
+        response = await self.client.table("messages").select(select_list(PHASE_MESSAGE_COLUMNS)).eq(
+            "conversation_id", conversation_id
+        ).eq("phase", phase).order("seq").execute()
+        return response.data
+
+    async def for_conversation(self, conversation_id: str) -> List[Message]:
+        response = await self.client.table("messages").select(select_list(MESSAGE_COLUMNS)).eq(
+            "conversation_id", conversation_id
+        ).order("seq").execute()
+        return response.data
+
+    async def set_audio_url(self, message_id: str, audio_url: str):
+        await self.client.table("messages").update({"audio_url": audio_url}).eq("id", message_id).execute()
+
+
+class SupabaseEvaluations(EvaluationRepository):
+    def __init__(self, client):
+        self.client = client
+
+    async def add(self, conversation_id: str, eval_type: str, eval_data: Any, recommendations: Any):
+        await self.client.table("evaluations").insert({
+            "conversation_id": conversation_id,
+            "eval_type": eval_type,
+            "eval_data": eval_data,
+            "recommendations": recommendations
+        }).execute()
+
+    async def get(self, conversation_id: str, eval_type: Optional[str] = None) -> Optional[Evaluation]:
+        query = self.client.table("evaluations").select(select_list(EVALUATION_COLUMNS)).eq("conversation_id", conversation_id)
+        if eval_type:
+            query = query.eq("eval_type", eval_type)
+        response = await query.order("created_at", desc=True).limit(1).execute()
+        return response.data[0] if response.data else None
+
+
+class SupabaseDatabase(Database):
+    """The hosted project, through the async Supabase client (database round trips don't block the event loop)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.students = SupabaseStudents(client)
+        self.resume_sections = SupabaseResumeSections(client)
+        self.conversations = SupabaseConversations(client)
+        self.messages = SupabaseMessages(client)
+        self.evaluations = SupabaseEvaluations(client)
+
+    @classmethod
+    async def connect(cls) -> "SupabaseDatabase":
+        from supabase import acreate_client
+        return cls(await acreate_client(SUPABASE_URL, SUPABASE_KEY))
+
+    async def add_columns(self, table: str, column_types: Dict[str, str]):
+        # Needs an exec_sql function in the project; otherwise run add_columns_sql() in the SQL editor
+        await self.client.rpc("exec_sql", {"query": add_columns_sql(table, column_types)}).execute()
+
+    async def check_schema(self):
+        # Every turn goes through commit_turn. Call it for a conversation that can't exist: the function
+        # raises "not found" (P0002) before writing anything, and PostgREST answers PGRST202 if it's missing
+        from postgrest.exceptions import APIError
+
+        try:
+            await self.client.rpc("commit_turn", {
+                "p_conversation_id": NO_CONVERSATION_ID,
+                "p_user_message": {},
+                "p_assistant_message": {}
+            }).execute()
+        except APIError as e:
+            if e.code == "PGRST202":
+                raise RuntimeError(
+                    "The commit_turn database function is missing: apply database/add_message_seq_schema.sql "
+                    "and database/add_commit_turn_function.sql in the Supabase SQL editor"
+                ) from e
+            if e.code != "P0002":
+                raise
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+# The tables of schema.sql, schema_part2.sql and database/*.sql, for SQLite. Ids are UUID strings
+# and timestamps ISO 8601 text. Columns declared JSON_TEXT (arrays and JSONB in Postgres) hold
+# JSON and are decoded on read; BOOLEAN columns are read back as bools.
+SQLITE_NOW = "(strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))"
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS students (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL DEFAULT {SQLITE_NOW},
+    updated_at TEXT NOT NULL DEFAULT {SQLITE_NOW},
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    linkedin TEXT,
+    github TEXT,
+    portfolio TEXT,
+    resume_file_path TEXT,
+    gpa REAL DEFAULT 0,
+    resume_embedding JSON_TEXT,
+    resume_embedding_model TEXT,
+    resume_embedding_hash TEXT
+);
+
+CREATE TRIGGER IF NOT EXISTS update_students_updated_at AFTER UPDATE ON students
+FOR EACH ROW BEGIN
+    UPDATE students SET updated_at = {SQLITE_NOW} WHERE id = NEW.id;
+END;
+
+CREATE TABLE IF NOT EXISTS resume_sections (
+    id TEXT PRIMARY KEY,
+    student_id TEXT REFERENCES students(id) ON DELETE CASCADE,
+    heading TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT {SQLITE_NOW}
+);
+CREATE INDEX IF NOT EXISTS idx_resume_sections_student_id ON resume_sections(student_id);
+
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    student_id TEXT REFERENCES students(id) ON DELETE CASCADE,
+    phase TEXT NOT NULL DEFAULT 'greeting',
+    started_at TEXT NOT NULL DEFAULT {SQLITE_NOW},
+    completed_at TEXT,
+    created_at TEXT NOT NULL DEFAULT {SQLITE_NOW},
+    student_topics JSON_TEXT,
+    questions_asked JSON_TEXT,
+    project_questions_count INTEGER DEFAULT 0,
+    factual_questions_count INTEGER DEFAULT 0,
+    current_project_index INTEGER DEFAULT 0,
+    project_1_questions_count INTEGER DEFAULT 0,
+    project_2_questions_count INTEGER DEFAULT 0,
+    projects_data JSON_TEXT,
+    project_eval_triggered BOOLEAN DEFAULT FALSE,
+    factual_eval_triggered BOOLEAN DEFAULT FALSE,
+    questions_asked_ids JSON_TEXT,
+    question_catalog_version TEXT,
+    factual_plan JSON_TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_student_id ON conversations(student_id);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    conversation_id TEXT REFERENCES conversations(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    phase TEXT,
+    metadata JSON_TEXT,
+    audio_url TEXT,
+    created_at TEXT NOT NULL DEFAULT {SQLITE_NOW}
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_conversation_seq ON messages(conversation_id, seq);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    id TEXT PRIMARY KEY,
+    conversation_id TEXT REFERENCES conversations(id) ON DELETE CASCADE,
+    eval_type TEXT NOT NULL,
+    eval_data JSON_TEXT NOT NULL,
+    recommendations JSON_TEXT,
+    created_at TEXT NOT NULL DEFAULT {SQLITE_NOW}
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_conversation_id ON evaluations(conversation_id);
+"""
+
+# What the messages_assign_seq trigger does: part of the INSERT statement, so under its write lock
+NEXT_SEQ_SQL = "(SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE conversation_id = ?)"
+
+
+class SQLiteDatabase(Database):
+    """
+    A local SQLite file. One connection, used by one worker thread at a time (sqlite3 calls
+    block, so they run via asyncio.to_thread); other processes are kept out by SQLite's own locking.
+    """
+
+    def __init__(self, path: str = SQLITE_DATABASE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA busy_timeout = 5000")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SQLITE_SCHEMA)
+        self.lock = threading.Lock()
+        self._column_types: Dict[str, Dict[str, str]] = {}
+
+        self.students = SQLiteStudents(self)
+        self.resume_sections = SQLiteResumeSections(self)
+        self.conversations = SQLiteConversations(self)
+        self.messages = SQLiteMessages(self)
+        self.evaluations = SQLiteEvaluations(self)
+
+    @classmethod
+    async def connect(cls) -> "SQLiteDatabase":
+        return await asyncio.to_thread(cls, SQLITE_DATABASE_PATH)
+
+    async def run(self, fn, *args):
+        """fn(*args) in a worker thread, holding the connection"""
+        def locked():
+            with self.lock:
+                return fn(*args)
+        return await asyncio.to_thread(locked)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front, as the FOR UPDATE lock does in Postgres
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def column_types(self, table: str) -> Dict[str, str]:
+        """{column: declared type}"""
+        if table not in self._column_types:
+            rows = self.conn.execute(f"PRAGMA table_info({table})").fetchall()
+            if not rows:
+                raise ValueError(f"Unknown table '{table}'")
+            self._column_types[table] = {row["name"]: row["type"].upper() for row in rows}
+        return self._column_types[table]
+
+    def encode(self, table: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        types = self.column_types(table)
+        unknown = [column for column in values if column not in types]
+        if unknown:
+            raise ValueError(f"Unknown column(s) in {table}: {', '.join(unknown)}")
+        return {
+            column: json.dumps(value) if types[column] == "JSON_TEXT" and value is not None else value
+            for column, value in values.items()
+        }
+
+    def decode(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        types = self.column_types(table)
+        decoded = {}
+        for column in row.keys():
+            value = row[column]
+            if value is not None and types.get(column) == "JSON_TEXT":
+                value = json.loads(value)
+            elif value is not None and types.get(column) == "BOOLEAN":
+                value = bool(value)
+            decoded[column] = value
+        return decoded
+
+    def select(
+        self,
+        table: str,
+        column_names: Tuple[str, ...],
+        where: str = "",
+        params: tuple = (),
+        order_by: str = "",
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        sql = f"SELECT {', '.join(column_names)} FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [self.decode(table, row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def insert(self, table: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        values = self.encode(table, {"id": str(uuid.uuid4()), **values})
+        names = list(values)
+        placeholders = ["?"] * len(names)
+        params = list(values.values())
+        if table == "messages":
+            names.append("seq")
+            placeholders.append(NEXT_SEQ_SQL)
+            params.append(values["conversation_id"])
+        row = self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join(placeholders)}) RETURNING *", params
+        ).fetchone()
+        return self.decode(table, row)
+
+    def update(self, table: str, row_id: str, values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        values = self.encode(table, values)
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        row = self.conn.execute(
+            f"UPDATE {table} SET {assignments} WHERE id = ? RETURNING *", [*values.values(), row_id]
+        ).fetchone()
+        return self.decode(table, row) if row else None
+
+    def sections(self, student_id: str) -> Dict[str, str]:
+        rows = self.select("resume_sections", ("heading", "content"), "student_id = ?", (student_id,), "rowid")
+        return {row["heading"]: row["content"] for row in rows}
+
+    async def add_columns(self, table: str, column_types: Dict[str, str]):
+        await self.run(self._add_columns, table, column_types)
+
+    def _add_columns(self, table: str, column_types: Dict[str, str]):
+        existing = self.column_types(table)
+        for name, column_type in column_types.items():
+            if name in existing:
+                continue
+            base_type = column_type.split()[0]
+            if base_type.endswith("[]") or base_type.upper() in ("JSON", "JSONB"):
+                column_type = "JSON_TEXT" + column_type[len(base_type):]
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+        self._column_types.pop(table, None)
+
+    async def check_schema(self):
+        # SQLITE_SCHEMA is applied on connect and commit_turn is done here
+        pass
+
+
+class SQLiteStudents(StudentRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def create(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.db.run(self.db.insert, "students", values)
+
+    async def get_with_sections(self, student_id: str) -> Optional[Tuple[Student, Dict[str, str]]]:
+        return await self.db.run(self._get_with_sections, student_id)
+
+    def _get_with_sections(self, student_id: str):
+        rows = self.db.select("students", STUDENT_COLUMNS, "id = ?", (student_id,))
+        return (rows[0], self.db.sections(student_id)) if rows else None
+
+    async def get_name(self, student_id: str) -> Optional[str]:
+        rows = await self.db.run(self.db.select, "students", ("name",), "id = ?", (student_id,))
+        return rows[0]["name"] if rows else None
+
+    async def get_resume_embedding(self, student_id: str) -> Optional[ResumeEmbedding]:
+        rows = await self.db.run(self.db.select, "students", RESUME_EMBEDDING_COLUMNS, "id = ?", (student_id,))
+        return rows[0] if rows else None
+
+    async def update(self, student_id: str, values: Dict[str, Any]):
+        await self.db.run(self.db.update, "students", student_id, values)
+
+
+class SQLiteResumeSections(ResumeSectionRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def add(self, student_id: str, sections: Dict[str, str]):
+        await self.db.run(self._add, section_rows(student_id, sections))
+
+    def _add(self, rows: List[Dict[str, Any]]):
+        with self.db.transaction():
+            for row in rows:
+                self.db.insert("resume_sections", row)
+
+
+class SQLiteConversations(ConversationRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def create(self, values: Dict[str, Any]) -> Conversation:
+        return await self.db.run(self.db.insert, "conversations", values)
+
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        rows = await self.db.run(self.db.select, "conversations", CONVERSATION_COLUMNS, "id = ?", (conversation_id,))
+        return rows[0] if rows else None
+
+    async def get_with_student(
+        self, conversation_id: str
+    ) -> Optional[Tuple[Conversation, Student, Dict[str, str]]]:
+        return await self.db.run(self._get_with_student, conversation_id)
+
+    def _get_with_student(self, conversation_id: str):
+        conversations = self.db.select("conversations", CONVERSATION_COLUMNS, "id = ?", (conversation_id,))
+        if not conversations:
+            return None
+        conversation = conversations[0]
+        students = self.db.select("students", STUDENT_COLUMNS, "id = ?", (conversation["student_id"],))
+        return conversation, (students[0] if students else None), self.db.sections(conversation["student_id"])
+
+    async def recent(self, limit: int = 10) -> List[Conversation]:
+        return await self.db.run(self.db.select, "conversations", CONVERSATION_COLUMNS, "", (), "created_at DESC", limit)
+
+    async def commit_turn(
+        self,
+        conversation_id: str,
+        user_message: Dict[str, Any],
+        assistant_message: Dict[str, Any],
+        updates: Dict[str, Any],
+        increments: Dict[str, int],
+        asked_question_id: Optional[int]
+    ) -> TurnResult:
+        return await self.db.run(
+            self._commit_turn, conversation_id, user_message, assistant_message, updates, increments, asked_question_id
+        )
+
+    def _commit_turn(self, conversation_id, user_message, assistant_message, updates, increments, asked_question_id):
+        """The commit_turn database function, step for step"""
+        with self.db.transaction():
+            rows = self.db.select("conversations", CONVERSATION_COLUMNS, "id = ?", (conversation_id,))
+            if not rows:
+                raise LookupError(f"Conversation {conversation_id} not found")
+            user_row = self.db.insert("messages", {"conversation_id": conversation_id, "role": "user", **user_message})
+            assistant_row = self.db.insert(
+                "messages", {"conversation_id": conversation_id, "role": "assistant", **assistant_message}
+            )
+
+            # New values: the current row, overwritten by updates, plus the increments and the appended question
+            row = {**rows[0], **updates}
+            for column, amount in increments.items():
+                row[column] = (row.get(column) or 0) + amount
+            touched = {**updates, **increments}
+            if asked_question_id is not None:
+                row["questions_asked_ids"] = (row.get("questions_asked_ids") or []) + [asked_question_id]
+                touched["questions_asked_ids"] = None
+
+            # Only the columns the turn touched (an unknown column name fails the whole turn)
+            conversation = rows[0]
+            if touched:
+                conversation = self.db.update("conversations", conversation_id, {column: row[column] for column in touched})
+
+        return {"conversation": conversation, "user_message": user_row, "assistant_message": assistant_row}
+
+
+class SQLiteMessages(MessageRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def add(self, conversation_id: str, role: str, content: str, phase: Optional[str] = None) -> Message:
+        return await self.db.run(self.db.insert, "messages", {
+            "conversation_id": conversation_id,
+            "role": role,
+            "content": content,
+            "phase": phase
+        })
+
+    async def history(self, conversation_id: str, after_seq: int = 0) -> List[HistoryMessage]:
+        return await self.db.run(
+            self.db.select, "messages", HISTORY_COLUMNS, "conversation_id = ? AND seq > ?", (conversation_id, after_seq), "seq"
+        )
+
+    async def for_phase(self, conversation_id: str, phase: str) -> List[PhaseMessage]:
+        return await self.db.run(
+            self.db.select, "messages", PHASE_MESSAGE_COLUMNS, "conversation_id = ? AND phase = ?", (conversation_id, phase), "seq"
+        )
+
+    async def for_conversation(self, conversation_id: str) -> List[Message]:
+        return await self.db.run(
+            self.db.select, "messages", MESSAGE_COLUMNS, "conversation_id = ?", (conversation_id,), "seq"
+        )
+
+    async def set_audio_url(self, message_id: str, audio_url: str):
+        await self.db.run(self.db.update, "messages", message_id, {"audio_url": audio_url})
+
+
+class SQLiteEvaluations(EvaluationRepository):
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    async def add(self, conversation_id: str, eval_type: str, eval_data: Any, recommendations: Any):
+        await self.db.run(self.db.insert, "evaluations", {
+            "conversation_id": conversation_id,
+            "eval_type": eval_type,
+            "eval_data": eval_data,
+            "recommendations": recommendations
+        })
+
+    async def get(self, conversation_id: str, eval_type: Optional[str] = None) -> Optional[Evaluation]:
+        where, params = "conversation_id = ?", (conversation_id,)
+        if eval_type:
+            where, params = where + " AND eval_type = ?", params + (eval_type,)
+        rows = await self.db.run(self.db.select, "evaluations", EVALUATION_COLUMNS, where, params, "created_at DESC", 1)
+        return rows[0] if rows else None
+
+
+DATABASE_BACKENDS = {
+    "supabase": SupabaseDatabase,
+    "sqlite": SQLiteDatabase,
+}
+
+
+async def connect_database(backend: str = DATABASE_BACKEND) -> Database:
+    """The configured backend (DATABASE_BACKEND), connected"""
+    if backend not in DATABASE_BACKENDS:
+        raise ValueError(f"Unknown DATABASE_BACKEND '{backend}' (expected one of {', '.join(DATABASE_BACKENDS)})")
+    database = await DATABASE_BACKENDS[backend].connect()
+    print(f"✓ Database: {backend}")
+    return database
@@ -0,0 +1,108 @@
+"""
+Conversation Session Cache
+What every turn needs about a conversation (its row, the student, resume sections, the derived
+resume summary / resume text / first name, and the message history), kept between turns so
+/continue-conversation doesn't re-read and rebuild it each time.
+
+A turn takes the session out of the cache and finish_turn puts it back with the turn's writes
+applied (conversation updates and both new messages). A turn that fails never puts it back, so
+the next one rebuilds from the database instead of trusting state that may not match it.
+
+SESSION_CACHE=memory (default) keeps sessions in this process: fine for the single worker
+we deploy, but turns of one conversation must then always reach the same worker.
+SESSION_CACHE=redis shares them between workers (REDIS_URL; needs `pip install redis`).
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+SESSION_CACHE = os.getenv("SESSION_CACHE", "memory")  # memory | redis
+# An interview idle this long is rebuilt from the database on its next turn
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "1000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_KEY_PREFIX = "session:"
+
+
+class MemorySessionCache:
+    """In-process LRU with a TTL (values stored as JSON, so callers never share a mutable dict)"""
+
+    def __init__(self, ttl_seconds: float = SESSION_TTL_SECONDS, max_entries: int = SESSION_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def take(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.pop(conversation_id, None)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return json.loads(entry[1])
+
+    async def put(self, conversation_id: str, session: Dict[str, Any]):
+        self._entries.pop(conversation_id, None)
+        self._entries[conversation_id] = (time.time() + self.ttl_seconds, json.dumps(session))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, conversation_id: str):
+        self._entries.pop(conversation_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisSessionCache:
+    """Shared between workers; Redis applies the TTL (and LRU, with a maxmemory-policy set)"""
+
+    def __init__(self, url: str = REDIS_URL, ttl_seconds: float = SESSION_TTL_SECONDS):
+        import redis.asyncio as redis
+
+        self.ttl_seconds = ttl_seconds
+        self.client = redis.from_url(url)
+
+    async def take(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.client.getdel(f"{REDIS_KEY_PREFIX}{conversation_id}")
+        return json.loads(value) if value else None
+
+    async def put(self, conversation_id: str, session: Dict[str, Any]):
+        await self.client.set(f"{REDIS_KEY_PREFIX}{conversation_id}", json.dumps(session), ex=int(self.ttl_seconds))
+
+    async def delete(self, conversation_id: str):
+        await self.client.delete(f"{REDIS_KEY_PREFIX}{conversation_id}")
+
+
+SESSION_BACKENDS = {
+    "memory": MemorySessionCache,
+    "redis": RedisSessionCache,
+}
+
+_session_cache = None
+
+
+def get_session_cache():
+    """The configured backend (created on first use)"""
+    global _session_cache
+    if _session_cache is None:
+        if SESSION_CACHE not in SESSION_BACKENDS:
+            raise ValueError(f"Unknown SESSION_CACHE '{SESSION_CACHE}' (expected one of {', '.join(SESSION_BACKENDS)})")
+        _session_cache = SESSION_BACKENDS[SESSION_CACHE]()
+    return _session_cache
+
+
+async def take_session(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """The cached session, removed from the cache until put back (cache errors are treated as a miss)"""
+    try:
+        return await get_session_cache().take(conversation_id)
+    except Exception as e:
+        print(f"⚠️ Session cache read failed for {conversation_id}: {e}")
+        return None
+
+
+async def put_session(conversation_id: str, session: Dict[str, Any]):
+    try:
+        await get_session_cache().put(conversation_id, session)
+    except Exception as e:
+        print(f"⚠️ Session cache write failed for {conversation_id}: {e}")
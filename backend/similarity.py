@@ -0,0 +1,100 @@
+"""
+Vectorized Similarity Kernel
+Scores a query vector against a pre-normalized candidate matrix in one pass and
+picks the top-k with a partial sort, replacing pairwise cosine_similarity loops
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+# Rows upcast per step when scoring float16 storage (keeps the temporary float32 copy small)
+FLOAT16_CHUNK_ROWS = 8192
+
+
+def normalize_query(query) -> Optional[np.ndarray]:
+    """Return the query as a unit-length float32 vector, or None if it's empty or zero"""
+    if query is None or len(query) == 0:
+        return None
+
+    vec = np.asarray(query, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return None
+
+    return vec / norm
+
+
+def normalize_rows(matrix: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """L2-normalize every row of a candidate matrix (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(dtype, copy=False)
+
+
+def similarity_scores(query, matrix: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Cosine similarity of a query against every row of a pre-normalized matrix.
+    Works on float32 or float16 storage (including memory-mapped arrays); scores are float32.
+    """
+    vec = normalize_query(query)
+    if vec is None or vec.shape[0] != matrix.shape[1]:
+        return None
+
+    if matrix.dtype == np.float32:
+        return matrix @ vec
+
+    # float16 (or other) storage: upcast in chunks instead of materializing the whole matrix
+    scores = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], FLOAT16_CHUNK_ROWS):
+        chunk = np.asarray(matrix[start:start + FLOAT16_CHUNK_ROWS], dtype=np.float32)
+        scores[start:start + FLOAT16_CHUNK_ROWS] = chunk @ vec
+
+    return scores
+
+
+def top_k_scores(
+    scores: np.ndarray,
+    k: int,
+    exclude_mask: Optional[np.ndarray] = None,
+    allowed_mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pick the k highest scores with argpartition (O(n)) and sort only those k.
+    exclude_mask marks rows to skip (e.g. already-asked questions);
+    allowed_mask restricts the search to certain rows (e.g. a topic filter).
+    Returns (row indices, scores), best first. May return fewer than k rows.
+    """
+    valid = np.ones(scores.shape[0], dtype=bool)
+    if exclude_mask is not None:
+        valid &= ~exclude_mask
+    if allowed_mask is not None:
+        valid &= allowed_mask
+
+    candidates = np.flatnonzero(valid)
+    if k <= 0 or candidates.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    candidate_scores = scores[candidates]
+    if k < candidates.size:
+        part = np.argpartition(-candidate_scores, k - 1)[:k]
+    else:
+        part = np.arange(candidates.size)
+
+    order = part[np.argsort(-candidate_scores[part], kind="stable")]
+    return candidates[order], candidate_scores[order]
+
+
+def top_k(
+    query,
+    matrix: np.ndarray,
+    k: int,
+    exclude_mask: Optional[np.ndarray] = None,
+    allowed_mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score the query against the matrix and return the top-k (row indices, scores)"""
+    scores = similarity_scores(query, matrix)
+    if scores is None:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    return top_k_scores(scores, k, exclude_mask=exclude_mask, allowed_mask=allowed_mask)
@@ -0,0 +1,345 @@
+"""
+commit_turn test: the Postgres database function and its local SQLite stand-in
+Runs the same checks against both backends. commit_turn must:
+- store both messages with consecutive seq numbers and apply updates, increments and the asked question
+- be atomic: a turn that fails (unknown column) leaves no messages and an unchanged conversation
+- lose nothing when many turns of one conversation commit at the same time, each from its own connection
+- refuse a conversation that doesn't exist without writing anything (the startup check relies on this)
+
+SQLite (SQLiteDatabase in repositories.py) runs in a throwaway file.
+Postgres runs in the database given by --database-url or DATABASE_URL; without one, the script starts a
+throwaway local Postgres server with pgserver (which ships the Postgres binaries) and deletes it afterwards.
+It creates a throwaway schema, applies schema.sql, schema_part2.sql and the migrations in ../database,
+and drops the schema afterwards. Install the test dependencies first:
+  pip install -r requirements-dev.txt
+
+Usage: python test_commit_turn.py [--database-url postgresql://localhost/postgres] [--concurrent 20] [--sqlite-only]
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import importlib.util
+import argparse
+import tempfile
+import threading
+import contextlib
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE_DIR = os.path.join(BACKEND_DIR, "..", "database")
+
+# In the order they'd be applied to a fresh Supabase project
+SCHEMA_FILES = [
+    os.path.join(BACKEND_DIR, "schema.sql"),
+    os.path.join(BACKEND_DIR, "schema_part2.sql"),
+    os.path.join(DATABASE_DIR, "add_phase4_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_two_projects_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_evaluations_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_question_ids_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_resume_embedding_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_factual_plan_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_message_seq_schema.sql"),
+    os.path.join(DATABASE_DIR, "add_commit_turn_function.sql"),
+]
+
+
+def turn_messages(turn: int):
+    """(user message, assistant message) of a turn, as finish_turn passes them"""
+    return (
+        {"content": f"answer {turn}", "phase": "factual_questions", "metadata": {"paste_count": 0}},
+        {"content": f"question {turn + 1}", "phase": "factual_questions"},
+    )
+
+
+def connect(database_url: str, schema: str):
+    import psycopg
+    return psycopg.connect(database_url, autocommit=True, options=f"-c search_path={schema}")
+
+
+class PostgresBackend:
+    """The commit_turn database function, called as supabase.rpc('commit_turn', ...) calls it"""
+
+    label = "Postgres"
+
+    def __init__(self, database_url: str, schema: str):
+        from psycopg.errors import NoDataFound
+
+        # SQLSTATE P0002: what SupabaseDatabase.check_schema expects back
+        self.not_found_error = NoDataFound
+        self.database_url = database_url
+        self.schema = schema
+        self.conn = connect(database_url, schema)
+
+    def worker(self) -> "PostgresBackend":
+        return PostgresBackend(self.database_url, self.schema)
+
+    def close(self):
+        self.conn.close()
+
+    def commit_turn(self, conversation_id: str, turn: int, updates=None, increments=None, asked_question_id=None):
+        from psycopg.types.json import Jsonb
+
+        user_message, assistant_message = turn_messages(turn)
+        row = self.conn.execute(
+            "SELECT commit_turn(%s, %s, %s, %s, %s, %s)",
+            (conversation_id, Jsonb(user_message), Jsonb(assistant_message),
+             Jsonb(updates or {}), Jsonb(increments or {}), asked_question_id)
+        ).fetchone()
+        return row[0]
+
+    def create_conversation(self) -> str:
+        student_id = self.conn.execute("INSERT INTO students (name) VALUES ('Test Student') RETURNING id").fetchone()[0]
+        return str(self.conn.execute(
+            "INSERT INTO conversations (student_id, phase, factual_questions_count, questions_asked_ids) "
+            "VALUES (%s, 'gpa_questions', 0, '{}') RETURNING id",
+            (student_id,)
+        ).fetchone()[0])
+
+    def messages(self, conversation_id: str):
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT seq, role, content FROM messages WHERE conversation_id = %s ORDER BY seq", (conversation_id,)
+        ).fetchall()]
+
+    def conversation(self, conversation_id: str):
+        return self.conn.execute("SELECT to_jsonb(c) FROM conversations c WHERE id = %s", (conversation_id,)).fetchone()[0]
+
+
+class SQLiteBackend:
+    """SQLiteDatabase.conversations.commit_turn (repositories.py), the local stand-in for the function"""
+
+    label = "SQLite"
+
+    def __init__(self, path: str):
+        from repositories import SQLiteDatabase
+
+        self.not_found_error = LookupError
+        self.path = path
+        self.database = SQLiteDatabase(path)
+
+    def worker(self) -> "SQLiteBackend":
+        # Its own connection to the same file, as another worker process would have
+        return SQLiteBackend(self.path)
+
+    def close(self):
+        self.database.conn.close()
+
+    def commit_turn(self, conversation_id: str, turn: int, updates=None, increments=None, asked_question_id=None):
+        user_message, assistant_message = turn_messages(turn)
+        return asyncio.run(self.database.conversations.commit_turn(
+            conversation_id, user_message, assistant_message, updates or {}, increments or {}, asked_question_id
+        ))
+
+    def create_conversation(self) -> str:
+        async def create():
+            student = await self.database.students.create({"name": "Test Student"})
+            conversation = await self.database.conversations.create({
+                "student_id": student["id"], "phase": "gpa_questions",
+                "factual_questions_count": 0, "questions_asked_ids": []
+            })
+            return conversation["id"]
+        return asyncio.run(create())
+
+    def messages(self, conversation_id: str):
+        return [(m["seq"], m["role"], m["content"]) for m in asyncio.run(self.database.messages.history(conversation_id))]
+
+    def conversation(self, conversation_id: str):
+        return asyncio.run(self.database.conversations.get(conversation_id))
+
+
+def check_commit(backend) -> list:
+    problems = []
+    conversation_id = backend.create_conversation()
+
+    result = backend.commit_turn(
+        conversation_id, 0,
+        updates={"phase": "factual_questions", "student_topics": ["cnn", "nlp"], "factual_plan": [{"question_id": 7}]},
+        increments={"factual_questions_count": 1},
+        asked_question_id=7
+    )
+    result = backend.commit_turn(conversation_id, 1, increments={"factual_questions_count": 1}, asked_question_id=12)
+
+    stored = backend.messages(conversation_id)
+    if [(seq, role) for seq, role, _ in stored] != [(1, "user"), (2, "assistant"), (3, "user"), (4, "assistant")]:
+        problems.append(f"messages stored as {stored}")
+    if (result["user_message"]["seq"], result["assistant_message"]["seq"]) != (3, 4):
+        problems.append(f"returned seq {result['user_message']['seq']}, {result['assistant_message']['seq']}")
+    if result["user_message"]["metadata"] != {"paste_count": 0}:
+        problems.append(f"user metadata stored as {result['user_message']['metadata']}")
+
+    conversation = result["conversation"]
+    expected = {
+        "phase": "factual_questions",
+        "factual_questions_count": 2,
+        "questions_asked_ids": [7, 12],
+        "student_topics": ["cnn", "nlp"],
+        "factual_plan": [{"question_id": 7}],
+    }
+    for column, value in expected.items():
+        if conversation.get(column) != value:
+            problems.append(f"conversation.{column} is {json.dumps(conversation.get(column))}, expected {json.dumps(value)}")
+    return problems
+
+
+def check_atomic(backend) -> list:
+    conversation_id = backend.create_conversation()
+    before = backend.conversation(conversation_id)
+    try:
+        backend.commit_turn(conversation_id, 0, updates={"phase": "factual_questions", "no_such_column": 1},
+                            increments={"factual_questions_count": 1})
+        return ["a turn with an unknown column was committed"]
+    except Exception:
+        pass
+
+    problems = []
+    if backend.messages(conversation_id):
+        problems.append("failed turn left messages behind")
+    if backend.conversation(conversation_id) != before:
+        problems.append("failed turn changed the conversation")
+    return problems
+
+
+def check_missing_conversation(backend) -> list:
+    # The nil UUID, as SupabaseDatabase.check_schema sends it
+    conversation_id = "00000000-0000-0000-0000-000000000000"
+    try:
+        backend.commit_turn(conversation_id, 0, increments={"factual_questions_count": 1})
+        return ["a turn for a missing conversation was committed"]
+    except backend.not_found_error:
+        pass
+    except Exception as e:
+        return [f"a turn for a missing conversation failed with {type(e).__name__}: {e}"]
+    if backend.messages(conversation_id):
+        return ["a turn for a missing conversation left messages behind"]
+    return []
+
+
+def check_concurrent(backend, n: int) -> list:
+    """n turns of one conversation committed from n connections at once"""
+    conversation_id = backend.create_conversation()
+    errors = []
+
+    def worker(turn: int):
+        try:
+            worker_backend = backend.worker()
+            try:
+                worker_backend.commit_turn(conversation_id, turn, increments={"factual_questions_count": 1},
+                                           asked_question_id=turn)
+            finally:
+                worker_backend.close()
+        except Exception as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker, args=(turn,)) for turn in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    problems = [f"concurrent commit failed: {e}" for e in errors[:3]]
+    stored = backend.messages(conversation_id)
+    if [seq for seq, _, _ in stored] != list(range(1, 2 * n + 1)):
+        problems.append(f"seq numbers after {n} concurrent turns: {[seq for seq, _, _ in stored]}")
+    # Each turn's two messages are adjacent: turns commit one at a time
+    for (_, role_a, content_a), (_, role_b, content_b) in zip(stored[::2], stored[1::2]):
+        if role_a != "user" or role_b != "assistant" or int(content_a.split()[1]) + 1 != int(content_b.split()[1]):
+            problems.append(f"interleaved turns: {content_a!r} followed by {content_b!r}")
+            break
+
+    conversation = backend.conversation(conversation_id)
+    count, asked = conversation["factual_questions_count"], conversation["questions_asked_ids"] or []
+    if count != n or sorted(asked) != list(range(n)):
+        problems.append(f"lost updates: factual_questions_count {count}, {len(asked)} asked questions (expected {n})")
+    return problems
+
+
+def run_checks(backend, concurrent: int) -> list:
+    problems = []
+    for name, check in [
+        ("commit", lambda: check_commit(backend)),
+        ("atomicity", lambda: check_atomic(backend)),
+        (f"{concurrent} concurrent turns", lambda: check_concurrent(backend, concurrent)),
+        ("missing conversation", lambda: check_missing_conversation(backend)),
+    ]:
+        found = check()
+        print(f"{'✓' if not found else '❌'} {backend.label}: {name}")
+        problems += [f"{backend.label}: {problem}" for problem in found]
+    return problems
+
+
+def run_sqlite(concurrent: int) -> list:
+    backend = SQLiteBackend(os.path.join(tempfile.mkdtemp(prefix="commit-turn-"), "test.sqlite3"))
+    try:
+        return run_checks(backend, concurrent)
+    finally:
+        backend.close()
+
+
+def run_postgres(database_url: str, concurrent: int) -> list:
+    schema = f"test_commit_turn_{uuid.uuid4().hex[:8]}"
+    with connect(database_url, "public") as admin:
+        admin.execute(f"CREATE SCHEMA {schema}")
+    print(f"Applying schema to {schema}...")
+
+    try:
+        backend = PostgresBackend(database_url, schema)
+        try:
+            for path in SCHEMA_FILES:
+                with open(path) as f:
+                    backend.conn.execute(f.read())
+            return run_checks(backend, concurrent)
+        finally:
+            backend.close()
+    finally:
+        with connect(database_url, "public") as admin:
+            admin.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+@contextlib.contextmanager
+def local_postgres():
+    """URL of a throwaway Postgres server (pgserver), stopped and deleted afterwards"""
+    import pgserver
+
+    server = pgserver.get_server(tempfile.mkdtemp(prefix="commit-turn-postgres-"), cleanup_mode="delete")
+    try:
+        yield server.get_uri()
+    finally:
+        server.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Postgres to test the commit_turn function in (default: DATABASE_URL; "
+                             "a throwaway local server if unset)")
+    parser.add_argument("--concurrent", type=int, default=20, help="turns committed at once in the concurrency check")
+    parser.add_argument("--sqlite-only", action="store_true", help="skip the Postgres function")
+    args = parser.parse_args()
+
+    problems = run_sqlite(args.concurrent)
+
+    # A given database needs only the driver; otherwise pgserver starts one
+    required = ["psycopg"] if args.database_url else ["psycopg", "pgserver"]
+    missing = [module for module in required if importlib.util.find_spec(module) is None]
+    if args.sqlite_only:
+        print("⏭️ Postgres: skipped (--sqlite-only)")
+    elif missing:
+        problems.append(f"Postgres: {' and '.join(missing)} not installed (pip install -r requirements-dev.txt), "
+                        f"or pass --sqlite-only")
+    elif args.database_url:
+        problems += run_postgres(args.database_url, args.concurrent)
+    else:
+        print("Starting a local Postgres server...")
+        with local_postgres() as database_url:
+            problems += run_postgres(database_url, args.concurrent)
+
+    print("-" * 60)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        raise SystemExit(1)
+    print("✓ commit_turn is atomic and keeps seq, counters and asked questions consistent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,691 @@
+"""
+Concurrency test: many interviews running through one worker at the same time
+Drives N complete interviews (start, greeting, both projects, GPA, factual questions, wrap-up)
+concurrently through the FastAPI app in-process. OpenAI, ElevenLabs and Supabase are replaced
+with in-memory async fakes that add realistic latency, so no keys or network are needed.
+With --database sqlite the app runs on the local SQLite backend (repositories.py) instead of
+the fake Supabase client, in a throwaway file.
+
+Checks that:
+- turns interleave (wall time is close to one interview, not N of them; many LLM calls in flight)
+- no cross-talk: every stored reply belongs to its own conversation, messages alternate correctly
+- every interview reaches interview_complete
+- every turn's audio (GET /audio/{audio_id}) is the reply for that same candidate, and is then
+  persisted: messages.audio_url is filled and serves byte ranges
+- the session cache ends up matching the database (history and conversation row), though turns didn't re-read
+  it, including after messages were written by someone else (seq gap) or the cached session was lost
+- audio comes in the format each interview negotiated (default, ?audio_format=mp3_low, X-Audio-Format: pcm)
+
+With --stream the turns go through the SSE endpoint and time-to-first-token is reported too.
+The app is then served by uvicorn on a local port, since the in-process transport buffers whole responses.
+
+Usage: python test_concurrency.py [--conversations 50] [--llm-latency 0.3] [--stream] [--database sqlite]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import operator
+import uuid
+import random
+import asyncio
+import argparse
+import itertools
+import tempfile
+import contextlib
+
+# Local embeddings and a throwaway cache/index, set before the app modules read their config
+_tmp = tempfile.mkdtemp(prefix="interview-concurrency-")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ELEVENLABS_API_KEY", "test")
+os.environ["EMBEDDING_PROVIDER"] = "hashing"
+os.environ["CACHE_DIR"] = os.path.join(_tmp, "cache")
+os.environ["QUESTION_INDEX_DIR"] = os.path.join(_tmp, "question_index")
+os.environ["AUDIO_STORAGE"] = "local"
+os.environ["AUDIO_STORAGE_DIR"] = os.path.join(_tmp, "audio_files")
+
+import httpx
+from postgrest.exceptions import APIError
+
+import main
+import conversation
+from repositories import Database, SupabaseDatabase, SQLiteDatabase
+import evaluation
+import knowledge_base
+
+NAME_PATTERN = re.compile(r"Candidate(\d+)")
+
+
+class Stats:
+    llm_in_flight = 0
+    llm_max_in_flight = 0
+    llm_calls = 0
+    db_calls = 0
+    first_audio_times = []
+    audio_problems = []
+
+
+# ---------------------------------------------------------------------------
+# Fake OpenAI
+# ---------------------------------------------------------------------------
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeChoice:
+    def __init__(self, content):
+        self.message = FakeMessage(content)
+
+
+class FakeCompletion:
+    def __init__(self, content):
+        self.choices = [FakeChoice(content)]
+
+
+class FakeDelta:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeChunkChoice:
+    def __init__(self, content):
+        self.delta = FakeDelta(content)
+
+
+class FakeChunk:
+    def __init__(self, content):
+        self.choices = [FakeChunkChoice(content)]
+
+
+# Share of the reply latency spent before the first token when streaming
+FIRST_TOKEN_SHARE = 0.25
+
+
+class FakeCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    @staticmethod
+    def _reply(messages, response_format) -> str:
+        if response_format:
+            return json.dumps({"score": 6, "correctness": "partially_correct", "recommendations": []})
+
+        prompt = "\n".join(m["content"] for m in messages)
+        if "comma-separated list of broad ML topics" in prompt:
+            return "Computer Vision, Ensemble Methods, Model Evaluation & Metrics"
+
+        # Echo whose conversation this is; a request carrying more than one candidate is cross-talk
+        names = set(NAME_PATTERN.findall(prompt))
+        tag = ",".join(sorted(names))
+        return (f"Thanks Candidate{tag}, that was a clear answer with useful detail. "
+                f"Can you tell me more about how you evaluated that approach?")
+
+    async def create(self, model, messages, response_format=None, stream=False, **kwargs):
+        Stats.llm_calls += 1
+        reply = self._reply(messages, response_format)
+        latency = self.latency * random.uniform(0.5, 1.5)
+
+        if stream:
+            await asyncio.sleep(latency * FIRST_TOKEN_SHARE)
+            return self._stream(reply, latency * (1 - FIRST_TOKEN_SHARE))
+
+        Stats.llm_in_flight += 1
+        Stats.llm_max_in_flight = max(Stats.llm_max_in_flight, Stats.llm_in_flight)
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            Stats.llm_in_flight -= 1
+        return FakeCompletion(reply)
+
+    async def _stream(self, reply, remaining):
+        Stats.llm_in_flight += 1
+        Stats.llm_max_in_flight = max(Stats.llm_max_in_flight, Stats.llm_in_flight)
+        try:
+            words = reply.split(" ")
+            for i, word in enumerate(words):
+                yield FakeChunk(word if i == 0 else " " + word)
+                await asyncio.sleep(remaining / len(words))
+        finally:
+            Stats.llm_in_flight -= 1
+
+
+class FakeChat:
+    def __init__(self, latency):
+        self.completions = FakeCompletions(latency)
+
+
+class FakeOpenAI:
+    def __init__(self, latency):
+        self.chat = FakeChat(latency)
+
+
+# ---------------------------------------------------------------------------
+# Fake ElevenLabs
+# ---------------------------------------------------------------------------
+
+class FakeTextToSpeech:
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def convert(self, voice_id, text, **kwargs):
+        for i in range(0, len(text), 40):
+            await asyncio.sleep(self.latency / max(1, len(text) // 40))
+            yield text[i:i + 40].encode("utf-8")
+
+
+class FakeElevenLabs:
+    def __init__(self, latency):
+        self.text_to_speech = FakeTextToSpeech(latency)
+
+
+# ---------------------------------------------------------------------------
+# Fake Supabase (async client, only the query builder calls the app uses)
+# ---------------------------------------------------------------------------
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+# Foreign keys the fake can embed through: (table, embedded table) -> (column, embedded column, single row?)
+EMBEDS = {
+    ("students", "resume_sections"): ("id", "student_id", False),
+    ("conversations", "students"): ("student_id", "id", True),
+}
+
+
+def parse_embeds(columns: str) -> dict:
+    """Embedded resources in a PostgREST select string, {table: inner select} ("*, students(name)" -> {"students": "name"})"""
+    embeds = {}
+    depth = 0
+    start = 0
+    for i, char in enumerate(columns):
+        if char == "(":
+            if depth == 0:
+                name, inner_start = columns[start:i].strip(), i + 1
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                embeds[name] = columns[inner_start:i]
+        elif char == "," and depth == 0:
+            start = i + 1
+    return embeds
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.columns = "*"
+        self.filters = []
+        self.order_by = None
+        self.action = "select"
+        self.payload = None
+        self.single_row = False
+        self.limit_rows = None
+
+    def select(self, *columns):
+        self.action = "select"
+        self.columns = ", ".join(columns) or "*"
+        return self
+
+    def insert(self, payload):
+        self.action = "insert"
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.action = "update"
+        self.payload = payload
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, operator.eq, value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append((column, operator.gt, value))
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count):
+        self.limit_rows = count
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def _matches(self, row):
+        return all(op(row.get(column), value) for column, op, value in self.filters)
+
+    async def execute(self):
+        Stats.db_calls += 1
+        await asyncio.sleep(self.db.latency * random.uniform(0.5, 1.5))
+        rows = self.db.tables.setdefault(self.table, [])
+
+        if self.action == "insert":
+            new_rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            return FakeResponse([self.db.insert_row(self.table, row) for row in new_rows])
+
+        matched = [row for row in rows if self._matches(row)]
+
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+            return FakeResponse([dict(row) for row in matched])
+
+        if self.order_by:
+            column, desc = self.order_by
+            matched.sort(key=lambda row: row[column], reverse=desc)
+        data = [self.db.embed(self.table, row, self.columns) for row in matched[:self.limit_rows]]
+        if self.single_row:
+            return FakeResponse(data[0] if data else None)
+        return FakeResponse(data)
+
+
+class FakeRpc:
+    def __init__(self, db, name, params):
+        self.db = db
+        self.name = name
+        self.params = params
+
+    async def execute(self):
+        Stats.db_calls += 1
+        await asyncio.sleep(self.db.latency * random.uniform(0.5, 1.5))
+        return FakeResponse(getattr(self.db, self.name)(**self.params))
+
+
+class FakeSupabase:
+    def __init__(self, latency):
+        self.latency = latency
+        self.tables = {}
+        self.clock = itertools.count()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def embed(self, table, row, columns):
+        """Copy of the row with the embedded resources from the select string attached"""
+        row = dict(row)
+        for name, inner in parse_embeds(columns).items():
+            column, embedded_column, single = EMBEDS[(table, name)]
+            children = [self.embed(name, r, inner) for r in self.tables.get(name, []) if r.get(embedded_column) == row[column]]
+            row[name] = (children[0] if children else None) if single else children
+        return row
+
+    def insert_row(self, table, row):
+        rows = self.tables.setdefault(table, [])
+        row = {"id": str(uuid.uuid4()), "created_at": next(self.clock), **row}
+        if table == "messages":
+            # What the messages_assign_seq trigger does
+            row["seq"] = 1 + max((m["seq"] for m in rows if m["conversation_id"] == row["conversation_id"]), default=0)
+        rows.append(row)
+        return dict(row)
+
+    def commit_turn(self, p_conversation_id, p_user_message, p_assistant_message,
+                    p_updates=None, p_increments=None, p_asked_question_id=None):
+        """What the commit_turn database function does (atomic here: nothing else runs in between)"""
+        conversation = next((c for c in self.tables.get("conversations", []) if c["id"] == p_conversation_id), None)
+        if conversation is None:
+            raise APIError({"code": "P0002", "message": f"Conversation {p_conversation_id} not found"})
+        p_updates, p_increments = p_updates or {}, p_increments or {}
+        user_message = self.insert_row("messages", {"conversation_id": p_conversation_id, "role": "user", **p_user_message})
+        assistant_message = self.insert_row(
+            "messages", {"conversation_id": p_conversation_id, "role": "assistant", **p_assistant_message}
+        )
+        conversation.update(p_updates)
+        for column, amount in p_increments.items():
+            conversation[column] = (conversation.get(column) or 0) + amount
+        if p_asked_question_id is not None:
+            conversation["questions_asked_ids"] = (conversation.get("questions_asked_ids") or []) + [p_asked_question_id]
+        return {"conversation": dict(conversation), "user_message": user_message, "assistant_message": assistant_message}
+
+
+# ---------------------------------------------------------------------------
+# Scenario
+# ---------------------------------------------------------------------------
+
+async def seed_students(database: Database, n: int):
+    students = []
+    for i in range(n):
+        student_id = (await database.students.create({"name": f"Candidate{i} Example", "gpa": 8.5}))["id"]
+        sections = {
+            "Projects": f"Image classifier {i} with CNNs and data augmentation. Churn model with XGBoost.",
+            "Technical Skills": "Python, PyTorch, scikit-learn",
+            "Education": "B.Tech Computer Science, GPA 8.5",
+            "_top_projects": json.dumps([
+                {"title": f"Image classifier {i}", "content": "CNN on a custom dataset with augmentation"},
+                {"title": f"Churn model {i}", "content": "XGBoost with SHAP explanations"}
+            ])
+        }
+        await database.resume_sections.add(student_id, sections)
+        students.append(student_id)
+    return students
+
+
+# Interviews rotate through these (query parameter, headers, expected content type)
+AUDIO_FORMAT_REQUESTS = [
+    ({}, {}, "audio/mpeg"),
+    ({"audio_format": "mp3_low"}, {}, "audio/mpeg"),
+    ({}, {"X-Audio-Format": "pcm"}, "audio/wav"),
+]
+
+
+async def fetch_audio(client: httpx.AsyncClient, audio_id: str, start: float = None):
+    """(content type, a turn's whole audio); with start, records the time from it to the first audio byte"""
+    chunks = []
+    async with client.stream("GET", f"/audio/{audio_id}") as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            if start is not None and not chunks:
+                Stats.first_audio_times.append(time.perf_counter() - start)
+            chunks.append(chunk)
+    return response.headers.get("content-type"), b"".join(chunks)
+
+
+def check_audio(index: int, turn: int, fetched):
+    content_type, audio = fetched
+    expected_type = AUDIO_FORMAT_REQUESTS[index % len(AUDIO_FORMAT_REQUESTS)][2]
+    if content_type != expected_type or (expected_type == "audio/wav" and not audio.startswith(b"RIFF")):
+        Stats.audio_problems.append(f"Candidate{index}: turn {turn} audio is {content_type}, expected {expected_type}")
+
+    # The fake TTS returns the text it was given, so the audio must name this candidate and no other
+    names = set(NAME_PATTERN.findall(audio.decode("utf-8", errors="ignore")))
+    if names != {str(index)}:
+        Stats.audio_problems.append(f"Candidate{index}: turn {turn} audio is for Candidate{','.join(sorted(names))}")
+
+
+async def stream_turn(client: httpx.AsyncClient, conversation_id: str, payload: dict, params: dict, headers: dict):
+    """
+    One turn through the SSE endpoint: (response body like the JSON endpoint's, seconds to first token,
+    task fetching the audio, which starts as soon as its id arrives)
+    """
+    body = {}
+    first_token = None
+    audio = None
+    start = time.perf_counter()
+
+    async with client.stream(
+        "POST", f"/continue-conversation/{conversation_id}/stream", json=payload, params=params, headers=headers
+    ) as response:
+        response.raise_for_status()
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+                if event == "token" and first_token is None:
+                    first_token = time.perf_counter() - start
+                elif event == "audio":
+                    audio = asyncio.create_task(fetch_audio(client, data["audio_id"], start))
+                elif event == "error":
+                    raise RuntimeError(data["detail"])
+                elif event in ("message", "metadata"):
+                    body.update(data)
+
+    return body, first_token, audio
+
+
+OUT_OF_BAND = "Out-of-band"
+
+
+async def disturb_session(database: Database, index: int, conversation_id: str):
+    """
+    Between two turns, every 5th interview gets an exchange written behind this worker's back (as
+    another worker or tab would), and the next one loses its cached session (as after a restart)
+    """
+    from session_cache import get_session_cache
+
+    if index % 5 == 0:
+        for role in ("user", "assistant"):
+            await database.messages.add(conversation_id, role, f"{OUT_OF_BAND} {role} message")
+    elif index % 5 == 1:
+        await get_session_cache().delete(conversation_id)
+
+
+async def run_interview(
+    client: httpx.AsyncClient, database: Database, index: int, student_id: str, max_turns: int, stream: bool
+):
+    """One candidate: start, say they're ready, then answer until the interview completes"""
+    turn_times = []
+    first_token_times = []
+    params, headers, _ = AUDIO_FORMAT_REQUESTS[index % len(AUDIO_FORMAT_REQUESTS)]
+
+    start = time.perf_counter()
+    response = await client.post(f"/start-conversation/{student_id}", params=params, headers=headers)
+    response.raise_for_status()
+    turn_times.append(time.perf_counter() - start)
+    conversation_id = response.json()["conversation_id"]
+    check_audio(index, 0, await fetch_audio(client, response.json()["audio_id"]))
+
+    message = "I'm ready"
+    for turn in range(max_turns):
+        payload = {"message": f"Candidate{index} answer {turn}: {message}", "response_time_seconds": 12}
+        start = time.perf_counter()
+        if stream:
+            body, first_token, audio = await stream_turn(client, conversation_id, payload, params, headers)
+            first_token_times.append(first_token)
+        else:
+            response = await client.post(
+                f"/continue-conversation/{conversation_id}", json=payload, params=params, headers=headers
+            )
+            response.raise_for_status()
+            body = response.json()
+            audio = fetch_audio(client, body["audio_id"])
+        turn_times.append(time.perf_counter() - start)
+        check_audio(index, turn + 1, await audio)
+
+        if body.get("interview_complete"):
+            return conversation_id, True, turn_times, first_token_times
+        if turn == 2:
+            await disturb_session(database, index, conversation_id)
+        message = "Here is my answer with some details"
+
+    return conversation_id, False, turn_times, first_token_times
+
+
+@contextlib.asynccontextmanager
+async def app_client(stream: bool):
+    """In-process client, or a real local server when tokens have to arrive as they're generated"""
+    if not stream:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+            yield client
+        return
+
+    import uvicorn
+
+    # Lifespan off: the startup hook would replace the test database with the configured one
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None, limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await serve
+
+
+async def check_conversation(database: Database, index: int, conversation_id: str) -> list:
+    """Problems found in one conversation's stored messages"""
+    problems = []
+    messages = await database.messages.for_conversation(conversation_id)
+
+    for previous, current in zip(messages, messages[1:]):
+        if previous["role"] == current["role"]:
+            problems.append(f"two consecutive {current['role']} messages")
+
+    for m in messages:
+        names = set(NAME_PATTERN.findall(m["content"]))
+        if names and names != {str(index)}:
+            problems.append(f"{m['role']} message mentions Candidate{','.join(sorted(names))}")
+
+    return problems
+
+
+async def check_persisted_audio(client: httpx.AsyncClient, database: Database, conversation_ids: list) -> list:
+    """Problems with stored audio: assistant messages without audio_url, or URLs that don't serve ranges"""
+    # Background persistence of the very last turns may still be finishing
+    for _ in range(100):
+        conversations = await asyncio.gather(*(database.messages.for_conversation(c) for c in conversation_ids))
+        assistant = [
+            m for messages in conversations for m in messages
+            if m["role"] == "assistant" and not m["content"].startswith(OUT_OF_BAND)
+        ]
+        missing = [m for m in assistant if not m.get("audio_url")]
+        if not missing:
+            break
+        await asyncio.sleep(0.05)
+    else:
+        return [f"{len(missing)} of {len(assistant)} assistant messages have no audio_url"]
+
+    problems = []
+    for m in random.sample(assistant, min(10, len(assistant))):
+        response = await client.get(m["audio_url"], headers={"Range": "bytes=0-9"})
+        if response.status_code != 206 or len(response.content) != 10:
+            problems.append(f"{m['audio_url']}: range request returned {response.status_code}, {len(response.content)} bytes")
+        elif "immutable" not in response.headers.get("cache-control", ""):
+            problems.append(f"{m['audio_url']}: stored audio is served without long cache headers")
+        elif m["audio_url"].endswith(".wav"):
+            # Stored WAV carries its real length, not the streaming placeholder
+            full = await client.get(m["audio_url"])
+            if int.from_bytes(full.content[40:44], "little") != len(full.content) - 44:
+                problems.append(f"{m['audio_url']}: WAV header size doesn't match the data")
+    return problems
+
+
+async def check_session(conversation_id: str) -> list:
+    """Problems with the cached session compared to one rebuilt from the database"""
+    from session_cache import take_session
+
+    cached = await take_session(conversation_id)
+    if cached is None:
+        return ["no cached session after the last turn"]
+    fresh = await main.load_session(conversation_id)
+
+    problems = []
+    if cached["message_history"] != fresh["message_history"]:
+        problems.append(f"cached history ({len(cached['message_history'])} messages) differs from the database "
+                        f"({len(fresh['message_history'])})")
+    stale = [k for k, v in fresh["conversation"].items() if k in cached["conversation"] and cached["conversation"][k] != v]
+    if stale:
+        problems.append(f"cached conversation row differs in {', '.join(stale)}")
+    return problems
+
+
+async def run(
+    n: int, llm_latency: float, tts_latency: float, db_latency: float, max_turns: int, stream: bool, database_backend: str
+) -> bool:
+    if database_backend == "sqlite":
+        database = SQLiteDatabase(os.path.join(_tmp, "interviews.sqlite3"))
+    else:
+        database = SupabaseDatabase(FakeSupabase(db_latency))
+    fake_openai = FakeOpenAI(llm_latency)
+    conversation.openai_client = fake_openai
+    conversation.elevenlabs_client = FakeElevenLabs(tts_latency)
+    evaluation.openai_client = fake_openai
+    knowledge_base.async_openai_client = fake_openai
+    main.database = database
+    await database.check_schema()
+
+    students = await seed_students(database, n)
+    Stats.db_calls = 0
+
+    print("=" * 80)
+    db_description = "local SQLite" if database_backend == "sqlite" else f"DB ~{db_latency * 1000:.0f}ms"
+    print(f"Concurrency test: {n} interviews{' (streaming)' if stream else ''} "
+          f"(LLM ~{llm_latency}s, TTS ~{tts_latency}s, {db_description})")
+    print("=" * 80)
+
+    main.load_question_index_on_startup()
+
+    async with app_client(stream) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            run_interview(client, database, i, student_id, max_turns, stream) for i, student_id in enumerate(students)
+        ))
+        wall = time.perf_counter() - start
+        db_calls = Stats.db_calls
+        audio_problems = await check_persisted_audio(client, database, [conversation_id for conversation_id, _, _, _ in results])
+
+    all_turns = [t for _, _, times, _ in results for t in times]
+    first_tokens = [t for _, _, _, times in results for t in times if t is not None]
+    serial_estimate = sum(all_turns)
+    slowest_interview = max(sum(times) for _, _, times, _ in results)
+
+    problems = []
+    for i, (conversation_id, completed, _, _) in enumerate(results):
+        if not completed:
+            problems.append(f"Candidate{i}: interview did not complete in {max_turns} turns")
+        problems += [f"Candidate{i}: {p}" for p in await check_conversation(database, i, conversation_id)]
+    problems += Stats.audio_problems + audio_problems
+
+    print(f"Turns:                       {len(all_turns)} ({len(all_turns) / n:.0f} per interview)")
+    if database_backend == "sqlite":
+        print(f"LLM calls:                   {Stats.llm_calls}")
+    else:
+        print(f"LLM calls / DB queries:      {Stats.llm_calls} / {db_calls}")
+    print(f"Max LLM calls in flight:     {Stats.llm_max_in_flight}")
+    print(f"Mean turn latency:           {serial_estimate / len(all_turns) * 1000:.0f}ms")
+    if first_tokens:
+        print(f"Mean time to first token:    {sum(first_tokens) / len(first_tokens) * 1000:.0f}ms")
+    if Stats.first_audio_times:
+        print(f"Mean time to first audio:    {sum(Stats.first_audio_times) / len(Stats.first_audio_times) * 1000:.0f}ms")
+    print(f"Wall time:                   {wall:.1f}s")
+    print(f"Slowest single interview:    {slowest_interview:.1f}s")
+    print(f"Sum of all turn latencies:   {serial_estimate:.1f}s (what a blocked event loop would cost)")
+
+    for i, (conversation_id, _, _, _) in enumerate(results):
+        problems += [f"Candidate{i}: {p}" for p in await check_session(conversation_id)]
+
+    interleaved = Stats.llm_max_in_flight >= n // 2 and wall < serial_estimate / 5
+    if not interleaved:
+        problems.append("turns did not interleave: the event loop is being blocked")
+
+    print("-" * 80)
+    if problems:
+        for problem in problems[:20]:
+            print(f"❌ {problem}")
+        return False
+
+    print("✓ All interviews completed, turns interleaved, no cross-talk between conversations (text or audio)")
+    return True
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--tts-latency", type=float, default=0.1)
+    parser.add_argument("--db-latency", type=float, default=0.01)
+    parser.add_argument("--max-turns", type=int, default=40)
+    parser.add_argument("--stream", action="store_true", help="use the SSE streaming endpoint")
+    parser.add_argument("--database", choices=["fake", "sqlite"], default="fake",
+                        help="fake Supabase client (with --db-latency), or the local SQLite backend")
+    args = parser.parse_args()
+
+    ok = asyncio.run(run(args.conversations, args.llm_latency, args.tts_latency, args.db_latency,
+                         args.max_turns, args.stream, args.database))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,4 +1,16 @@
+"""
+TTS model benchmark: time to first byte and total synthesis time per ElevenLabs model
+Synthesizes the same texts with every model (several runs each), saves one sample per model,
+and prints median / p90 TTFB and total time plus the per-character generation time
+that tts_router.py's MODEL_PRIORS are based on.
+
+Usage: python test_models.py [--runs 3] [--no-play]
+"""
+
 import os
+import time
+import argparse
+import statistics
 from elevenlabs import ElevenLabs, VoiceSettings
 from dotenv import load_dotenv
 
@@ -9,6 +21,14 @@ VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
 
 test_text = "Hello! I'm Raj, your interviewer for today. It's great to meet you!"
 
+# Typical interviewer sentences, short to long
+benchmark_texts = [
+    test_text,
+    "That's right, dropout randomly zeroes activations during training so the network can't rely on any single unit.",
+    "Alright, let's talk about your other project. Can you walk me through what the recommender system does, "
+    "how you built the training data, and how you measured whether it was actually helping users?",
+]
+
 # Test different models
 models = [
     "eleven_monolingual_v1",
@@ -17,41 +37,97 @@ models = [
     "eleven_turbo_v2"
 ]
 
-print(f"Testing Voice ID: {VOICE_ID}\n")
-print("=" * 80)
-
-for model_id in models:
-    print(f"\nTesting model: {model_id}")
-    try:
-        audio = elevenlabs_client.text_to_speech.convert(
-            voice_id=VOICE_ID,
-            text=test_text,
-            model_id=model_id,
-            voice_settings=VoiceSettings(
-                stability=0.5,
-                similarity_boost=0.75,
-                style=0.0,
-                use_speaker_boost=True
-            )
+
+def synthesize(model_id: str, text: str, output_file: str = None):
+    """(seconds to first byte, total seconds) for one synthesis"""
+    start = time.perf_counter()
+    first_byte = None
+
+    audio = elevenlabs_client.text_to_speech.convert(
+        voice_id=VOICE_ID,
+        text=text,
+        model_id=model_id,
+        voice_settings=VoiceSettings(
+            stability=0.5,
+            similarity_boost=0.75,
+            style=0.0,
+            use_speaker_boost=True
         )
+    )
 
-        output_file = f"test_{model_id}.mp3"
+    chunks = []
+    for chunk in audio:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+
+    if output_file:
         with open(output_file, 'wb') as f:
-            for chunk in audio:
-                f.write(chunk)
+            f.write(b"".join(chunks))
+
+    return first_byte if first_byte is not None else total, total
+
+
+def p90(values):
+    return sorted(values)[max(0, int(round(0.9 * len(values))) - 1)]
 
-        print(f"✅ Success! Saved to: {output_file}")
 
-    except Exception as e:
-        print(f"❌ Error with {model_id}: {e}")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="runs per model and text")
+    parser.add_argument("--no-play", action="store_true", help="don't play the samples afterwards (macOS afplay)")
+    args = parser.parse_args()
+
+    print(f"Testing Voice ID: {VOICE_ID}\n")
+    print("=" * 80)
+
+    results = {}
+    for model_id in models:
+        print(f"\nTesting model: {model_id}")
+        ttfbs, totals, per_char = [], [], []
+        try:
+            # One sample to listen to
+            synthesize(model_id, test_text, output_file=f"test_{model_id}.mp3")
+
+            for _ in range(args.runs):
+                for text in benchmark_texts:
+                    ttfb, total = synthesize(model_id, text)
+                    ttfbs.append(ttfb)
+                    totals.append(total)
+                    per_char.append(max(0.0, total - ttfb) / len(text))
+
+            results[model_id] = (ttfbs, totals, per_char)
+            print(f"✅ Success! Saved to: test_{model_id}.mp3 "
+                  f"(TTFB median {statistics.median(ttfbs) * 1000:.0f}ms, total median {statistics.median(totals) * 1000:.0f}ms)")
+
+        except Exception as e:
+            print(f"❌ Error with {model_id}: {e}")
+
+    print("\n" + "=" * 80)
+    print(f"{'Model':<26}{'TTFB p50':>10}{'TTFB p90':>10}{'Total p50':>11}{'Total p90':>11}{'ms/char':>9}")
+    print("-" * 80)
+    for model_id, (ttfbs, totals, per_char) in results.items():
+        print(f"{model_id:<26}"
+              f"{statistics.median(ttfbs) * 1000:>8.0f}ms{p90(ttfbs) * 1000:>8.0f}ms"
+              f"{statistics.median(totals) * 1000:>9.0f}ms{p90(totals) * 1000:>9.0f}ms"
+              f"{statistics.median(per_char) * 1000:>9.2f}")
+    print(f"\n({args.runs} run(s) x {len(benchmark_texts)} texts per model, "
+          f"{min(map(len, benchmark_texts))}-{max(map(len, benchmark_texts))} characters)")
+
+    if args.no_play:
+        return
+
+    print("\nAll test files generated. Playing them in sequence...\n")
+
+    # Play all files
+    for model_id in models:
+        output_file = f"test_{model_id}.mp3"
+        if os.path.exists(output_file):
+            print(f"\n▶ Playing: {model_id}")
+            os.system(f"afplay {output_file}")
+            print(f"   (File: {output_file})")
 
-print("\n" + "=" * 80)
-print("\nAll test files generated. Playing them in sequence...\n")
 
-# Play all files
-for model_id in models:
-    output_file = f"test_{model_id}.mp3"
-    if os.path.exists(output_file):
-        print(f"\n▶ Playing: {model_id}")
-        os.system(f"afplay {output_file}")
-        print(f"   (File: {output_file})")
+if __name__ == "__main__":
+    main()
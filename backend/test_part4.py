@@ -2,6 +2,7 @@
 Quick test script to verify Part 4 (Factual Questions) is working
 """
 
+import asyncio
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -30,7 +31,7 @@ print("=" * 60)
 # Test 1: Extract student topics
 print("\n1. Extracting Student Topics...")
 print("-" * 60)
-topics = extract_student_topics(test_sections)
+topics = asyncio.run(extract_student_topics(test_sections))
 print(f"✓ Extracted topics: {topics}")
 
 # Test 2: Select relevant questions
@@ -0,0 +1,121 @@
+"""
+Content-Addressed TTS Audio Cache
+Synthesized speech keyed by a hash of everything that determines the audio: the normalized text,
+voice, model, voice settings and output format. Utterances that repeat across candidates or get regenerated
+(transitions, wrap-ups, catalog questions read out verbatim) are served from disk instead of
+costing another ElevenLabs call.
+
+Usage:
+  python tts_cache.py stats
+  python tts_cache.py warm [--file phrases.txt] [--catalog] [--limit N] [--format mp3_22050_32]
+  python tts_cache.py clear
+"""
+
+import os
+import json
+import hashlib
+import argparse
+from typing import Any, Dict, List
+
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+
+_tts_cache = None
+
+
+def get_tts_cache():
+    """Disk-backed LRU bounded by TTS_CACHE_MAX_BYTES (created on first use)"""
+    global _tts_cache
+    if _tts_cache is None:
+        from cache import BlobCache
+        _tts_cache = BlobCache("tts_audio", max_bytes=TTS_CACHE_MAX_BYTES)
+    return _tts_cache
+
+
+def normalize_tts_text(text: str) -> str:
+    """Whitespace-insensitive form of the text (what gets synthesized and hashed)"""
+    return " ".join(text.split())
+
+
+def tts_cache_key(text: str, voice_id: str, model_id: str, voice_settings: Any, output_format: str) -> str:
+    settings = voice_settings.dict() if hasattr(voice_settings, "dict") else dict(voice_settings or {})
+    return hashlib.sha256(json.dumps(
+        [normalize_tts_text(text), voice_id, model_id, settings, output_format], sort_keys=True
+    ).encode("utf-8")).hexdigest()
+
+
+def format_stats(stats: Dict[str, int]) -> str:
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / lookups:.1%}" if lookups else "n/a"
+    return (f"{stats['entries']} clips, {stats['bytes'] / 1024 / 1024:.1f} MB "
+            f"(limit {TTS_CACHE_MAX_BYTES / 1024 / 1024:.0f} MB), "
+            f"{stats['hits']} hits / {stats['misses']} misses, hit rate {hit_rate}")
+
+
+async def warm(phrases: List[str], concurrency: int, output_format: str) -> int:
+    """Synthesize every phrase that isn't cached yet; returns how many were synthesized"""
+    import asyncio
+    from conversation import text_to_speech, strip_markdown, VOICE_ID, TTS_MODEL_ID, TTS_VOICE_SETTINGS
+
+    cache = get_tts_cache()
+    missing = [
+        p for p in phrases
+        if tts_cache_key(strip_markdown(p), VOICE_ID, TTS_MODEL_ID, TTS_VOICE_SETTINGS, output_format) not in cache
+    ]
+    print(f"🔥 Warming TTS cache ({output_format}): {len(missing)} of {len(phrases)} phrase(s) not cached yet")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def synthesize(phrase: str) -> bool:
+        async with semaphore:
+            # Always the best-quality model: warm clips are reused for every candidate
+            return bool(await text_to_speech(phrase, model_id=TTS_MODEL_ID, output_format=output_format))
+
+    results = await asyncio.gather(*(synthesize(p) for p in missing))
+    failed = results.count(False)
+    if failed:
+        print(f"⚠️ {failed} phrase(s) failed to synthesize")
+    return len(results) - failed
+
+
+def main():
+    import asyncio
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["stats", "warm", "clear"])
+    parser.add_argument("--file", help="phrases to pre-synthesize, one per line (whole sentences, as spoken)")
+    parser.add_argument("--catalog", action="store_true", help="also pre-synthesize every catalog question")
+    parser.add_argument("--limit", type=int, default=None, help="synthesize at most this many phrases")
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--format", default=None, help="output format to warm, e.g. mp3_22050_32 (default DEFAULT_AUDIO_FORMAT)")
+    args = parser.parse_args()
+
+    cache = get_tts_cache()
+
+    if args.command == "clear":
+        cache.clear()
+        print("✓ TTS cache cleared")
+        return
+
+    if args.command == "warm":
+        phrases = []
+        if args.file:
+            with open(args.file) as f:
+                phrases += [line.strip() for line in f if line.strip()]
+        if args.catalog:
+            from question_catalog import QUESTIONS
+            phrases += list(QUESTIONS.values())
+        if not phrases:
+            parser.error("warm needs --file and/or --catalog")
+
+        phrases = list(dict.fromkeys(phrases))[:args.limit]
+        from audio_formats import resolve_audio_format
+        synthesized = asyncio.run(warm(phrases, args.concurrency, resolve_audio_format(args.format)))
+        print(f"✓ Synthesized {synthesized} phrase(s)")
+
+    print(f"📊 TTS cache: {format_stats(cache.stats())}")
+
+
+if __name__ == "__main__":
+    main()
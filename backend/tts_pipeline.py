@@ -0,0 +1,127 @@
+"""
+Sentence-Pipelined Text-to-Speech
+The interviewer's reply is split into sentences while the LLM is still streaming it, and each
+complete sentence goes to ElevenLabs straight away (at most TTS_CONCURRENCY calls at a time).
+Segments come back in sentence order, so the first audio is ready about one sentence into
+generation instead of after the whole reply has been generated and then synthesized.
+"""
+
+import os
+import re
+import asyncio
+import functools
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+# Sentences synthesized at once per reply
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "3"))
+# Shorter sentences are joined to the next one: every segment is a round trip, and tiny clips sound clipped
+TTS_MIN_SEGMENT_CHARS = int(os.getenv("TTS_MIN_SEGMENT_CHARS", "40"))
+
+# End of a sentence: . ! or ? (plus closing quotes/brackets) followed by whitespace, or a line break
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+
+
+class SentenceSplitter:
+    """Turns a stream of text deltas into complete sentences"""
+
+    def __init__(self, min_chars: int = TTS_MIN_SEGMENT_CHARS):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        """Sentences completed by this delta (the unfinished tail stays buffered)"""
+        self.buffer += delta
+        sentences = []
+        start = 0
+
+        for match in SENTENCE_END.finditer(self.buffer):
+            sentence = self.buffer[start:match.end()].strip()
+            if len(sentence) >= self.min_chars:
+                sentences.append(sentence)
+                start = match.end()
+
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Whatever is left once the text is complete"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+class SpeechPipeline:
+    """
+    Feed text deltas with add_text() and call close() once the reply is complete. Complete
+    sentences are synthesized in background tasks while segments() yields their audio in order.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str, Optional[str]], Awaitable[Optional[bytes]]] = None,
+        concurrency: int = TTS_CONCURRENCY,
+        output_format: Optional[str] = None
+    ):
+        if synthesize is None:
+            from conversation import text_to_speech
+            synthesize = functools.partial(text_to_speech, output_format=output_format)
+
+        self._synthesize = synthesize
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._splitter = SentenceSplitter()
+        self._pending = deque()
+        self._previous_sentence = None
+        self._closed = False
+        self._changed = asyncio.Event()
+
+    def add_text(self, delta: str):
+        for sentence in self._splitter.feed(delta):
+            self._schedule(sentence)
+
+    def close(self):
+        """No more text: synthesize whatever is left as the last sentence"""
+        for sentence in self._splitter.flush():
+            self._schedule(sentence)
+        self._closed = True
+        self._changed.set()
+
+    def _schedule(self, sentence: str):
+        # The previous sentence is passed as context so intonation carries across segments
+        task = asyncio.create_task(self._run(sentence, self._previous_sentence))
+        self._pending.append(task)
+        self._previous_sentence = sentence
+        self._changed.set()
+
+    async def _run(self, sentence: str, previous_sentence: Optional[str]) -> Optional[bytes]:
+        async with self._semaphore:
+            return await self._synthesize(sentence, previous_sentence)
+
+    async def segments(self) -> AsyncIterator[bytes]:
+        """Audio per sentence, in order, as soon as it's synthesized (failed sentences are skipped)"""
+        try:
+            while True:
+                if self._pending:
+                    head = self._pending[0]
+                    await asyncio.wait([head])
+                    if head.cancelled() or not self._pending or self._pending[0] is not head:
+                        return  # cancelled meanwhile
+                    self._pending.popleft()
+                    audio = head.result()
+                    if audio:
+                        yield audio
+                elif self._closed:
+                    return
+                else:
+                    self._changed.clear()
+                    await self._changed.wait()
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        """Drop outstanding synthesis (the turn failed or the audio is no longer wanted)"""
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+        self._closed = True
+        self._changed.set()
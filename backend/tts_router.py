@@ -0,0 +1,124 @@
+"""
+Latency-Budgeted TTS Model Router
+Tracks observed ElevenLabs latency per model (moving averages of time to first byte and of
+generation time per character) and picks the best-quality model whose predicted time for a
+sentence fits TTS_LATENCY_BUDGET_SECONDS. When the quality model slows down under load,
+synthesis falls back to the turbo models; estimates that haven't been refreshed drift back
+to their priors, so the quality model gets tried again once things calm down.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, List
+
+# Best quality first (eleven_monolingual_v1 is left out: older, English-only and no faster than turbo)
+TTS_MODELS = [m.strip() for m in os.getenv(
+    "TTS_MODELS", "eleven_multilingual_v2,eleven_turbo_v2_5,eleven_turbo_v2"
+).split(",") if m.strip()]
+
+# Longest a sentence may take to synthesize; the first sentence's time is the wait before the interviewer speaks
+TTS_LATENCY_BUDGET_SECONDS = float(os.getenv("TTS_LATENCY_BUDGET_SECONDS", "2.0"))
+# Weight of the newest observation in the moving averages
+TTS_ROUTER_ALPHA = 0.3
+# Half-life of the drift from a stale estimate back to the prior
+TTS_ROUTER_RECOVERY_SECONDS = float(os.getenv("TTS_ROUTER_RECOVERY_SECONDS", "60"))
+
+# Starting estimates (seconds to first byte, seconds per character), from test_models.py runs
+MODEL_PRIORS = {
+    "eleven_multilingual_v2": (0.6, 0.005),
+    "eleven_turbo_v2_5": (0.35, 0.002),
+    "eleven_turbo_v2": (0.3, 0.002),
+    "eleven_monolingual_v1": (0.6, 0.004),
+}
+DEFAULT_PRIOR = (0.8, 0.006)
+
+
+class ModelLatency:
+    """Moving averages for one model"""
+
+    def __init__(self, prior_ttfb: float, prior_per_char: float):
+        self.prior_ttfb = prior_ttfb
+        self.prior_per_char = prior_per_char
+        self.ttfb = prior_ttfb
+        self.per_char = prior_per_char
+        self.updated_at = None
+        self.observations = 0
+
+    def observe(self, ttfb: float, total: float, chars: int):
+        per_char = max(0.0, total - ttfb) / max(1, chars)
+        if self.updated_at is None:
+            self.ttfb, self.per_char = ttfb, per_char
+        else:
+            current_ttfb, current_per_char = self.current()
+            self.ttfb = TTS_ROUTER_ALPHA * ttfb + (1 - TTS_ROUTER_ALPHA) * current_ttfb
+            self.per_char = TTS_ROUTER_ALPHA * per_char + (1 - TTS_ROUTER_ALPHA) * current_per_char
+        self.updated_at = time.monotonic()
+        self.observations += 1
+
+    def current(self):
+        """(ttfb, per_char), relaxed toward the prior the longer it's been since the last observation"""
+        if self.updated_at is None:
+            return self.prior_ttfb, self.prior_per_char
+        weight = 0.5 ** ((time.monotonic() - self.updated_at) / TTS_ROUTER_RECOVERY_SECONDS)
+        return (
+            self.prior_ttfb + (self.ttfb - self.prior_ttfb) * weight,
+            self.prior_per_char + (self.per_char - self.prior_per_char) * weight
+        )
+
+    def predict(self, chars: int) -> float:
+        ttfb, per_char = self.current()
+        return ttfb + per_char * chars
+
+
+class TTSRouter:
+    def __init__(self, models: List[str] = None, budget_seconds: float = TTS_LATENCY_BUDGET_SECONDS):
+        self.models = models or TTS_MODELS
+        self.budget_seconds = budget_seconds
+        self._latency = {m: ModelLatency(*MODEL_PRIORS.get(m, DEFAULT_PRIOR)) for m in self.models}
+        self._lock = threading.Lock()
+
+    def choose(self, text: str) -> str:
+        """Best-quality model predicted to synthesize this text within budget (else the fastest)"""
+        chars = len(text)
+        with self._lock:
+            predictions = {m: self._latency[m].predict(chars) for m in self.models}
+
+        for model in self.models:
+            if predictions[model] <= self.budget_seconds:
+                if model != self.models[0]:
+                    print(f"⚡ TTS router: {model} (predicted {predictions[model]:.2f}s; "
+                          f"{self.models[0]} {predictions[self.models[0]]:.2f}s > budget {self.budget_seconds:.2f}s)")
+                return model
+
+        fastest = min(self.models, key=predictions.get)
+        print(f"⚠️ TTS router: no model fits the {self.budget_seconds:.2f}s budget, using fastest {fastest} ({predictions[fastest]:.2f}s)")
+        return fastest
+
+    def observe(self, model: str, ttfb: float, total: float, chars: int):
+        with self._lock:
+            if model in self._latency:
+                self._latency[model].observe(ttfb, total, chars)
+
+    def observe_failure(self, model: str, chars: int):
+        """A failed call (rate limit, timeout) counts as a very slow one, so the next sentences route around it"""
+        self.observe(model, 2 * self.budget_seconds, 2 * self.budget_seconds, chars)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            current = {m: lat.current() for m, lat in self._latency.items()}
+            return {
+                m: {"ttfb": round(current[m][0], 3), "per_char": round(current[m][1], 5),
+                    "observations": self._latency[m].observations}
+                for m in self.models
+            }
+
+
+_router = None
+
+
+def get_tts_router() -> TTSRouter:
+    global _router
+    if _router is None:
+        _router = TTSRouter()
+    return _router
@@ -1,34 +1,38 @@
 """
 Update database schema for Phase IV
 Run this once to add new columns to conversations table
+(DATABASE_BACKEND=sqlite adds any that are missing to the local database file)
 """
 
-import os
-from supabase import create_client
+import asyncio
 from dotenv import load_dotenv
 
 load_dotenv()
 
-supabase_url = os.getenv("SUPABASE_URL")
-supabase_key = os.getenv("SUPABASE_KEY")
-supabase = create_client(supabase_url, supabase_key)
-
-# Execute SQL to add Phase IV columns
-sql_query = """
-ALTER TABLE conversations
-ADD COLUMN IF NOT EXISTS student_topics TEXT[],
-ADD COLUMN IF NOT EXISTS questions_asked TEXT[],
-ADD COLUMN IF NOT EXISTS project_questions_count INTEGER DEFAULT 0,
-ADD COLUMN IF NOT EXISTS factual_questions_count INTEGER DEFAULT 0;
-"""
+from repositories import connect_database, add_columns_sql
+
+# Phase IV columns to add
+PHASE4_COLUMNS = {
+    "student_topics": "TEXT[]",
+    "questions_asked": "TEXT[]",
+    "project_questions_count": "INTEGER DEFAULT 0",
+    "factual_questions_count": "INTEGER DEFAULT 0",
+    "questions_asked_ids": "INTEGER[]",
+    "question_catalog_version": "TEXT",
+}
+
+
+async def update_schema():
+    database = await connect_database()
+    await database.add_columns("conversations", PHASE4_COLUMNS)
+
 
 try:
-    result = supabase.rpc('exec_sql', {'query': sql_query}).execute()
+    asyncio.run(update_schema())
     print("Schema updated successfully!")
-    print(result)
 except Exception as e:
     print(f"Note: Schema may already exist or direct SQL execution not available.")
     print(f"Please run the SQL manually in Supabase dashboard:")
-    print(sql_query)
+    print(add_columns_sql("conversations", PHASE4_COLUMNS))
 
 print("\nDone!")
@@ -0,0 +1,70 @@
+-- Commit a whole interview turn in one round trip and one transaction: the candidate's message,
+-- the interviewer's reply, and the conversation's phase / counters / asked questions.
+-- Called by the backend as supabase.rpc('commit_turn', ...); requires add_message_seq_schema.sql.
+
+-- Anti-cheat signals on user messages (written by commit_turn)
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS metadata JSONB;
+
+CREATE OR REPLACE FUNCTION commit_turn(
+    p_conversation_id UUID,
+    p_user_message JSONB,                      -- {"content", "phase", "metadata"}
+    p_assistant_message JSONB,                 -- {"content", "phase"}
+    p_updates JSONB DEFAULT '{}'::jsonb,       -- conversation columns set to these values
+    p_increments JSONB DEFAULT '{}'::jsonb,    -- integer columns incremented by these amounts
+    p_asked_question_id INTEGER DEFAULT NULL   -- appended to questions_asked_ids
+) RETURNS JSONB AS $$
+DECLARE
+    v_conversation conversations;
+    v_row JSONB;
+    v_columns TEXT;
+    v_user messages;
+    v_assistant messages;
+BEGIN
+    -- Turns of one conversation commit one at a time (the seq trigger takes the same lock)
+    SELECT * INTO v_conversation FROM conversations WHERE id = p_conversation_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Conversation % not found', p_conversation_id USING ERRCODE = 'no_data_found';
+    END IF;
+
+    INSERT INTO messages (conversation_id, role, content, phase, metadata)
+    VALUES (p_conversation_id, 'user', p_user_message->>'content', p_user_message->>'phase', p_user_message->'metadata')
+    RETURNING * INTO v_user;
+
+    INSERT INTO messages (conversation_id, role, content, phase)
+    VALUES (p_conversation_id, 'assistant', p_assistant_message->>'content', p_assistant_message->>'phase')
+    RETURNING * INTO v_assistant;
+
+    -- New values: the current row, overwritten by p_updates, plus the increments and the appended question
+    v_row := to_jsonb(v_conversation) || p_updates;
+    SELECT v_row || COALESCE(jsonb_object_agg(key, COALESCE((v_row->>key)::INTEGER, 0) + value::INTEGER), '{}'::jsonb)
+    INTO v_row
+    FROM jsonb_each_text(p_increments);
+    IF p_asked_question_id IS NOT NULL THEN
+        v_row := jsonb_set(v_row, '{questions_asked_ids}',
+                           COALESCE(v_row->'questions_asked_ids', '[]'::jsonb) || to_jsonb(p_asked_question_id));
+    END IF;
+
+    -- Write only the columns the turn touched (an unknown column name fails the whole turn)
+    SELECT string_agg(format('%I = ($1).%I', key, key), ', ')
+    INTO v_columns
+    FROM jsonb_object_keys(
+        p_updates || p_increments
+        || CASE WHEN p_asked_question_id IS NULL THEN '{}'::jsonb ELSE '{"questions_asked_ids": null}'::jsonb END
+    ) AS key;
+
+    IF v_columns IS NOT NULL THEN
+        EXECUTE format('UPDATE conversations SET %s WHERE id = $2 RETURNING *', v_columns)
+        INTO v_conversation
+        USING jsonb_populate_record(v_conversation, v_row), p_conversation_id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'conversation', to_jsonb(v_conversation),
+        'user_message', to_jsonb(v_user),
+        'assistant_message', to_jsonb(v_assistant)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comment
+COMMENT ON FUNCTION commit_turn IS 'Atomically stores both messages of a turn and applies the conversation updates; returns the new rows';
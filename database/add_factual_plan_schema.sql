@@ -0,0 +1,7 @@
+-- Store the whole factual-question plan computed at the gpa_questions -> factual_questions transition
+
+ALTER TABLE conversations
+ADD COLUMN IF NOT EXISTS factual_plan JSONB; -- Ordered [{question_id, similarity_score, max_similarity}], questions then alternates
+
+-- Add comment
+COMMENT ON COLUMN conversations.factual_plan IS 'Planned factual questions (catalog IDs) followed by ranked alternates; each turn asks the first unasked entry';
@@ -0,0 +1,34 @@
+-- Monotonic per-conversation sequence number for messages: history is ordered by it instead of
+-- created_at (which can tie), and a turn can fetch just the messages after the last seq it has seen
+
+ALTER TABLE messages
+ADD COLUMN IF NOT EXISTS seq INTEGER; -- 1, 2, 3, ... within each conversation, assigned on insert
+
+-- Number existing messages in created_at order (id breaks ties)
+WITH numbered AS (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY created_at, id) AS seq
+    FROM messages
+)
+UPDATE messages SET seq = numbered.seq
+FROM numbered
+WHERE messages.id = numbered.id AND messages.seq IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_conversation_seq ON messages(conversation_id, seq);
+
+-- Assign seq on insert. Locking the conversation row serializes concurrent inserts into one
+-- conversation, so two messages never get the same number (other conversations aren't blocked).
+CREATE OR REPLACE FUNCTION assign_message_seq() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM 1 FROM conversations WHERE id = NEW.conversation_id FOR UPDATE;
+    SELECT COALESCE(MAX(seq), 0) + 1 INTO NEW.seq FROM messages WHERE conversation_id = NEW.conversation_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS messages_assign_seq ON messages;
+CREATE TRIGGER messages_assign_seq
+BEFORE INSERT ON messages
+FOR EACH ROW EXECUTE FUNCTION assign_message_seq();
+
+-- Add comment
+COMMENT ON COLUMN messages.seq IS 'Per-conversation message number (assigned by the messages_assign_seq trigger); order history by it';
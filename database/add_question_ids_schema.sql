@@ -0,0 +1,13 @@
+-- Store asked factual questions as compact integer IDs from the question catalog
+-- (backend/question_catalog.py, IDs registered in backend/question_ids.json)
+
+ALTER TABLE conversations
+ADD COLUMN IF NOT EXISTS questions_asked_ids INTEGER[], -- Catalog IDs of questions asked in Phase IV, in order
+ADD COLUMN IF NOT EXISTS question_catalog_version TEXT; -- Catalog version the IDs were written with
+
+-- Add comments
+COMMENT ON COLUMN conversations.questions_asked_ids IS 'Catalog IDs of factual questions already asked in Phase IV (replaces questions_asked)';
+COMMENT ON COLUMN conversations.question_catalog_version IS 'Question catalog version (CATALOG_VERSION) used when questions_asked_ids was written';
+COMMENT ON COLUMN conversations.questions_asked IS 'Legacy: question texts, read for rows not yet migrated to questions_asked_ids and for texts with no catalog ID';
+
+-- Existing rows are converted by backend/migrate_questions_asked.py
@@ -0,0 +1,11 @@
+-- Store the resume embedding with the student so it is computed once at upload
+
+ALTER TABLE students
+ADD COLUMN IF NOT EXISTS resume_embedding REAL[], -- Embedding of the Projects / Work Experience / Technical Skills sections
+ADD COLUMN IF NOT EXISTS resume_embedding_model TEXT, -- Embedding model that produced resume_embedding
+ADD COLUMN IF NOT EXISTS resume_embedding_hash TEXT; -- SHA-256 of the resume text that was embedded
+
+-- Add comments
+COMMENT ON COLUMN students.resume_embedding IS 'Resume embedding used for factual question matching';
+COMMENT ON COLUMN students.resume_embedding_model IS 'Embedding model name; a different model forces recomputation';
+COMMENT ON COLUMN students.resume_embedding_hash IS 'Content hash of the embedded resume text; recomputed when sections change';
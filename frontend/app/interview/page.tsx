@@ -33,6 +33,7 @@ function InterviewContent() {
   const [questionMetadata, setQuestionMetadata] = useState<any>(null);
   const [interviewComplete, setInterviewComplete] = useState(false);
   const [projectPhaseComplete, setProjectPhaseComplete] = useState(false);
+  const [streamingReply, setStreamingReply] = useState('');
 
   // Anti-cheat: Timer state
   const [timeRemaining, setTimeRemaining] = useState<number>(90);
@@ -163,10 +164,9 @@ function InterviewContent() {
     setUserInput(newValue);
   };
 
-  const playAudio = (audioBase64: string) => {
-    if (audioRef.current && audioBase64) {
-      const audioBlob = base64ToBlob(audioBase64, 'audio/mpeg');
-      const audioUrl = URL.createObjectURL(audioBlob);
+  // audioUrl points at GET /audio/{audio_id}, which streams while the reply is still being synthesized
+  const playAudio = (audioUrl: string) => {
+    if (audioRef.current && audioUrl) {
       audioRef.current.src = audioUrl;
 
       audioRef.current.onplay = () => setIsInterviewerSpeaking(true);
@@ -180,23 +180,6 @@ function InterviewContent() {
     }
   };
 
-  const base64ToBlob = (base64: string, mimeType: string) => {
-    const byteCharacters = atob(base64);
-    const byteArrays = [];
-
-    for (let offset = 0; offset < byteCharacters.length; offset += 512) {
-      const slice = byteCharacters.slice(offset, offset + 512);
-      const byteNumbers = new Array(slice.length);
-      for (let i = 0; i < slice.length; i++) {
-        byteNumbers[i] = slice.charCodeAt(i);
-      }
-      const byteArray = new Uint8Array(byteNumbers);
-      byteArrays.push(byteArray);
-    }
-
-    return new Blob(byteArrays, { type: mimeType });
-  };
-
   const startConversation = async () => {
     setReadyToStart(false);
     setStarting(true);
@@ -208,7 +191,7 @@ function InterviewContent() {
       setMessages([{
         role: 'assistant',
         content: response.data.message,
-        audio: response.data.audio
+        audio: response.data.audio_id ? API_ENDPOINTS.AUDIO(response.data.audio_id) : undefined
       }]);
     } catch (error) {
       console.error('Error starting conversation:', error);
@@ -222,7 +205,7 @@ function InterviewContent() {
     const assistantMessage: Message = {
       role: 'assistant',
       content: response.data.message,
-      audio: response.data.audio
+      audio: response.data.audio_id ? API_ENDPOINTS.AUDIO(response.data.audio_id) : undefined
     };
 
     setMessages(prev => [...prev, assistantMessage]);
@@ -261,6 +244,58 @@ function InterviewContent() {
     }
   };
 
+  // Streams the interviewer's reply over SSE (tokens show up as they're generated);
+  // resolves with the same shape as the JSON endpoint so handleBackendResponse works unchanged
+  const postContinueConversation = async (body: any) => {
+    const res = await fetch(API_ENDPOINTS.CONTINUE_CONVERSATION_STREAM(conversationId!), {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    });
+    if (!res.ok || !res.body) throw new Error(`Request failed with status ${res.status}`);
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    const data: any = {};
+    let buffer = '';
+    let streamed = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line; keep any partial event for the next read
+      const frames = buffer.split('\n\n');
+      buffer = frames.pop() || '';
+
+      for (const frame of frames) {
+        let event = 'message';
+        let payload = '';
+        for (const line of frame.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) payload += line.slice(6);
+        }
+        if (!payload) continue;
+
+        const parsed = JSON.parse(payload);
+        if (event === 'token') {
+          streamed += parsed.text;
+          setStreamingReply(streamed);
+        } else if (event === 'audio') {
+          // Arrives before the text: start playback now, so the message itself carries no audio
+          playAudio(API_ENDPOINTS.AUDIO(parsed.audio_id));
+        } else if (event === 'error') {
+          throw new Error(parsed.detail);
+        } else if (event !== 'done') {
+          Object.assign(data, parsed);
+        }
+      }
+    }
+
+    return { data };
+  };
+
   const getAntiCheatMetadata = (isTimerExpired: boolean = false) => {
     const responseTimeSeconds = questionStartTimeRef.current
       ? Math.round((Date.now() - questionStartTimeRef.current) / 1000)
@@ -300,14 +335,12 @@ function InterviewContent() {
     setLoading(true);
 
     try {
-      const response = await axios.post(
-        API_ENDPOINTS.CONTINUE_CONVERSATION(conversationId!),
-        { message: messageText, ...metadata }
-      );
+      const response = await postContinueConversation({ message: messageText, ...metadata });
       handleBackendResponse(response);
     } catch (error) {
       console.error('Error sending message:', error);
     } finally {
+      setStreamingReply('');
       setLoading(false);
       submittingRef.current = false;
     }
@@ -336,14 +369,12 @@ function InterviewContent() {
     setLoading(true);
 
     try {
-      const response = await axios.post(
-        API_ENDPOINTS.CONTINUE_CONVERSATION(conversationId!),
-        { message: messageText, ...metadata }
-      );
+      const response = await postContinueConversation({ message: messageText, ...metadata });
       handleBackendResponse(response);
     } catch (error) {
       console.error('Error auto-submitting message:', error);
     } finally {
+      setStreamingReply('');
       setLoading(false);
       submittingRef.current = false;
     }
@@ -618,7 +649,21 @@ function InterviewContent() {
             </div>
           ))}
 
-          {loading && (
+          {loading && streamingReply && (
+            <div className="mb-6 flex justify-start">
+              <div className="max-w-[70%] rounded-2xl px-6 py-4 bg-apple-gray text-apple-dark">
+                <div className="flex items-center gap-2 mb-2">
+                  <div className="w-8 h-8 rounded-full bg-apple-blue flex items-center justify-center text-white font-semibold">
+                    R
+                  </div>
+                  <span className="font-medium text-sm">Raj (Interviewer)</span>
+                </div>
+                <p className="whitespace-pre-wrap">{streamingReply}</p>
+              </div>
+            </div>
+          )}
+
+          {loading && !streamingReply && (
             <div className="flex justify-start mb-6">
               <div className="bg-apple-gray rounded-2xl px-6 py-4">
                 <div className="flex gap-2">
@@ -1,12 +1,26 @@
 // API Configuration
 export const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+// Interviewer audio format: low-bitrate MP3 on slow connections (the browser's Save-Data header is honoured server-side too)
+export const preferredAudioFormat = (): string => {
+  const connection = typeof navigator !== 'undefined' ? (navigator as any).connection : undefined;
+  if (connection && ['slow-2g', '2g', '3g'].includes(connection.effectiveType)) {
+    return 'mp3_low';
+  }
+  return 'mp3';
+};
+
 // API Endpoints
 export const API_ENDPOINTS = {
   UPLOAD_RESUME: `${API_BASE_URL}/upload-resume`,
-  START_CONVERSATION: (studentId: string) => `${API_BASE_URL}/start-conversation/${studentId}`,
-  CONTINUE_CONVERSATION: (conversationId: string) => `${API_BASE_URL}/continue-conversation/${conversationId}`,
+  START_CONVERSATION: (studentId: string) =>
+    `${API_BASE_URL}/start-conversation/${studentId}?audio_format=${preferredAudioFormat()}`,
+  CONTINUE_CONVERSATION: (conversationId: string) =>
+    `${API_BASE_URL}/continue-conversation/${conversationId}?audio_format=${preferredAudioFormat()}`,
+  CONTINUE_CONVERSATION_STREAM: (conversationId: string) =>
+    `${API_BASE_URL}/continue-conversation/${conversationId}/stream?audio_format=${preferredAudioFormat()}`,
   SPEECH_TO_TEXT: `${API_BASE_URL}/speech-to-text`,
+  AUDIO: (audioId: string) => `${API_BASE_URL}/audio/${audioId}`,
   EVALUATE: (conversationId: string) => `${API_BASE_URL}/evaluate?conversation_id=${conversationId}`,
   EVALUATE_PROJECT: (conversationId: string) => `${API_BASE_URL}/evaluate/project/${conversationId}`,
   EVALUATE_FACTUAL: (conversationId: string) => `${API_BASE_URL}/evaluate/factual/${conversationId}`,